@@ -0,0 +1,749 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+بنچمارک‌های کارایی Parser دستورات کنترل کش
+Performance Benchmarks
+تیم 15 - پروژه کامپایلر
+
+اجرا:
+    python benchmark.py              # اجرای همه بنچمارک‌ها
+    python benchmark.py parser       # اجرای یک بنچمارک مشخص
+"""
+
+import sys
+import time
+
+
+# دستورات نمونه (همه‌ی شکل‌های گرامر)
+SAMPLE_INSTRUCTIONS = [
+    "CLFLUSH [EAX]",
+    "CLFLUSHOPT [EBX+16]",
+    "PREFETCHT0 [ECX-8]",
+    "WBINVD",
+    "CLWB [cache_line]",
+    "PREFETCHNTA [RAX+128]",
+    "INVD",
+    "PREFETCHT2 [R15D-64]",
+]
+
+
+# ═══════════════════════════════════════════════════════════════════
+#                          توابع کمکی
+# ═══════════════════════════════════════════════════════════════════
+
+def print_header(title):
+    """چاپ هدر"""
+    print("\n" + "═" * 70)
+    print(f"  {title}")
+    print("═" * 70)
+
+
+def measure(func, count):
+    """
+    اجرای func به تعداد count بار
+
+    Returns:
+        میانگین زمان هر فراخوانی (ثانیه)
+    """
+    start = time.perf_counter()
+    for i in range(count):
+        func(i)
+    return (time.perf_counter() - start) / count
+
+
+def print_row(label, seconds_per_item):
+    """چاپ یک سطر نتیجه بر حسب میکروثانیه"""
+    print(f"  {label:<40} {seconds_per_item * 1e6:>12.2f} µs")
+
+
+# ═══════════════════════════════════════════════════════════════════
+#                          بنچمارک‌ها
+# ═══════════════════════════════════════════════════════════════════
+
+def bench_parser_reuse(count=2000):
+    """بنچمارک: ساخت lexer/parser در هر دستور در برابر parser مشترک"""
+    print_header("تأخیر هر دستور: ساخت مجدد parser در برابر CacheInstructionParser")
+
+    from cache_lexer import build_lexer
+    from cache_parser import build_parser, CacheInstructionParser
+
+    samples = SAMPLE_INSTRUCTIONS
+
+    def rebuild_every_call(i):
+        lexer = build_lexer()
+        parser = build_parser()
+        parser.parse(samples[i % len(samples)], lexer=lexer)
+
+    shared = CacheInstructionParser()
+    shared.parse(samples[0])  # ساخت جدول‌ها خارج از زمان‌سنجی
+
+    def reuse_shared(i):
+        shared.parse(samples[i % len(samples)])
+
+    before = measure(rebuild_every_call, max(count // 20, 1))
+    after = measure(reuse_shared, count)
+
+    print_row("قبل (build_lexer + build_parser)", before)
+    print_row("بعد (CacheInstructionParser)", after)
+    print(f"  {'تسریع':<40} {before / after:>12.1f}x")
+
+
+def bench_table_cache(count=50):
+    """بنچمارک: تولید جدول‌های LALR در برابر بارگذاری از cache روی دیسک"""
+    print_header("زمان ساخت parser: تحلیل کامل گرامر در برابر cache جدول‌ها")
+
+    from cache_parser import build_parser, table_cache_dir
+
+    build_parser()  # اطمینان از وجود جدول در cache
+
+    generate = measure(lambda i: build_parser(use_cache=False), count)
+    cached = measure(lambda i: build_parser(), count)
+
+    print(f"  پوشه cache: {table_cache_dir()}")
+    print_row("تولید جدول‌ها (write_tables=False)", generate)
+    print_row("بارگذاری از cache", cached)
+    print(f"  {'تسریع':<40} {generate / cached:>12.1f}x")
+
+
+def bench_diagnostics(lines=20000, count=5):
+    """بنچمارک: پارس فایل سالم در برابر فایل پر از خطا"""
+    print_header("پارس کل فایل: ورودی سالم در برابر ورودی پر از خطا")
+
+    from cache_parser import get_parser
+
+    parser = get_parser()
+    clean = "\n".join(SAMPLE_INSTRUCTIONS[i % len(SAMPLE_INSTRUCTIONS)] for i in range(lines))
+    dirty = "\n".join("CLFLUSH EAX" if i % 2 else "MOV EAX" for i in range(lines))
+    parser.parse_program(clean)  # ساخت جدول‌ها خارج از زمان‌سنجی
+
+    clean_time = measure(lambda i: parser.parse_program(clean), count) / lines
+    dirty_time = measure(lambda i: parser.parse_program(dirty), count) / lines
+
+    print(f"  تعداد خطوط: {lines} (تعداد خطا در ورودی نامعتبر: {len(parser.diagnostics)})")
+    print_row("هر خط - ورودی سالم", clean_time)
+    print_row("هر خط - همه‌ی خطوط نامعتبر", dirty_time)
+    print(f"  {'نسبت':<40} {dirty_time / clean_time:>12.2f}x")
+
+
+def bench_lexer_modes(scale=200, count=3):
+    """بنچمارک: lexer با یک قانون برای هر mnemonic در برابر جدول کلمات کلیدی"""
+    print_header("سرعت lexer: قوانین ترتیبی t_* در برابر regex واحد + جدول KEYWORDS")
+
+    import glob
+    from cache_lexer import build_lexer, LEXER_RULES, LEXER_KEYWORDS
+
+    text = ""
+    for path in sorted(glob.glob('examples/*.asm')):
+        with open(path, 'r', encoding='utf-8') as f:
+            text += f.read() + "\n"
+    text *= scale
+
+    def tokenize(lexer):
+        lexer.diagnostics = []  # کاراکترهای غیرمجاز فقط ثبت می‌شوند
+        lexer.lineno = 1
+        lexer.input(text)
+        n = 0
+        for _ in iter(lexer.token, None):
+            n += 1
+        return n
+
+    rules = build_lexer(emit_newlines=True, mode=LEXER_RULES)
+    keywords = build_lexer(emit_newlines=True, mode=LEXER_KEYWORDS)
+    n_tokens = tokenize(rules)
+
+    rules_time = measure(lambda i: tokenize(rules), count) / n_tokens
+    keywords_time = measure(lambda i: tokenize(keywords), count) / n_tokens
+
+    print(f"  ورودی: examples/*.asm × {scale} ({len(text.splitlines())} خط، {n_tokens} توکن)")
+    print_row("هر توکن - LEXER_RULES", rules_time)
+    print_row("هر توکن - LEXER_KEYWORDS", keywords_time)
+    print(f"  {'تسریع':<40} {rules_time / keywords_time:>12.2f}x")
+
+
+def bench_engines(scale=100, count=3):
+    """بنچمارک: parser PLY در برابر درایور جدول‌محور lr_driver"""
+    print_header("موتور پارس: PLY در برابر LRDriver (lr_tables.LR_PARSING_TABLE)")
+
+    import glob
+    from cache_parser import CacheInstructionParser, ENGINE_PLY, ENGINE_LR, ENGINE_LALR
+
+    text = ""
+    for path in sorted(glob.glob('examples/*.asm')):
+        with open(path, 'r', encoding='utf-8') as f:
+            text += f.read() + "\n"
+    text *= scale
+
+    ply_parser = CacheInstructionParser(engine=ENGINE_PLY)
+    lr_parser = CacheInstructionParser(engine=ENGINE_LR)
+    lalr_parser = CacheInstructionParser(engine=ENGINE_LALR)
+    n_lines = len(text.splitlines())
+    samples = SAMPLE_INSTRUCTIONS
+
+    for parser in (ply_parser, lr_parser, lalr_parser):
+        parser.parse_program(text)  # ساخت جدول‌ها خارج از زمان‌سنجی
+        parser.parse(samples[0])
+
+    ply_file = measure(lambda i: ply_parser.parse_program(text), count) / n_lines
+    lr_file = measure(lambda i: lr_parser.parse_program(text), count) / n_lines
+    lalr_file = measure(lambda i: lalr_parser.parse_program(text), count) / n_lines
+    ply_one = measure(lambda i: ply_parser.parse(samples[i % len(samples)]), 20000)
+    lr_one = measure(lambda i: lr_parser.parse(samples[i % len(samples)]), 20000)
+
+    print(f"  ورودی کل فایل: examples/*.asm × {scale} ({n_lines} خط)")
+    print_row("هر خط - PLY (parse_program)", ply_file)
+    print_row("هر خط - LRDriver (parse_program)", lr_file)
+    print(f"  {'تسریع':<40} {ply_file / lr_file:>12.2f}x")
+    print_row("هر خط - LRDriver LALR (parse_program)", lalr_file)
+    print_row("هر دستور - PLY (parse)", ply_one)
+    print_row("هر دستور - LRDriver (parse)", lr_one)
+    print(f"  {'تسریع':<40} {ply_one / lr_one:>12.2f}x")
+
+
+class _DictNode:
+    """گره با چیدمان قبلی AST: __dict__ برای هر نمونه و ویژگی type در هر نمونه"""
+
+    def __init__(self, **fields):
+        self.__dict__.update(fields)
+
+
+def _fresh(text):
+    """کپی جدید یک رشته (مثل مقدار توکن‌های lexer)"""
+    return text[:1] + text[1:]
+
+
+def _dict_layout(ast):
+    """ساخت همان AST با چیدمان قبلی (یک Register/Identifier جدید برای هر دستور)"""
+    operand = None
+    if ast.operand is not None:
+        base = ast.operand.base
+        if base.type == 'Register':
+            base = _DictNode(name=_fresh(base.name), type='Register', bit_width=base.bit_width)
+        else:
+            base = _DictNode(name=_fresh(base.name), type='Identifier')
+        offset = ast.operand.offset
+        operand = _DictNode(base=base, offset=offset if offset is None else f"{offset:+d}",
+                            type='MemoryOperand')
+    return _DictNode(mnemonic=_fresh(ast.mnemonic), operand=operand, lineno=ast.lineno, type='Instruction')
+
+
+def _retained_bytes(build):
+    """حافظه‌ی نگه‌داشته‌شده توسط نتیجه‌ی build() (tracemalloc)"""
+    import gc
+    import tracemalloc
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before, result
+
+
+def bench_ast_memory(lines=50000):
+    """بنچمارک: حافظه‌ی هر دستور در AST (چیدمان __dict__ در برابر __slots__)"""
+    print_header("حافظه‌ی AST: بایت به ازای هر دستور")
+
+    from cache_parser import get_parser
+
+    text = "\n".join(SAMPLE_INSTRUCTIONS[i % len(SAMPLE_INSTRUCTIONS)] for i in range(lines))
+    program = get_parser().parse_program(text)
+
+    slots_bytes, _ = _retained_bytes(lambda: get_parser().parse_program(text))
+    dict_bytes, _ = _retained_bytes(lambda: [_dict_layout(ast) for ast in program])
+
+    print(f"  تعداد دستورات: {len(program)}")
+    print(f"  {'چیدمان قبلی (__dict__، Register جدید)':<40} {dict_bytes / len(program):>12.1f} B")
+    print(f"  {'__slots__ + Register/Identifier یکتا':<40} {slots_bytes / len(program):>12.1f} B")
+    print(f"  {'کاهش':<40} {dict_bytes / slots_bytes:>12.2f}x")
+
+
+def bench_instruction_table(lines=200000):
+    """بنچمارک: پرس‌وجوهای تحلیلی روی اشیاء Instruction در برابر InstructionTable"""
+    print_header("تحلیل دسته‌ای: پیمایش Instruction ها در برابر InstructionTable ستونی")
+
+    import instruction_table
+    from collections import Counter
+    from cache_parser import get_parser
+    from instruction_table import InstructionTable
+
+    text = "\n".join(SAMPLE_INSTRUCTIONS[i % len(SAMPLE_INSTRUCTIONS)] for i in range(lines))
+    table = InstructionTable()
+    program = get_parser().parse_program(text, table=table)
+
+    def objects_query(i):
+        Counter(ast.get_instruction_category() for ast in program)
+        Counter(ast.operand.base.name for ast in program
+                if ast.operand is not None and ast.operand.base.type == 'Register')
+        [row for row, ast in enumerate(program)
+         if ast.operand is not None and ast.operand.offset is not None and ast.operand.offset > 0]
+
+    def table_query(i):
+        table.category_counts()
+        table.register_histogram()
+        table.rows_with_offset(minimum=1)
+
+    objects_time = measure(objects_query, 3)
+    table_time = measure(table_query, 3)
+
+    backend = "NumPy" if instruction_table.np is not None else "array + Counter"
+    print(f"  تعداد دستورات: {len(table)} (ستون‌ها: {table.nbytes() / len(table):.0f} بایت در هر سطر، {backend})")
+    print(f"  {'اشیاء Instruction':<40} {objects_time * 1e3:>12.2f} ms")
+    print(f"  {'InstructionTable':<40} {table_time * 1e3:>12.2f} ms")
+    print(f"  {'تسریع':<40} {objects_time / table_time:>12.1f}x")
+
+
+def _legacy_category(mnemonic):
+    """get_instruction_category قبلی: ساخت dict از لیست‌ها و جستجوی خطی در هر فراخوانی"""
+    categories = {
+        'flush': ['CLFLUSH', 'CLFLUSHOPT'],
+        'writeback': ['CLWB'],
+        'prefetch': ['PREFETCHT0', 'PREFETCHT1', 'PREFETCHT2', 'PREFETCHNTA'],
+        'invalidate': ['WBINVD', 'INVD']
+    }
+
+    for category, mnemonics in categories.items():
+        if mnemonic in mnemonics:
+            return category
+    return 'unknown'
+
+
+def bench_category_lookup(count=1000000):
+    """بنچمارک: دسته‌بندی دستورات با جستجوی خطی در برابر جدول instruction_set"""
+    print_header("دسته‌ی دستور: جستجوی خطی قبلی در برابر اطلاعات از پیش محاسبه‌شده")
+
+    from cache_parser import parse_instruction
+
+    samples = [parse_instruction(code) for code in SAMPLE_INSTRUCTIONS]
+    program = [samples[i % len(samples)] for i in range(count)]
+
+    def legacy(i):
+        for ast in program:
+            _legacy_category(ast.mnemonic)
+
+    def precomputed(i):
+        for ast in program:
+            ast.category
+
+    legacy_time = measure(legacy, 1) / count
+    precomputed_time = measure(precomputed, 1) / count
+
+    print(f"  تعداد دستورات: {count}")
+    print_row("هر دستور - جستجوی خطی (قبلی)", legacy_time)
+    print_row("هر دستور - Instruction.category", precomputed_time)
+    print(f"  {'تسریع':<40} {legacy_time / precomputed_time:>12.1f}x")
+
+
+def bench_streaming(lines=200000):
+    """بنچمارک: حافظه‌ی اوج parse_file در برابر iter_parse_file"""
+    print_header("حافظه‌ی اوج: parse_file (کل فایل) در برابر iter_parse_file (جریانی)")
+
+    import os
+    import tempfile
+    import tracemalloc
+    from cache_parser import parse_file, iter_parse_file
+
+    with tempfile.NamedTemporaryFile('w', suffix='.asm', delete=False, encoding='utf-8') as f:
+        for i in range(lines):
+            f.write(SAMPLE_INSTRUCTIONS[i % len(SAMPLE_INSTRUCTIONS)] + "\n")
+        path = f.name
+
+    def peak(func):
+        tracemalloc.start()
+        func()
+        result = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return result
+
+    def count_stream():
+        count = 0
+        for _ in iter_parse_file(path):
+            count += 1
+        return count
+
+    try:
+        whole = peak(lambda: parse_file(path))
+        stream = peak(count_stream)
+    finally:
+        os.remove(path)
+
+    print(f"  تعداد خطوط: {lines}")
+    print(f"  {'parse_file':<40} {whole / 2 ** 20:>12.1f} MiB")
+    print(f"  {'iter_parse_file':<40} {stream / 2 ** 20:>12.1f} MiB")
+
+
+def bench_mapped_file(lines=200000):
+    """بنچمارک: parse_file در برابر parse_mapped_file (mmap و span ها)"""
+    print_header("پارس فایل بزرگ: parse_file در برابر parse_mapped_file (mmap)")
+
+    import os
+    import tempfile
+    import tracemalloc
+    from cache_parser import parse_file, parse_mapped_file
+
+    with tempfile.NamedTemporaryFile('w', suffix='.asm', delete=False, encoding='utf-8') as f:
+        for i in range(lines):
+            f.write(SAMPLE_INSTRUCTIONS[i % len(SAMPLE_INSTRUCTIONS)] + "    ; comment\n")
+        path = f.name
+
+    def run(func):
+        tracemalloc.start()
+        start = time.perf_counter()
+        func(path)
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return elapsed, peak
+
+    try:
+        rows = [(name, run(func)) for name, func in
+                (('parse_file', parse_file), ('parse_mapped_file', parse_mapped_file))]
+    finally:
+        os.remove(path)
+
+    print(f"  تعداد خطوط: {lines} (زمان‌ها با tracemalloc فعال)")
+    for name, (elapsed, peak) in rows:
+        print(f"  {name:<40} {elapsed:>8.2f} s {peak / 2 ** 20:>10.1f} MiB")
+
+
+def bench_parallel(lines=400000):
+    """بنچمارک: parse_file در یک پروسه در برابر چند پروسه"""
+    print_header("پارس موازی: parse_file با jobs مختلف")
+
+    import os
+    import tempfile
+    from cache_parser import parse_file
+
+    with tempfile.NamedTemporaryFile('w', suffix='.asm', delete=False, encoding='utf-8') as f:
+        for i in range(lines):
+            f.write(SAMPLE_INSTRUCTIONS[i % len(SAMPLE_INSTRUCTIONS)] + "\n")
+        path = f.name
+
+    cores = os.cpu_count() or 1
+    try:
+        print(f"  تعداد خطوط: {lines}، تعداد هسته‌ها: {cores}")
+        base = None
+        for jobs in sorted({1, 2, 4, cores}):
+            start = time.perf_counter()
+            parse_file(path, jobs=jobs)
+            elapsed = time.perf_counter() - start
+            base = base or elapsed
+            print(f"  {f'jobs={jobs}':<40} {elapsed:>8.2f} s {base / elapsed:>8.2f}x")
+    finally:
+        os.remove(path)
+
+
+def bench_instruction_cache(count=20000):
+    """بنچمارک: parse با و بدون cache دستورات (خطوط examples/advanced_test.asm)"""
+    print_header("cache دستورات تکراری: CacheInstructionParser با و بدون cache")
+
+    from cache_parser import CacheInstructionParser
+
+    with open('examples/advanced_test.asm', encoding='utf-8') as f:
+        lines = [line for line in f if line.split(';')[0].strip()]
+
+    plain = CacheInstructionParser()
+    cached = CacheInstructionParser(cache_size=1024)
+    plain.parse(lines[0])  # ساخت جدول‌ها خارج از زمان‌سنجی
+    cached.parse(lines[0])
+
+    before = measure(lambda i: plain.parse(lines[i % len(lines)]), count)
+    after = measure(lambda i: cached.parse(lines[i % len(lines)]), count)
+
+    stats = cached.cache.stats()
+    print(f"  تعداد خطوط یکتا: {len(set(lines))} از {len(lines)}")
+    print_row("بدون cache", before)
+    print_row("با cache", after)
+    print(f"  {'تسریع':<40} {before / after:>12.1f}x")
+    print(f"  {'hit / miss / eviction':<40} {stats['hits']} / {stats['misses']} / {stats['evictions']}")
+
+
+def bench_result_cache(lines=200000):
+    """بنچمارک: parse_file در برابر بارگذاری از cache نتایج"""
+    print_header("cache نتایج روی دیسک: پارس در برابر بارگذاری فایل بدون تغییر")
+
+    import os
+    import tempfile
+    from cache_parser import parse_file
+    from result_cache import result_key, _result_path
+
+    with tempfile.NamedTemporaryFile('w', suffix='.asm', delete=False, encoding='utf-8') as f:
+        for i in range(lines):
+            f.write(SAMPLE_INSTRUCTIONS[i % len(SAMPLE_INSTRUCTIONS)] + "\n")
+        path = f.name
+
+    try:
+        start = time.perf_counter()
+        parse_file(path, cache=True)  # پارس و ذخیره
+        parsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        parse_file(path, cache=True)
+        loaded = time.perf_counter() - start
+
+        with open(path, encoding='utf-8') as f:
+            entry = _result_path(result_key(f.read()))
+        size = os.path.getsize(entry)
+        os.remove(entry)
+    finally:
+        os.remove(path)
+
+    print(f"  تعداد خطوط: {lines} (حجم نتیجه: {size / 2 ** 20:.1f} MiB)")
+    print(f"  {'پارس و ذخیره':<40} {parsed:>8.2f} s")
+    print(f"  {'بارگذاری از cache':<40} {loaded:>8.2f} s")
+    print(f"  {'تسریع':<40} {parsed / loaded:>8.1f}x")
+
+
+def bench_trace(sizes=(1000, 10000, 100000)):
+    """بنچمارک: trace و چاپ جدول shift-reduce همه‌ی خطوط یک برنامه‌ی تولیدشده"""
+    print_header("ShiftReduceTracer: رکورد فشرده و ساخت تنبل سطرهای جدول")
+
+    from shift_reduce_trace import ShiftReduceTracer
+
+    tracer = ShiftReduceTracer()
+    for size in sizes:
+        lines = [SAMPLE_INSTRUCTIONS[i % len(SAMPLE_INSTRUCTIONS)] for i in range(size)]
+
+        start = time.perf_counter()
+        traces = [tracer.trace(line) for line in lines]
+        traced = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for trace in traces:
+            for _ in trace.rows(28, 23):
+                pass
+        rendered = time.perf_counter() - start
+
+        accepted = sum(trace.accepted for trace in traces)
+        assert accepted == size, f"{size - accepted} دستور رد شد"
+        steps = sum(len(trace) for trace in traces)
+        print(f"  {f'{size} خط ({steps} مرحله، {accepted} پذیرفته)':<44} "
+              f"trace {traced * 1e3:>8.1f} ms   جدول {rendered * 1e3:>8.1f} ms")
+
+
+def bench_bulk_trace(lines=200000):
+    """بنچمارک: trace همه‌ی خطوط یک فایل بزرگ در هر قالب خروجی"""
+    print_header("trace دسته‌ای: مراحل shift-reduce کل فایل (bulk_trace)")
+
+    import os
+    import tempfile
+    from bulk_trace import trace_files, open_trace_output, FORMAT_CSV, FORMAT_JSONL, FORMAT_BINARY
+
+    with tempfile.NamedTemporaryFile('w', suffix='.asm', delete=False, encoding='utf-8') as f:
+        for i in range(lines):
+            f.write(SAMPLE_INSTRUCTIONS[i % len(SAMPLE_INSTRUCTIONS)] + "\n")
+        path = f.name
+    output = path + '.trace'
+
+    try:
+        print(f"  تعداد خطوط: {lines}")
+        start = time.perf_counter()
+        coverage, _, _ = trace_files([path])
+        print(f"  {'فقط پوشش':<40} {time.perf_counter() - start:>8.2f} s   {coverage.steps} مرحله")
+        for format in (FORMAT_CSV, FORMAT_JSONL, FORMAT_BINARY):
+            start = time.perf_counter()
+            with open_trace_output(output, format) as out:
+                trace_files([path], out, format)
+            elapsed = time.perf_counter() - start
+            print(f"  {format:<40} {elapsed:>8.2f} s {os.path.getsize(output) / 2 ** 20:>8.1f} MiB")
+    finally:
+        os.remove(path)
+        if os.path.exists(output):
+            os.remove(output)
+
+
+def _synthetic_grammar(mnemonics):
+    """GRAMMAR_RULES با mnemonic ها و شکل‌های آدرس‌دهی اضافه (برای بنچمارک جدول‌ها)"""
+    from lr_tables import GRAMMAR_RULES
+
+    rules = dict(GRAMMAR_RULES)
+    num = max(rules)
+    for i in range(mnemonics):
+        num += 1
+        rules[num] = f"mnemonic -> OP{i}"
+    for i in range(mnemonics // 4):
+        num += 1
+        rules[num] = f"base_expr -> REGISTER PLUS INDEX{i} offset"
+    return rules
+
+
+def bench_table_generator(sizes=(0, 100, 400, 1600)):
+    """بنچمارک: زمان تولید جدول SLR با رشد گرامر"""
+    print_header("تولید جدول SLR از قوانین گرامر (lr_generator)")
+
+    from lr_generator import generate_table
+
+    for size in sizes:
+        rules = _synthetic_grammar(size)
+        start = time.perf_counter()
+        table, conflicts = generate_table(rules)
+        elapsed = time.perf_counter() - start
+        print(f"  {f'{len(rules)} قانون':<40} {elapsed * 1e3:>8.1f} ms  "
+              f"{len(table)} state، {len(conflicts)} تعارض")
+
+
+def _dict_table_bytes(table):
+    """حافظه‌ی جدول دیکشنری (دیکشنری‌ها، بدون رشته‌های مشترک نام نمادها)"""
+    return sys.getsizeof(table) + sum(sys.getsizeof(row) for row in table.values())
+
+
+def bench_packed_tables(sizes=(0, 400, 1600), count=200):
+    """بنچمارک: اندازه و سرعت lookup جدول فشرده در برابر دیکشنری و آرایه‌ی کامل"""
+    print_header("جدول LALR فشرده: reduce پیش‌فرض و row displacement (lr_driver)")
+
+    from lr_driver import (ACTION, N_TERMINALS, TERMINALS, TERMINAL_ID, PackedTables, pack_rows,
+                           lalr_tables)
+    from lr_generator import generate_table, METHOD_LALR
+    from lr_tables import LR_PARSING_TABLE
+
+    # اندازه: گرامر پروژه و گرامرهای مصنوعی بزرگ‌تر (خانه‌ها 8 بایت در list)
+    for size in sizes:
+        rules = _synthetic_grammar(size)
+        table, _ = generate_table(rules, METHOD_LALR)
+        symbols = sorted({symbol for row in table.values() for symbol in row})
+        symbol_id = {symbol: i for i, symbol in enumerate(symbols)}
+
+        rows = []
+        for state in range(len(table)):
+            row = table[state]
+            reduces = {entry for entry in row.values() if not isinstance(entry, int)}
+            if len(reduces) == 1 and next(iter(reduces))[0] == 'r':
+                row = {symbol: entry for symbol, entry in row.items() if isinstance(entry, int)}
+            rows.append({symbol_id[symbol]: 1 for symbol in row})
+        start = time.perf_counter()
+        base, check, value = pack_rows(rows, len(symbols))
+        elapsed = time.perf_counter() - start
+
+        dense = len(table) * len(symbols)
+        packed = len(base) * 2 + len(check) + len(value)  # base و default برای هر state
+        print(f"  {f'{len(rules)} قانون، {len(table)} state':<40} "
+              f"dict {_dict_table_bytes(table) / 1024:>8.1f} KiB   آرایه {dense * 8 / 1024:>8.1f} KiB   "
+              f"فشرده {packed * 8 / 1024:>6.1f} KiB ({elapsed * 1e3:.0f} ms)")
+
+    # سرعت lookup: همه‌ی خانه‌های پر جدول دستی
+    packed = PackedTables()
+    cells = [(state, symbol, TERMINAL_ID[symbol])
+             for state, row in LR_PARSING_TABLE.items() for symbol, entry in row.items()
+             if not isinstance(entry, int)]
+
+    def dict_lookup(i):
+        for state, symbol, _ in cells:
+            LR_PARSING_TABLE[state].get(symbol)
+
+    def dense_lookup(i):
+        for state, _, term in cells:
+            ACTION[state * N_TERMINALS + term]
+
+    base, check, action, default = packed.base, packed.check, packed.action, packed.default
+
+    def packed_lookup(i):
+        for state, _, term in cells:
+            j = base[state] + term
+            action[j] if check[j] == state else default[state]
+
+    print(f"\n  lookup ({len(cells)} خانه‌ی ACTION جدول دستی، {len(TERMINALS)} ترمینال)")
+    print_row("هر lookup - دیکشنری LR_PARSING_TABLE", measure(dict_lookup, count) / len(cells))
+    print_row("هر lookup - آرایه‌ی کامل ACTION", measure(dense_lookup, count) / len(cells))
+    print_row("هر lookup - فشرده (check/default)", measure(packed_lookup, count) / len(cells))
+
+    lalr = lalr_tables()
+    print(f"\n  {'جدول LALR پروژه':<40} {lalr.n_states} state، {lalr.size()} خانه "
+          f"(آرایه‌ی کامل: {lalr.n_states * N_TERMINALS} خانه‌ی ACTION)")
+
+
+# بودجه‌ی زمان import هر ماژول (میلی‌ثانیه، با __pycache__ گرم) - بنچمارک
+# startup در صورت عبور از بودجه کد خروج 1 می‌دهد
+STARTUP_BUDGET_MS = {
+    'main': 15,
+    'cacheparse': 40,
+    'cache_parser': 40,
+}
+
+
+def import_times(module):
+    """
+    زمان import یک ماژول در پروسه‌ی جدید (python -X importtime)
+
+    Returns:
+        لیست (نام ماژول، زمان تجمعی µs) ماژول و وابستگی‌هایش به ترتیب import؛
+        آخرین عنصر خود ماژول است (ماژول‌های شروع مفسر مثل site حذف می‌شوند)
+    """
+    import os
+    import subprocess
+
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)  # bytecode باید نوشته و خوانده شود
+    command = [sys.executable, '-X', 'importtime', '-c', f'import {module}']
+
+    subprocess.run(command, env=env, capture_output=True, check=True)  # گرم کردن __pycache__
+    stderr = subprocess.run(command, env=env, capture_output=True, text=True, check=True).stderr
+
+    times = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times.append((name.strip(), int(cumulative)))
+        # خروجی post-order است: هر ماژول سطح بالا بعد از وابستگی‌هایش می‌آید
+        if not name[1:].startswith(' ') and name.strip() != module:
+            times = []
+    return times
+
+
+def bench_startup(top=5):
+    """بنچمارک: زمان import نقاط ورود در برابر STARTUP_BUDGET_MS"""
+    print_header("زمان شروع: import نقاط ورود (python -X importtime)")
+
+    within_budget = True
+    for module, budget in STARTUP_BUDGET_MS.items():
+        times = import_times(module)
+        total = times[-1][1] / 1000
+        ok = total <= budget
+        within_budget = within_budget and ok
+        print(f"  {'✅' if ok else '❌'} {module:<37} {total:>8.1f} ms (بودجه: {budget} ms)")
+        for name, cumulative in sorted(times[:-1], key=lambda item: -item[1])[:top]:
+            print(f"       {name:<35} {cumulative / 1000:>8.1f} ms")
+    return within_budget
+
+
+BENCHMARKS = {
+    'parser': bench_parser_reuse,
+    'tables': bench_table_cache,
+    'diagnostics': bench_diagnostics,
+    'lexer': bench_lexer_modes,
+    'engine': bench_engines,
+    'memory': bench_ast_memory,
+    'table': bench_instruction_table,
+    'category': bench_category_lookup,
+    'stream': bench_streaming,
+    'mmap': bench_mapped_file,
+    'parallel': bench_parallel,
+    'memo': bench_instruction_cache,
+    'results': bench_result_cache,
+    'startup': bench_startup,
+    'trace': bench_trace,
+    'bulk': bench_bulk_trace,
+    'generator': bench_table_generator,
+    'packed': bench_packed_tables,
+}
+
+
+def main(argv):
+    names = argv or list(BENCHMARKS)
+
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"❌ بنچمارک ناشناخته: {name}")
+            print(f"💡 بنچمارک‌های موجود: {', '.join(BENCHMARKS)}")
+            return 1
+
+    # بنچمارک‌هایی که False برمی‌گردانند (مثل startup) از بودجه عبور کرده‌اند
+    failed = [name for name in names if BENCHMARKS[name]() is False]
+
+    print()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+trace دسته‌ای shift-reduce برای کل فایل‌ها
+Bulk Shift-Reduce Trace Export
+تیم 15 - پروژه کامپایلر - دانشگاه شهید باهنر کرمان
+
+جدول LR_PARSING_TABLE روی هر خط یک فایل اجرا می‌شود (پایان خط نقش '$' را
+دارد) و رکورد فشرده‌ی همه‌ی مراحل (shift_reduce_trace.run_table) در یک
+گذر به فایل CSV، JSON Lines یا باینری ستونی نوشته می‌شود. در کنار آن
+شمارش قوانین reduce شده و state های دیده‌شده (پوشش گرامر) جمع می‌شود.
+
+فایل با mmap و lexer بایتی (cache_lexer.iter_spans) خوانده می‌شود؛ مثل
+parse_mapped_file کل کلمه یک توکن است.
+
+قالب‌ها:
+    csv    یک سطر برای هر مرحله: file,line,step,depth,action,arg,index
+    jsonl  یک شیء برای هر دستور: file، line، steps، accepted و records
+           (لیست [depth, action, arg, index] با کدهای STEP_*)
+    bin    بلوک‌های marshal از ستون‌های array، هر بلوک از یک فایل (load_trace)
+"""
+
+import csv
+import json
+import marshal
+import mmap
+import os
+from array import array
+
+from cache_lexer import iter_spans, TOKEN_ID
+from lr_driver import END_ID, N_STATES
+from lr_tables import GRAMMAR_RULES
+from shift_reduce_trace import run_table, STEP_REDUCE, STEP_ACCEPT
+
+
+FORMAT_CSV = 'csv'
+FORMAT_JSONL = 'jsonl'
+FORMAT_BINARY = 'bin'
+
+# نام کدهای STEP_* در خروجی CSV
+STEP_NAMES = ('start', 'shift', 'reduce', 'accept', 'error', 'goto_error')
+
+# نسخه‌ی قالب در magic - فایل‌های قالب قبلی (ستون‌های 16 بیتی) خوانده نمی‌شوند
+MAGIC = b'CPT2'
+
+# تعداد دستورات هر بلوک در قالب باینری
+BLOCK_LINES = 65536
+
+# ستون‌های قالب باینری: (نام، typecode)
+INSTRUCTION_COLUMNS = (('line', 'I'), ('steps', 'I'), ('accepted', 'B'))
+# depth، arg و index بدون محدودیت 65535 (خطوط خیلی طولانی)
+STEP_COLUMNS = (('depth', 'I'), ('action', 'B'), ('arg', 'I'), ('index', 'I'))
+
+
+# ═══════════════════════════════════════════════════════════════════
+#                          خطوط فایل
+# ═══════════════════════════════════════════════════════════════════
+
+def iter_line_terminals(buffer, diagnostics=None):
+    """
+    شناسه‌ی ترمینال‌های هر خط غیرخالی
+
+    اندیس نوع span ها همان شناسه‌ی TERMINAL_ID است (tokens + '$').
+
+    Yields:
+        (شماره خط، لیست شناسه‌ها با END_ID در انتها)
+    """
+    newline = TOKEN_ID['NEWLINE']
+    lineno = 1
+    first_line = 1
+    terminals = []
+
+    for _, length, type in iter_spans(buffer, diagnostics):
+        if type == newline:
+            if terminals:
+                terminals.append(END_ID)
+                yield first_line, terminals
+                terminals = []
+            lineno += length
+        else:
+            if not terminals:
+                first_line = lineno
+            terminals.append(type)
+
+    if terminals:
+        terminals.append(END_ID)
+        yield first_line, terminals
+
+
+# ═══════════════════════════════════════════════════════════════════
+#                          پوشش گرامر
+# ═══════════════════════════════════════════════════════════════════
+
+class TraceCoverage:
+    """شمارش دستورات، مراحل، قوانین reduce شده و state های دیده‌شده"""
+
+    def __init__(self):
+        self.instructions = 0
+        self.accepted = 0
+        self.steps = 0
+        self.rule_hits = [0] * (max(GRAMMAR_RULES) + 1)
+        self.state_hits = [0] * N_STATES
+
+    def add(self, records):
+        self.instructions += 1
+        self.steps += len(records)
+        if records[-1][1] == STEP_ACCEPT:
+            self.accepted += 1
+        rule_hits = self.rule_hits
+        for _, action, arg, _ in records:
+            if action == STEP_REDUCE:
+                rule_hits[arg] += 1
+
+    def summary(self):
+        """خلاصه‌ی قابل JSON (شمارش‌ها و قوانین و state های استفاده‌نشده)"""
+        return {
+            'instructions': self.instructions,
+            'accepted': self.accepted,
+            'rejected': self.instructions - self.accepted,
+            'steps': self.steps,
+            'rules': {num: self.rule_hits[num] for num in GRAMMAR_RULES},
+            'states': dict(enumerate(self.state_hits)),
+            'unused_rules': [num for num in GRAMMAR_RULES if not self.rule_hits[num]],
+            'unused_states': [state for state, hits in enumerate(self.state_hits) if not hits],
+        }
+
+
+# ═══════════════════════════════════════════════════════════════════
+#                          نویسنده‌ها
+# ═══════════════════════════════════════════════════════════════════
+
+class _CsvWriter:
+    """یک سطر برای هر مرحله"""
+
+    def __init__(self, out):
+        self.writer = csv.writer(out)
+        self.writer.writerow(('file', 'line', 'step', 'depth', 'action', 'arg', 'index'))
+
+    def write(self, path, line, records):
+        self.writer.writerows((path, line, step, depth, STEP_NAMES[action], arg, index)
+                              for step, (depth, action, arg, index) in enumerate(records, 1))
+
+    def close(self):
+        pass
+
+
+class _JsonlWriter:
+    """یک شیء JSON برای هر دستور"""
+
+    def __init__(self, out):
+        self.out = out
+
+    def write(self, path, line, records):
+        self.out.write(json.dumps({'file': path, 'line': line, 'steps': len(records),
+                                   'accepted': records[-1][1] == STEP_ACCEPT, 'records': records},
+                                  separators=(',', ':')))
+        self.out.write('\n')
+
+    def close(self):
+        pass
+
+
+class _BinaryWriter:
+    """ستون‌های array در بلوک‌های حداکثر BLOCK_LINES دستوری (هر بلوک از یک فایل)"""
+
+    def __init__(self, out):
+        self.out = out
+        self.out.write(MAGIC)
+        self.path = None
+        self._new_block()
+
+    def _new_block(self):
+        self.columns = {name: array(code) for name, code in INSTRUCTION_COLUMNS + STEP_COLUMNS}
+        self.count = 0
+
+    def write(self, path, line, records):
+        if path != self.path:
+            self._flush()
+            self.path = path
+
+        columns = self.columns
+        columns['line'].append(line)
+        columns['steps'].append(len(records))
+        columns['accepted'].append(records[-1][1] == STEP_ACCEPT)
+        for depth, action, arg, index in records:
+            columns['depth'].append(depth)
+            columns['action'].append(action)
+            columns['arg'].append(arg)
+            columns['index'].append(index)
+
+        self.count += 1
+        if self.count == BLOCK_LINES:
+            self._flush()
+
+    def _flush(self):
+        if self.count:
+            marshal.dump((self.path,) + tuple(self.columns[name].tobytes()
+                                              for name, _ in INSTRUCTION_COLUMNS + STEP_COLUMNS),
+                         self.out)
+            self._new_block()
+
+    def close(self):
+        self._flush()
+
+
+TRACE_WRITERS = {
+    FORMAT_CSV: _CsvWriter,
+    FORMAT_JSONL: _JsonlWriter,
+    FORMAT_BINARY: _BinaryWriter,
+}
+
+
+def open_trace_output(path, format):
+    """باز کردن فایل خروجی با حالت مناسب قالب (متنی یا باینری)"""
+    if format == FORMAT_BINARY:
+        return open(path, 'wb')
+    return open(path, 'w', encoding='utf-8', newline='')
+
+
+def load_trace(path):
+    """
+    خواندن فایل باینری trace
+
+    Returns:
+        دیکشنری نام ستون → array (file، line، steps، accepted برای هر دستور و
+        depth، action، arg، index برای هر مرحله) و 'files' (لیست مسیرها؛
+        ستون file اندیس این لیست است)
+    """
+    columns = {name: array(code) for name, code in INSTRUCTION_COLUMNS + STEP_COLUMNS}
+    names = [name for name, _ in INSTRUCTION_COLUMNS + STEP_COLUMNS]
+    files = []
+    file_column = array('I')
+
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"فایل trace نامعتبر: {path}")
+        while True:
+            try:
+                block = marshal.load(f)
+            except EOFError:
+                break
+            path, data = block[0], block[1:]
+            if not files or files[-1] != path:
+                files.append(path)
+            start = len(columns['line'])
+            for name, column in zip(names, data):
+                columns[name].frombytes(column)
+            file_column.extend([len(files) - 1] * (len(columns['line']) - start))
+
+    columns['file'] = file_column
+    columns['files'] = files
+    return columns
+
+
+# ═══════════════════════════════════════════════════════════════════
+#                          trace فایل‌ها
+# ═══════════════════════════════════════════════════════════════════
+
+def trace_buffer(buffer, path='-', writer=None, coverage=None, diagnostics=None):
+    """
+    trace همه‌ی خطوط یک بافر بایتی
+
+    Args:
+        buffer: bytes یا mmap
+        path: نام فایل در خروجی
+        writer: نمونه‌ای از یکی از TRACE_WRITERS (اختیاری)
+        coverage: TraceCoverage (پیش‌فرض یک نمونه‌ی جدید)
+        diagnostics: لیست خطاهای lexer (کاراکترهای غیرمجاز)
+
+    Returns:
+        TraceCoverage
+    """
+    coverage = coverage or TraceCoverage()
+    state_hits = coverage.state_hits
+
+    for line, terminals in iter_line_terminals(buffer, diagnostics):
+        records = run_table(terminals, state_hits)
+        coverage.add(records)
+        if writer is not None:
+            writer.write(path, line, records)
+
+    return coverage
+
+
+def trace_file(filename, writer=None, coverage=None):
+    """
+    trace همه‌ی خطوط یک فایل در یک گذر
+
+    Args:
+        filename: نام فایل assembly
+        writer: نمونه‌ای از یکی از TRACE_WRITERS یا None برای فقط پوشش
+        coverage: TraceCoverage مشترک برای چند فایل (اختیاری)
+
+    Returns:
+        (coverage، diagnostics) یا None اگر فایل پیدا نشود
+    """
+    try:
+        f = open(filename, 'rb')
+    except FileNotFoundError:
+        print(f"❌ فایل '{filename}' پیدا نشد")
+        return None
+
+    coverage = coverage or TraceCoverage()
+    diagnostics = []
+    with f:
+        if os.fstat(f.fileno()).st_size:  # mmap فایل خالی ممکن نیست
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                trace_buffer(buffer, filename, writer, coverage, diagnostics)
+
+    return coverage, diagnostics
+
+
+def trace_files(filenames, out=None, format=FORMAT_JSONL):
+    """
+    trace چند فایل در یک خروجی و پوشش مشترک
+
+    Args:
+        filenames: لیست نام فایل‌ها
+        out: فایل خروجی باز (open_trace_output) یا None برای فقط پوشش
+        format: FORMAT_CSV، FORMAT_JSONL یا FORMAT_BINARY
+
+    Returns:
+        (coverage، diagnostics، missing) - diagnostics لیست (نام فایل، Diagnostic)
+        و missing فایل‌هایی که پیدا نشدند
+    """
+    writer = None if out is None else TRACE_WRITERS[format](out)
+    coverage = TraceCoverage()
+    diagnostics = []
+    missing = []
+
+    for filename in filenames:
+        result = trace_file(filename, writer, coverage)
+        if result is None:
+            missing.append(filename)
+        else:
+            diagnostics.extend((filename, diagnostic) for diagnostic in result[1])
+
+    if writer is not None:
+        writer.close()
+    return coverage, diagnostics, missing
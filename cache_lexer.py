@@ -1,11 +1,13 @@
-import ply.lex as lex
+import re
+import types
+from diagnostics import Diagnostic, ILLEGAL_CHARACTER
+from instruction_set import MNEMONICS
 
-tokens = (
-    'CLFLUSH', 'CLFLUSHOPT', 'CLWB',
-    'PREFETCHT0', 'PREFETCHT1', 'PREFETCHT2', 'PREFETCHNTA',
-    'WBINVD', 'INVD',
+# توکن‌های mnemonic از جدول instruction_set
+tokens = MNEMONICS + (
     'REGISTER', 'NUMBER', 'IDENTIFIER',
     'LBRACKET', 'RBRACKET', 'PLUS', 'MINUS',
+    'NEWLINE',
 )
 
 t_LBRACKET = r'\['
@@ -87,6 +89,10 @@ t_ignore = ' \t'
 def t_newline(t):
     r'\n+'
     t.lexer.lineno += len(t.value)
+    # در حالت پارس کل برنامه، پایان خط جداکننده‌ی دستورات است
+    if t.lexer.emit_newlines:
+        t.type = 'NEWLINE'
+        return t
 
 
 def t_COMMENT(t):
@@ -95,12 +101,230 @@ def t_COMMENT(t):
 
 
 def t_error(t):
-    print(f"کاراکتر غیرمجاز '{t.value[0]}' در خط {t.lineno}")
+    # اگر lexer لیست خطا دارد، خطا فقط ثبت می‌شود (بدون چاپ)
+    if t.lexer.diagnostics is None:
+        print(f"کاراکتر غیرمجاز '{t.value[0]}' در خط {t.lineno}")
+    else:
+        t.lexer.diagnostics.append(Diagnostic.illegal_character(t))
     t.lexer.skip(1)
 
 
-def build_lexer():
-    return lex.lex()
+# ═══════════════════════════════════════════════════════════════════
+#                    حالت جدول کلمات کلیدی (keyword table)
+# ═══════════════════════════════════════════════════════════════════
+
+# حالت‌های lexer
+LEXER_RULES = 'rules'        # یک تابع t_* برای هر mnemonic (پیش‌فرض)
+LEXER_KEYWORDS = 'keywords'  # یک regex برای کلمات + جستجو در جدول
+
+# همان رجیسترهای t_REGISTER
+REGISTERS = frozenset(
+    [f"R{n}{suffix}" for n in range(8, 16) for suffix in ('', 'B', 'W', 'D', 'L')] +
+    [f"{prefix}{name}" for prefix in 'ER'
+     for name in ('AX', 'BX', 'CX', 'DX', 'SI', 'DI', 'BP', 'SP', 'IP')]
+)
+
+# کلمه → نوع توکن
+KEYWORDS = dict({mnemonic: mnemonic for mnemonic in MNEMONICS},
+                **{register: 'REGISTER' for register in REGISTERS})
+
+
+def _keyword_or_identifier(t):
+    r'[a-zA-Z_][a-zA-Z0-9_]*'
+    # یک جستجوی dict به جای امتحان ترتیبی regex هر mnemonic
+    t.type = KEYWORDS.get(t.value, 'IDENTIFIER')
+    return t
+
+
+# قوانین مشترک دو حالت (نام‌ها به‌صورت رشته، چون PLY تعریف دوباره‌ی t_* را خطا می‌داند)
+_SHARED_RULES = (
+    'tokens', 't_LBRACKET', 't_RBRACKET', 't_PLUS', 't_MINUS', 't_NUMBER',
+    't_ignore', 't_newline', 't_COMMENT', 't_error',
+)
+
+
+def _keyword_rules():
+    """
+    قوانین lexer حالت LEXER_KEYWORDS
+
+    توکن‌ها و قوانین نمادها، اعداد، کامنت و پایان خط همان قوانین حالت
+    LEXER_RULES هستند؛ فقط همه‌ی کلمات با یک قانون خوانده می‌شوند.
+    تفاوت: کل کلمه یک توکن است (مثلا CLFLUSHX یک IDENTIFIER است، نه CLFLUSH و X).
+    """
+    rules = {name: globals()[name] for name in _SHARED_RULES}
+    rules['t_IDENTIFIER'] = _keyword_or_identifier
+    rules['__file__'] = __file__
+    return types.SimpleNamespace(**rules)
+
+
+def build_lexer(emit_newlines=False, mode=LEXER_RULES):
+    """
+    ساخت lexer
+
+    Args:
+        emit_newlines: تولید توکن NEWLINE برای پایان خطوط (پارس کل فایل)
+        mode: LEXER_RULES (یک قانون برای هر mnemonic) یا
+              LEXER_KEYWORDS (یک regex کلمه و جدول KEYWORDS)
+    """
+    # ply.lex فقط برای ساخت lexer لازم است (iter_spans و span ها بدون آن کار می‌کنند)
+    import ply.lex as lex
+
+    if mode == LEXER_RULES:
+        lexer = lex.lex()
+    elif mode == LEXER_KEYWORDS:
+        lexer = lex.lex(module=_keyword_rules())
+    else:
+        raise ValueError(f"حالت lexer نامعتبر: {mode}")
+    lexer.emit_newlines = emit_newlines
+    # وضعیت پارس جاری (توسط CacheInstructionParser تنظیم می‌شود)
+    lexer.diagnostics = None  # لیست Diagnostic ها
+    lexer.debug = False       # نمایش مراحل reduce در قوانین گرامر
+    lexer.table = None        # InstructionTable پارس کل فایل
+    return lexer
+
+
+_lexer_fingerprint = None
+
+
+def lexer_fingerprint():
+    """
+    اثر انگشت lexer: hash از متن این ماژول و instruction_set
+
+    grammar_fingerprint فقط قوانین گرامر و نام token ها را می‌بیند؛ تغییر regex
+    قوانین، t_ignore، رجیسترها یا جدول mnemonic ها نتیجه‌ی پارس را عوض می‌کند
+    و باید کلید cache نتایج را هم عوض کند.
+    """
+    global _lexer_fingerprint
+    if _lexer_fingerprint is None:
+        import hashlib
+        import inspect
+        import sys
+        import instruction_set
+
+        h = hashlib.sha256()
+        for module in (sys.modules[__name__], instruction_set):
+            try:
+                h.update(inspect.getsource(module).encode())
+            except (OSError, TypeError):
+                # بدون متن منبع: regex قوانین و جدول‌ها
+                h.update(repr(sorted((name, getattr(value, '__doc__', value) if callable(value) else value)
+                                     for name, value in vars(module).items()
+                                     if name.startswith('t_') or name.isupper())).encode())
+        _lexer_fingerprint = h.hexdigest()[:16]
+    return _lexer_fingerprint
+
+
+# ═══════════════════════════════════════════════════════════════════
+#                  lexer بایتی (span) برای فایل‌های بزرگ
+# ═══════════════════════════════════════════════════════════════════
+
+# شناسه‌ی هر نوع توکن = اندیس آن در tokens (همان شناسه‌ی ترمینال در lr_driver)
+TOKEN_ID = {name: i for i, name in enumerate(tokens)}
+
+_WORD_END = rb'(?![a-zA-Z0-9_])'
+
+# یک گروه نام‌دار برای هر mnemonic: نوع توکن از m.lastgroup خوانده می‌شود و
+# برای تشخیص کلمه هیچ bytes/str ساخته نمی‌شود. مثل حالت LEXER_KEYWORDS کل
+# کلمه یک توکن است. IGNORE فاصله، '\r' و کامنت است. regex در اولین
+# استفاده compile می‌شود (import سریع‌تر).
+_SPAN_PATTERN = b'|'.join(
+    [rb'(?P<IGNORE>[ \t\r]+|;[^\n]*)', rb'(?P<NEWLINE>\n+)'] +
+    [b'(?P<%s>%s)%s' % (name.encode(), name.encode(), _WORD_END)
+     for name in sorted(MNEMONICS, key=len, reverse=True)] +
+    [rb'(?P<REGISTER>(?:R(?:8|9|1[0-5])[BWDL]?|[ER](?:AX|BX|CX|DX|SI|DI|BP|SP|IP))' + _WORD_END + rb')',
+     rb'(?P<IDENTIFIER>[a-zA-Z_][a-zA-Z0-9_]*)',
+     rb'(?P<NUMBER>\d+)',
+     rb'(?P<LBRACKET>\[)',
+     rb'(?P<RBRACKET>\])',
+     rb'(?P<PLUS>\+)',
+     rb'(?P<MINUS>-)']
+)
+_span_re = None
+
+
+def iter_spans(buffer, diagnostics=None):
+    """
+    تحلیل واژگانی مستقیم روی بافر بایتی (bytes یا mmap)
+
+    برای هر توکن فقط یک span ساخته می‌شود و متن خطوط کپی نمی‌شود؛ مقدار
+    توکن در صورت نیاز با span_value خوانده می‌شود. کاراکترهای غیرمجاز
+    (فاصله‌ی بین دو match) به diagnostics اضافه می‌شوند.
+
+    Yields:
+        (offset، length، type) - type اندیس نوع توکن در tokens است
+    """
+    global _span_re
+    if _span_re is None:
+        _span_re = re.compile(_SPAN_PATTERN)
+
+    token_id = TOKEN_ID
+    newline = TOKEN_ID['NEWLINE']
+    lineno = 1
+    line_start = 0
+    pos = 0
+
+    for m in _span_re.finditer(buffer):
+        start, end = m.span()
+        if start != pos:
+            _illegal_span(buffer, pos, start, lineno, line_start, diagnostics)
+        pos = end
+
+        kind = m.lastgroup
+        if kind != 'IGNORE':
+            type = token_id[kind]
+            if type == newline:
+                lineno += end - start
+                line_start = end
+            yield start, end - start, type
+
+    if pos != len(buffer):
+        _illegal_span(buffer, pos, len(buffer), lineno, line_start, diagnostics)
+
+
+def _illegal_span(buffer, start, end, lineno, line_start, diagnostics):
+    """ثبت کاراکترهای غیرمجاز بین start و end (همه در خطی که از line_start شروع می‌شود)"""
+    column = span_column(buffer, line_start, start)
+    for char in buffer[start:end].decode('utf-8', 'replace'):
+        if diagnostics is None:
+            print(f"کاراکتر غیرمجاز '{char}' در خط {lineno}")
+        else:
+            diagnostic = Diagnostic(lineno, column, 'ILLEGAL', char, (), ILLEGAL_CHARACTER)
+            diagnostic.source = span_line(buffer, start)
+            diagnostics.append(diagnostic)
+        column += 1
+
+
+def span_column(buffer, line_start, offset):
+    """شماره ستون (از 1، بر حسب کاراکتر مثل column_of) یک offset بایتی"""
+    return len(buffer[line_start:offset].decode('utf-8', 'replace')) + 1
+
+
+def span_line(buffer, offset):
+    """متن دستور خطی که offset در آن است (بدون فاصله‌ها و کامنت) - فقط برای گزارش خطا"""
+    start = buffer.rfind(b'\n', 0, offset) + 1
+    end = buffer.find(b'\n', offset)
+    line = buffer[start:len(buffer) if end < 0 else end]
+    return line.split(b';')[0].strip().decode('utf-8', 'replace')
+
+
+_NUMBER_ID = TOKEN_ID['NUMBER']
+_NAME_IDS = frozenset((TOKEN_ID['REGISTER'], TOKEN_ID['IDENTIFIER']))
+
+
+def span_value(buffer, offset, length, type):
+    """
+    مقدار یک توکن span (همان مقدار توکن PLY)
+
+    mnemonic ها نام ثابت خود را برمی‌گردانند و فقط REGISTER، IDENTIFIER و
+    NUMBER از بافر خوانده می‌شوند؛ نمادها مقداری ندارند (None).
+    """
+    if type in _NAME_IDS:
+        return buffer[offset:offset + length].decode('ascii')
+    if type == _NUMBER_ID:
+        return int(buffer[offset:offset + length])
+    if type < len(MNEMONICS):
+        return tokens[type]
+    return None
 
 
 if __name__ == "__main__":
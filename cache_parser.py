@@ -13,9 +13,19 @@ Cache Control Instructions Parser
 - Parse Tree کامل طبق گرامر BNF
 """
 
-import ply.yacc as yacc
-from cache_lexer import tokens, build_lexer
-import json
+from cache_lexer import tokens, t_ignore, build_lexer, LEXER_RULES
+from diagnostics import Diagnostic, render_diagnostics
+from instruction_set import lookup
+import collections
+import functools
+import heapq
+import io
+import itertools
+import mmap
+import os
+import re
+import sys
+import threading
 
 
 # ═══════════════════════════════════════════════════════════════════
@@ -23,7 +33,14 @@ import json
 # ═══════════════════════════════════════════════════════════════════
 
 class ASTNode:
-    """کلاس پایه برای تمام گره‌های درخت نحوی (Abstract Syntax Tree)"""
+    """
+    کلاس پایه برای تمام گره‌های درخت نحوی (Abstract Syntax Tree)
+
+    همه‌ی گره‌ها __slots__ دارند (بدون __dict__ برای هر نمونه) و نوع گره
+    (type) یک ویژگی کلاس است.
+    """
+
+    __slots__ = ()
 
     def to_dict(self):
         """تبدیل گره به دیکشنری برای JSON"""
@@ -41,18 +58,46 @@ class Instruction(ASTNode):
     Args:
         mnemonic: نام دستور (مثل CLFLUSH)
         operand: عملوند (آدرس حافظه یا None)
+        lineno: شماره خط دستور در فایل ورودی
+
+    اطلاعات mnemonic (دسته، نیاز به operand، ...) هنگام ساخت از جدول
+    instruction_set گرفته می‌شود و در info نگه داشته می‌شود.
     """
 
-    def __init__(self, mnemonic, operand=None):
-        self.mnemonic = mnemonic
+    __slots__ = ('mnemonic', 'operand', 'lineno', 'info')
+    type = 'Instruction'
+
+    def __init__(self, mnemonic, operand=None, lineno=None):
+        self.info = lookup(mnemonic)
+        self.mnemonic = self.info.name if self.info.id >= 0 else sys.intern(mnemonic)
         self.operand = operand
-        self.type = 'Instruction'
+        self.lineno = lineno
+
+    @property
+    def category(self):
+        """دسته‌ی دستور (flush، writeback، prefetch، invalidate)"""
+        return self.info.category
+
+    def copy(self):
+        """کپی گره و عملوند آن (Register و Identifier یکتا و مشترک می‌مانند)"""
+        node = Instruction.__new__(Instruction)
+        node.info = self.info
+        node.mnemonic = self.mnemonic
+        node.operand = None if self.operand is None else self.operand.copy()
+        node.lineno = self.lineno
+        return node
 
     def __repr__(self):
         if self.operand:
             return f"Instruction({self.mnemonic}, {self.operand})"
         return f"Instruction({self.mnemonic})"
 
+    def to_asm(self):
+        """متن assembly دستور (مثل CLFLUSHOPT [EBX+16])"""
+        if self.operand is None:
+            return self.mnemonic
+        return f"{self.mnemonic} [{self.operand.base}{self.operand.offset_text}]"
+
     def to_dict(self):
         return {
             'type': 'Instruction',
@@ -81,17 +126,8 @@ class Instruction(ASTNode):
         lines = []
         lines.append("Instruction")
 
-        # تشخیص نوع Mnemonic و دسته‌بندی
-        category = self.get_instruction_category()
-
-        category_mapping = {
-            'flush': 'CacheFlush',
-            'writeback': 'CacheWrite',
-            'prefetch': 'CachePrefetch',
-            'invalidate': 'CacheInvalidate'
-        }
-
-        category_name = category_mapping.get(category, 'Mnemonic')
+        # نام دسته در گرامر BNF
+        category_name = self.info.bnf_name
 
         if self.operand:
             lines.append("├── Mnemonic")
@@ -108,10 +144,9 @@ class Instruction(ASTNode):
                 lines.append(f"        │   │   └── {self.operand.base.name} (terminal)")
 
                 # اگر Offset داشت
-                if self.operand.offset:
+                if self.operand.offset is not None:
                     lines.append("        │   └── Offset")
-                    sign = self.operand.offset[0]
-                    num = self.operand.offset[1:]
+                    sign, num = self.operand.offset_parts()
                     lines.append(f"        │       ├── {sign} (terminal)")
                     lines.append(f"        │       └── {num} (terminal)")
                 else:
@@ -141,23 +176,17 @@ class Instruction(ASTNode):
         if self.operand:
             steps.append("→ Mnemonic Operand")
 
-            category = self.get_instruction_category()
-            if category == 'flush':
-                steps.append("→ CacheFlush Operand")
-            elif category == 'writeback':
-                steps.append("→ CacheWrite Operand")
-            elif category == 'prefetch':
-                steps.append("→ CachePrefetch Operand")
+            if self.info.requires_operand:
+                steps.append(f"→ {self.info.bnf_name} Operand")
 
             steps.append(f"→ {self.mnemonic} Operand")
             steps.append(f"→ {self.mnemonic} MemoryAddress")
             steps.append(f"→ {self.mnemonic} [ BaseExpr ]")
 
             if isinstance(self.operand.base, Register):
-                if self.operand.offset:
+                if self.operand.offset is not None:
                     steps.append(f"→ {self.mnemonic} [ Register Offset ]")
-                    sign = self.operand.offset[0]
-                    num = self.operand.offset[1:]
+                    sign, num = self.operand.offset_parts()
                     steps.append(f"→ {self.mnemonic} [ {self.operand.base.name} {sign} {num} ]")
                 else:
                     steps.append(f"→ {self.mnemonic} [ Register ]")
@@ -174,17 +203,7 @@ class Instruction(ASTNode):
 
     def get_instruction_category(self):
         """دسته‌بندی نوع دستور"""
-        categories = {
-            'flush': ['CLFLUSH', 'CLFLUSHOPT'],
-            'writeback': ['CLWB'],
-            'prefetch': ['PREFETCHT0', 'PREFETCHT1', 'PREFETCHT2', 'PREFETCHNTA'],
-            'invalidate': ['WBINVD', 'INVD']
-        }
-
-        for category, mnemonics in categories.items():
-            if self.mnemonic in mnemonics:
-                return category
-        return 'unknown'
+        return self.info.category
 
 
 class MemoryOperand(ASTNode):
@@ -193,19 +212,36 @@ class MemoryOperand(ASTNode):
 
     Args:
         base: رجیستر یا شناسه پایه
-        offset: جابجایی (offset) نسبت به base
+        offset: جابجایی (offset) نسبت به base - عدد صحیح علامت‌دار یا None
     """
 
+    __slots__ = ('base', 'offset')
+    type = 'MemoryOperand'
+
     def __init__(self, base, offset=None):
         self.base = base
         self.offset = offset
-        self.type = 'MemoryOperand'
+
+    def copy(self):
+        """کپی گره (base یکتا و مشترک می‌ماند)"""
+        return MemoryOperand(self.base, self.offset)
 
     def __repr__(self):
-        if self.offset:
-            return f"Memory([{self.base}{self.offset}])"
+        if self.offset is not None:
+            return f"Memory([{self.base}{self.offset_text}])"
         return f"Memory([{self.base}])"
 
+    @property
+    def offset_text(self):
+        """شکل متنی offset (مثل +16 یا -8) - فقط برای نمایش"""
+        if self.offset is None:
+            return ''
+        return f"{self.offset:+d}"
+
+    def offset_parts(self):
+        """(علامت، مقدار مطلق) offset برای نمایش درخت پارس"""
+        return ('-' if self.offset < 0 else '+'), abs(self.offset)
+
     def to_dict(self):
         return {
             'type': 'MemoryOperand',
@@ -219,8 +255,8 @@ class MemoryOperand(ASTNode):
         lines = []
         lines.append(f"{prefix}MemoryOperand:")
         lines.append(f"{prefix}├─ Base: {self.base}")
-        if self.offset:
-            lines.append(f"{prefix}└─ Offset: {self.offset}")
+        if self.offset is not None:
+            lines.append(f"{prefix}└─ Offset: {self.offset_text}")
         else:
             lines.append(f"{prefix}└─ Offset: None")
         return lines
@@ -230,14 +266,30 @@ class Register(ASTNode):
     """
     گره رجیستر
 
+    نمونه‌ها یکتا (interned) هستند: Register('RAX') همیشه همان شیء را
+    برمی‌گرداند، پس نباید تغییر داده شوند.
+
     Args:
         name: نام رجیستر (مثل EAX، RBX)
     """
 
-    def __init__(self, name):
-        self.name = name
-        self.type = 'Register'
-        self.bit_width = 64 if name.startswith('R') else 32
+    __slots__ = ('name', 'bit_width')
+    type = 'Register'
+    _interned = {}
+
+    def __new__(cls, name):
+        node = cls._interned.get(name)
+        if node is None:
+            node = super().__new__(cls)
+            node.name = sys.intern(name)
+            node.bit_width = 64 if name.startswith('R') else 32
+            # setdefault: دو thread همزمان هم به یک نمونه‌ی یکتا می‌رسند
+            node = cls._interned.setdefault(node.name, node)
+        return node
+
+    def __reduce__(self):
+        # بعد از unpickle هم نمونه‌ی یکتا برگردانده می‌شود
+        return (Register, (self.name,))
 
     def __repr__(self):
         return f"Register({self.name})"
@@ -261,13 +313,27 @@ class Identifier(ASTNode):
     """
     گره شناسه (لیبل)
 
+    مثل Register نمونه‌ها یکتا (interned) هستند.
+
     Args:
         name: نام شناسه (مثل cache_line، data_ptr)
     """
 
-    def __init__(self, name):
-        self.name = name
-        self.type = 'Identifier'
+    __slots__ = ('name',)
+    type = 'Identifier'
+    _interned = {}
+
+    def __new__(cls, name):
+        node = cls._interned.get(name)
+        if node is None:
+            node = super().__new__(cls)
+            node.name = sys.intern(name)
+            # setdefault: دو thread همزمان هم به یک نمونه‌ی یکتا می‌رسند
+            node = cls._interned.setdefault(node.name, node)
+        return node
+
+    def __reduce__(self):
+        return (Identifier, (self.name,))
 
     def __repr__(self):
         return f"Identifier({self.name})"
@@ -297,24 +363,24 @@ class Identifier(ASTNode):
 # قانون 1: دستورات Flush با operand
 def p_instruction_flush_with_operand(p):
     """instruction : flush_mnemonic operand"""
-    p[0] = Instruction(p[1], p[2])
-    if parser_debug:
+    p[0] = Instruction(p[1], p[2], p.lineno(1))
+    if p.lexer.debug:
         print(f"  [REDUCE] {p[1]} + Operand → Instruction (Flush)")
 
 
 # قانون 2: دستورات Prefetch با operand
 def p_instruction_prefetch_with_operand(p):
     """instruction : prefetch_mnemonic operand"""
-    p[0] = Instruction(p[1], p[2])
-    if parser_debug:
+    p[0] = Instruction(p[1], p[2], p.lineno(1))
+    if p.lexer.debug:
         print(f"  [REDUCE] {p[1]} + Operand → Instruction (Prefetch)")
 
 
 # قانون 3: دستورات WriteBack با operand
 def p_instruction_writeback_with_operand(p):
     """instruction : writeback_mnemonic operand"""
-    p[0] = Instruction(p[1], p[2])
-    if parser_debug:
+    p[0] = Instruction(p[1], p[2], p.lineno(1))
+    if p.lexer.debug:
         print(f"  [REDUCE] {p[1]} + Operand → Instruction (WriteBack)")
 
 
@@ -326,8 +392,8 @@ def p_instruction_writeback_with_operand(p):
 def p_instruction_invalidate_no_operand(p):
     """instruction : WBINVD
                    | INVD"""
-    p[0] = Instruction(p[1])
-    if parser_debug:
+    p[0] = Instruction(p[1], lineno=p.lineno(1))
+    if p.lexer.debug:
         print(f"  [REDUCE] {p[1]} → Instruction (Invalidate - no operand)")
 
 
@@ -340,7 +406,8 @@ def p_flush_mnemonic(p):
     """flush_mnemonic : CLFLUSH
                       | CLFLUSHOPT"""
     p[0] = p[1]
-    if parser_debug:
+    p.set_lineno(0, p.lineno(1))
+    if p.lexer.debug:
         print(f"  [REDUCE] {p[1]} → FlushMnemonic")
 
 
@@ -351,7 +418,8 @@ def p_prefetch_mnemonic(p):
                          | PREFETCHT2
                          | PREFETCHNTA"""
     p[0] = p[1]
-    if parser_debug:
+    p.set_lineno(0, p.lineno(1))
+    if p.lexer.debug:
         print(f"  [REDUCE] {p[1]} → PrefetchMnemonic")
 
 
@@ -359,7 +427,8 @@ def p_prefetch_mnemonic(p):
 def p_writeback_mnemonic(p):
     """writeback_mnemonic : CLWB"""
     p[0] = p[1]
-    if parser_debug:
+    p.set_lineno(0, p.lineno(1))
+    if p.lexer.debug:
         print(f"  [REDUCE] {p[1]} → WriteBackMnemonic")
 
 
@@ -371,7 +440,7 @@ def p_writeback_mnemonic(p):
 def p_operand(p):
     """operand : memory_address"""
     p[0] = p[1]
-    if parser_debug:
+    if p.lexer.debug:
         print(f"  [REDUCE] MemoryAddress → Operand")
 
 
@@ -379,7 +448,7 @@ def p_operand(p):
 def p_memory_address(p):
     """memory_address : LBRACKET base_expr RBRACKET"""
     p[0] = p[2]
-    if parser_debug:
+    if p.lexer.debug:
         print(f"  [REDUCE] [ BaseExpr ] → MemoryAddress")
 
 
@@ -387,7 +456,7 @@ def p_memory_address(p):
 def p_base_expr_register_offset(p):
     """base_expr : REGISTER offset"""
     p[0] = MemoryOperand(Register(p[1]), p[2])
-    if parser_debug:
+    if p.lexer.debug:
         print(f"  [REDUCE] Register + Offset → BaseExpr")
 
 
@@ -395,7 +464,7 @@ def p_base_expr_register_offset(p):
 def p_base_expr_register(p):
     """base_expr : REGISTER"""
     p[0] = MemoryOperand(Register(p[1]))
-    if parser_debug:
+    if p.lexer.debug:
         print(f"  [REDUCE] Register → BaseExpr")
 
 
@@ -403,174 +472,912 @@ def p_base_expr_register(p):
 def p_base_expr_identifier(p):
     """base_expr : IDENTIFIER"""
     p[0] = MemoryOperand(Identifier(p[1]))
-    if parser_debug:
+    if p.lexer.debug:
         print(f"  [REDUCE] Identifier → BaseExpr")
 
 
 # قانون 13: Offset مثبت
 def p_offset_plus(p):
     """offset : PLUS NUMBER"""
-    p[0] = f"+{p[2]}"
-    if parser_debug:
+    p[0] = p[2]
+    if p.lexer.debug:
         print(f"  [REDUCE] + NUMBER → Offset (+{p[2]})")
 
 
 # قانون 14: Offset منفی
 def p_offset_minus(p):
     """offset : MINUS NUMBER"""
-    p[0] = f"-{p[2]}"
-    if parser_debug:
+    p[0] = -p[2]
+    if p.lexer.debug:
         print(f"  [REDUCE] - NUMBER → Offset (-{p[2]})")
 
 
+# ───────────────────────────────────────────────────────────────────
+# قوانین برنامه (پارس کل فایل در یک فراخوانی)
+# ───────────────────────────────────────────────────────────────────
+
+# برنامه: دنباله‌ای از خطوط که با NEWLINE از هم جدا شده‌اند
+def p_program(p):
+    """program : instruction_list"""
+    p[0] = p[1]
+
+
+def p_instruction_list(p):
+    """instruction_list : instruction_list line"""
+    p[0] = p[1]
+    if p[2] is not None:
+        p[0].append(p[2])
+        table = p.lexer.table
+        if table is not None:
+            table.append(p[2])
+
+
+def p_instruction_list_empty(p):
+    """instruction_list : """
+    p[0] = []
+
+
+# خط دارای دستور
+def p_line_instruction(p):
+    """line : instruction NEWLINE"""
+    p[0] = p[1]
+
+
+# خط خالی یا فقط کامنت
+def p_line_empty(p):
+    """line : NEWLINE"""
+    p[0] = None
+
+
+# بازیابی از خطا (panic mode): توکن‌ها تا پایان خط دور ریخته می‌شوند
+def p_line_error(p):
+    """line : error NEWLINE"""
+    p[0] = None
+    # خطای خط بعدی هم باید گزارش شود
+    p.parser.errok()
+
+
 # ═══════════════════════════════════════════════════════════════════
 #                          Error Handling
 # ═══════════════════════════════════════════════════════════════════
 
 def p_error(p):
-    """مدیریت خطاهای نحوی"""
-    if p:
-        error_msg = f"""
-╔════════════════════════════════════════════════════════════════╗
-║                      SYNTAX ERROR                              ║
-╚════════════════════════════════════════════════════════════════╝
-
-  خطای نحوی در توکن: '{p.value}'
-  نوع توکن: {p.type}
-  موقعیت: خط {p.lineno}
-
-  💡 احتمالا مشکل در:
-     - فرمت دستور اشتباه است
-     - کروشه باز یا بسته فراموش شده
-     - عملوند نامعتبر
-     - دستورات CLFLUSH، CLFLUSHOPT، CLWB و PREFETCH* نیاز به operand دارند
-
-  ✓ فرمت صحیح:
-     MNEMONIC [REGISTER]
-     MNEMONIC [REGISTER+NUMBER]
-     MNEMONIC [REGISTER-NUMBER]
-     MNEMONIC [IDENTIFIER]
-     WBINVD  (بدون operand)
-     INVD    (بدون operand)
-"""
-        print(error_msg)
-
-        # پیشنهاد اصلاح
-        if p.type == 'REGISTER':
-            print("  📌 پیشنهاد: رجیستر باید داخل کروشه باشد: [REGISTER]")
-        elif p.type == 'NUMBER':
-            print("  📌 پیشنهاد: قبل از عدد باید + یا - باشد")
-        elif p.type in ['CLFLUSH', 'CLFLUSHOPT', 'CLWB', 'PREFETCHT0', 'PREFETCHT1', 'PREFETCHT2', 'PREFETCHNTA']:
-            print(f"  📌 پیشنهاد: {p.type} نیاز به operand دارد → {p.type} [REGISTER]")
+    """
+    مدیریت خطاهای نحوی (پیش‌فرض)
 
+    CacheInstructionParser برای هر parser خود _report_syntax_error را به‌جای
+    این تابع قرار می‌دهد؛ این تابع فقط برای parser هایی است که مستقیما با
+    build_parser ساخته شده‌اند.
+    """
+    if p is None:
+        print("خطای نحوی در انتهای ورودی")
     else:
-        print("""
-╔════════════════════════════════════════════════════════════════╗
-║                      SYNTAX ERROR                              ║
-╚════════════════════════════════════════════════════════════════╝
+        print(f"خطای نحوی در توکن '{p.value}' ({p.type}) در خط {p.lineno}")
 
-  خطای نحوی در انتهای ورودی
 
-  💡 احتمالا:
-     - دستور ناقص است
-     - کروشه بسته نشده
-""")
+def _report_syntax_error(parser, lexer, stop, p):
+    """
+    ثبت خطای نحوی یک parser به‌صورت Diagnostic
+
+    خطا فقط به لیست خطاهای پارس جاری (lexer.diagnostics) اضافه می‌شود؛
+    متن کامل (کادر SYNTAX ERROR) هنگام نمایش با render_diagnostics ساخته می‌شود.
+    در پارس کل فایل parser با قانون «line : error NEWLINE» از ابتدای خط بعد ادامه می‌دهد.
+
+    با stop (پارس تک دستور) بقیه‌ی ورودی کنار گذاشته می‌شود: بازیابی PLY به
+    پایان ورودی می‌رسد و parse مقدار None برمی‌گرداند، مثل LRDriver (بدون آن
+    PLY توکن‌ها را دور می‌ریزد و ممکن است دستور بعد از خطا را بپذیرد).
+    """
+    expected = tuple(sorted(t for t in parser.action[parser.state] if t != 'error'))
+    lexer.diagnostics.append(Diagnostic.syntax_error(p, lexer, expected))
+    if stop:
+        lexer.lexpos = lexer.lexlen
 
 
 # ═══════════════════════════════════════════════════════════════════
 #                          Parser Builder
 # ═══════════════════════════════════════════════════════════════════
 
-# متغیر سراسری برای دیباگ
-parser_debug = False
+# موتورهای پارس
+ENGINE_PLY = 'ply'  # جدول‌های LALR تولیدشده توسط PLY
+ENGINE_LR = 'lr'    # درایور جدول‌محور lr_driver روی lr_tables.LR_PARSING_TABLE
+ENGINE_LALR = 'lalr'  # درایور جدول‌محور روی جدول LALR(1) تولیدشده (lr_generator)
 
+# نماد شروع هر نوع parser
+START_INSTRUCTION = 'instruction'
+START_PROGRAM = 'program'
 
-def build_parser(debug=False):
+# نسخه‌ی قالب cache جدول‌ها - با تغییر نحوه‌ی ذخیره‌سازی افزایش یابد
+TABLE_CACHE_VERSION = 1
+
+
+def table_cache_dir():
+    """
+    پوشه‌ی cache جدول‌های پارس (خارج از پوشه‌ی کاری)
+
+    ترتیب انتخاب: متغیر محیطی CACHE_PARSER_CACHE_DIR،
+    سپس $XDG_CACHE_HOME/cache_parser و در نهایت ~/.cache/cache_parser
+    """
+    path = os.environ.get('CACHE_PARSER_CACHE_DIR')
+    if path:
+        return path
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'cache_parser')
+
+
+def grammar_fingerprint(start=START_INSTRUCTION):
+    """
+    اثر انگشت گرامر: hash از docstring قوانین p_* و لیست tokens
+
+    هر تغییری در قوانین گرامر یا token های lexer یک کلید جدید می‌سازد
+    و جدول‌های قدیمی دیگر استفاده نمی‌شوند.
+
+    Args:
+        start: نماد شروع گرامر
+    """
+    import hashlib
+    import ply.yacc as yacc
+
+    h = hashlib.sha256()
+    h.update(f"v{TABLE_CACHE_VERSION}:{yacc.__tabversion__}:{start}".encode())
+    h.update(' '.join(tokens).encode())
+    for name, func in sorted(globals().items()):
+        if name.startswith('p_') and name != 'p_error' and callable(func):
+            h.update(name.encode())
+            h.update((func.__doc__ or '').encode())
+    return h.hexdigest()[:16]
+
+
+class _GrammarErrorLog:
+    """
+    لاگ ساخت گرامر بدون هشدارها (رابط PlyLogger)
+
+    هر دو نوع parser از یک ماژول ساخته می‌شوند، پس قوانین و توکن‌های نوع
+    دیگر (مثل program و NEWLINE) همیشه «استفاده‌نشده» گزارش می‌شوند.
+    """
+
+    def __init__(self, f):
+        self.f = f
+
+    def debug(self, msg, *args, **kwargs):
+        self.f.write((msg % args) + '\n')
+
+    info = debug
+    critical = debug
+
+    def warning(self, msg, *args, **kwargs):
+        pass
+
+    def error(self, msg, *args, **kwargs):
+        self.f.write('ERROR: ' + (msg % args) + '\n')
+
+
+def _yacc(debug, start, **kwargs):
+    """فراخوانی yacc با نماد شروع و لاگ مناسب"""
+    # ply.yacc فقط هنگام ساخت parser لازم است (موتور LR و کلاس‌های AST بدون آن کار می‌کنند)
+    import ply.yacc as yacc
+
+    errorlog = None if debug else _GrammarErrorLog(sys.stderr)
+    return yacc.yacc(debug=debug, start=start, errorlog=errorlog, **kwargs)
+
+
+def _write_table_cache(tabfile, debug, start):
+    """
+    تولید جدول‌ها و نوشتن اتمیک آن‌ها در cache
+
+    جدول ابتدا در یک فایل موقت نوشته و سپس با os.replace جابجا می‌شود
+    تا پروسه‌ها و thread های هم‌زمان هیچ‌وقت فایل نیمه‌کاره نبینند.
+    """
+    os.makedirs(os.path.dirname(tabfile), exist_ok=True)
+    tmpfile = f"{tabfile}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        parser = _yacc(debug, start, picklefile=tmpfile)
+        os.replace(tmpfile, tabfile)
+    finally:
+        if os.path.exists(tmpfile):
+            os.remove(tmpfile)
+    return parser
+
+
+def clear_table_cache():
+    """
+    حذف جدول‌های ذخیره‌شده
+
+    Returns:
+        تعداد فایل‌های حذف‌شده
+    """
+    cache_dir = table_cache_dir()
+    removed = 0
+    if os.path.isdir(cache_dir):
+        for name in os.listdir(cache_dir):
+            if name.startswith('parsetab_'):
+                os.remove(os.path.join(cache_dir, name))
+                removed += 1
+    return removed
+
+
+def build_parser(debug=False, use_cache=True, start=START_INSTRUCTION):
     """
     ساخت parser
 
+    جدول‌های LALR در پوشه‌ی table_cache_dir() با کلید grammar_fingerprint()
+    ذخیره می‌شوند؛ پروسه‌های بعدی فقط جدول را بارگذاری می‌کنند.
+
     Args:
-        debug: فعال‌سازی حالت دیباگ
+        debug: فعال‌سازی حالت دیباگ (بدون cache، parser.out نوشته می‌شود)
+        use_cache: استفاده از cache جدول‌ها روی دیسک
+        start: نماد شروع - START_INSTRUCTION (یک دستور) یا START_PROGRAM (کل فایل)
 
     Returns:
         parser object
     """
-    global parser_debug
-    parser_debug = debug
+    if debug or not use_cache:
+        return _yacc(debug, start, write_tables=False)
+
+    tabfile = os.path.join(table_cache_dir(), f"parsetab_{start}_{grammar_fingerprint(start)}.pickle")
+
+    if os.path.exists(tabfile):
+        try:
+            return _yacc(debug, start, picklefile=tabfile)
+        except Exception:
+            pass  # فایل cache خراب است - دوباره ساخته می‌شود
+
+    try:
+        return _write_table_cache(tabfile, debug, start)
+    except OSError:
+        # پوشه cache قابل نوشتن نیست - ساخت بدون ذخیره
+        return _yacc(debug, start, write_tables=False)
+
+
+# ظرفیت پیش‌فرض cache دستورات
+INSTRUCTION_CACHE_SIZE = 4096
+
+
+# فاصله‌هایی که lexer نادیده می‌گیرد (t_ignore) - بقیه‌ی کاراکترها مثل '\r' یا
+# '\x0c' خطای ILLEGAL_CHARACTER هستند و باید در کلید بمانند
+_IGNORED_BLANKS = re.compile(f"[{t_ignore}]+")
+
+
+def normalize_source(code):
+    """
+    کلید cache یک دستور: بدون کامنت و با فاصله‌های یکسان
+
+    فقط فاصله‌های t_ignore یکسان می‌شوند. فقط برای متن یک‌خطی (پایان خط
+    انتهایی مجاز است)؛ در متن چندخطی کامنت خط اول بقیه‌ی خطوط را هم حذف
+    می‌کرد (ValueError).
+    """
+    code = code.rstrip('\n')
+    if '\n' in code:
+        raise ValueError("کلید cache فقط برای دستور یک‌خطی")
+    return _IGNORED_BLANKS.sub(' ', code.split(';', 1)[0]).strip(t_ignore)
+
+
+class InstructionCache:
+    """
+    cache محدود LRU برای نتیجه‌ی پارس یک دستور
+
+    کلید متن نرمال‌شده (normalize_source) و مقدار Instruction است.
+    CacheInstructionParser.parse کپی گره را ذخیره می‌کند و در هر برخورد یک
+    کپی برمی‌گرداند، پس تغییر گره برگردانده‌شده روی برخوردهای بعدی اثری ندارد.
+    فقط پارس‌های موفق و بدون خطای lexer ذخیره می‌شوند تا خطاها همیشه دوباره
+    گزارش شوند.
+
+    Args:
+        maxsize: حداکثر تعداد دستورات ذخیره‌شده
+    """
+
+    def __init__(self, maxsize=INSTRUCTION_CACHE_SIZE):
+        if maxsize <= 0:
+            raise ValueError(f"ظرفیت cache باید مثبت باشد: {maxsize}")
+        self.maxsize = maxsize
+        self._entries = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Instruction ذخیره‌شده یا None"""
+        ast = self._entries.get(key)
+        if ast is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._entries.move_to_end(key)
+        return ast
+
+    def put(self, key, ast):
+        """ذخیره‌ی یک نتیجه (قدیمی‌ترین مورد در صورت پر بودن حذف می‌شود)"""
+        self._entries[key] = ast
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """خالی کردن cache و صفر کردن شمارنده‌ها"""
+        self._entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """شمارنده‌ها - dict"""
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+
+class CacheInstructionParser:
+    """
+    جفت lexer/parser قابل استفاده مجدد
+
+    lexer و جدول‌های LALR فقط یک بار (در اولین استفاده) ساخته می‌شوند و
+    همه‌ی فراخوانی‌های بعدی از همان اشیاء استفاده می‌کنند.
+
+    Args:
+        debug: ساخت parser در حالت دیباگ PLY (نوشتن parser.out)
+        lexer_mode: حالت lexer - LEXER_RULES یا LEXER_KEYWORDS
+        engine: موتور پارس - ENGINE_PLY، ENGINE_LR یا ENGINE_LALR
+        cache_size: ظرفیت InstructionCache جلوی parse (0 = بدون cache)
+    """
 
-    return yacc.yacc(debug=debug, write_tables=False)
+    def __init__(self, debug=False, lexer_mode=LEXER_RULES, engine=ENGINE_PLY, cache_size=0):
+        if engine not in (ENGINE_PLY, ENGINE_LR, ENGINE_LALR):
+            raise ValueError(f"موتور پارس نامعتبر: {engine}")
+        self.debug = debug
+        self.lexer_mode = lexer_mode
+        self.engine = engine
+        self._lexer = None
+        self._parser = None
+        self._program_lexer = None
+        self._program_parser = None
+        self.diagnostics = []  # خطاهای آخرین پارس (Diagnostic)
+
+        # شمارنده‌ها (از ساخت این نمونه)
+        self.parse_count = 0
+        self.error_count = 0
+
+        self.cache = InstructionCache(cache_size) if cache_size else None
+
+    @property
+    def lexer(self):
+        """lexer مشترک (ساخت تنبل)"""
+        if self._lexer is None:
+            self._lexer = build_lexer(mode=self.lexer_mode)
+        return self._lexer
+
+    @property
+    def parser(self):
+        """parser مشترک (ساخت تنبل)"""
+        if self._parser is None:
+            if self.engine != ENGINE_PLY:
+                self._parser = self._lr_driver(program=False)
+            else:
+                self._parser = self._bind(build_parser(debug=self.debug), self.lexer, stop=True)
+        return self._parser
+
+    @property
+    def program_lexer(self):
+        """lexer کل فایل - پایان خطوط را به‌صورت NEWLINE برمی‌گرداند"""
+        if self._program_lexer is None:
+            self._program_lexer = build_lexer(emit_newlines=True, mode=self.lexer_mode)
+        return self._program_lexer
+
+    @property
+    def program_parser(self):
+        """parser کل فایل با نماد شروع program"""
+        if self._program_parser is None:
+            if self.engine != ENGINE_PLY:
+                self._program_parser = self._lr_driver(program=True)
+            else:
+                self._program_parser = self._bind(build_parser(debug=self.debug, start=START_PROGRAM),
+                                                  self.program_lexer)
+        return self._program_parser
+
+    def _lr_driver(self, program):
+        """درایور جدول‌محور با جدول دستی (ENGINE_LR) یا LALR تولیدشده (ENGINE_LALR)"""
+        from lr_driver import LRDriver, lalr_tables
+        return LRDriver(program=program, tables=lalr_tables() if self.engine == ENGINE_LALR else None)
+
+    @staticmethod
+    def _bind(parser, lexer, stop=False):
+        """ثبت خطاهای parser در lexer همان جفت (به‌جای p_error سراسری)"""
+        parser.errorfunc = functools.partial(_report_syntax_error, parser, lexer, stop)
+        return parser
+
+    def parse(self, code, debug=False):
+        """
+        پارس یک دستور با parser و lexer ساخته‌شده
+
+        Args:
+            code: رشته دستور assembly
+            debug: نمایش مراحل reduce
+
+        Returns:
+            AST node یا None در صورت خطا (خطاها در self.diagnostics)
+            با cache فعال، دستورات تکراری کپی گره ذخیره‌شده را برمی‌گردانند
+            (متن چندخطی از cache عبور نمی‌کند)
+        """
+        cache = self.cache
+        if cache is None or debug or '\n' in code.rstrip('\n'):
+            return self._parse(code, debug)
+
+        key = normalize_source(code)
+        ast = cache.get(key)
+        if ast is not None:
+            self.diagnostics = []
+            return ast.copy()
+
+        ast = self._parse(code, debug)
+        if ast is not None and not self.diagnostics:
+            cache.put(key, ast.copy())
+        return ast
+
+    def _parse(self, code, debug):
+        """پارس یک دستور بدون cache"""
+        lexer = self.lexer
+        lexer.lineno = 1
+        return self._run(self.parser, lexer, code, debug)
+
+    def enable_cache(self, maxsize=INSTRUCTION_CACHE_SIZE):
+        """
+        فعال‌سازی cache دستورات جلوی parse
+
+        Returns:
+            InstructionCache (شمارنده‌ها در stats())
+        """
+        self.cache = InstructionCache(maxsize)
+        return self.cache
+
+    def disable_cache(self):
+        """غیرفعال‌سازی cache دستورات"""
+        self.cache = None
+
+    def parse_program(self, text, debug=False, table=None, first_line=1):
+        """
+        پارس کل یک برنامه (چند خط) در یک فراخوانی parser
+
+        کامنت‌ها توسط t_COMMENT در lexer حذف می‌شوند و خطوط خالی نادیده
+        گرفته می‌شوند. هر Instruction شماره خط خود را در lineno دارد.
+        خطوط نامعتبر رد می‌شوند و خطاهایشان در self.diagnostics ثبت می‌شود.
+
+        Args:
+            text: متن کامل فایل assembly
+            debug: نمایش مراحل reduce
+            table: InstructionTable (اختیاری) - هر دستور معتبر هنگام پارس به آن اضافه می‌شود
+            first_line: شماره خط اولین خط text (برای پارس تکه‌ای فایل)
+
+        Returns:
+            لیست Instruction های معتبر
+        """
+        # هر دستور باید با NEWLINE تمام شود
+        if not text.endswith('\n'):
+            text += '\n'
+
+        # PLY خطای اولین توکن (وقتی پشته فقط state 0 را دارد) را بدون
+        # قانون error دور می‌ریزد؛ یک NEWLINE ابتدایی (خط 0) پشته را پر می‌کند
+        text = '\n' + text
+
+        lexer = self.program_lexer
+        lexer.lineno = first_line - 1
+        return self._run(self.program_parser, lexer, text, debug, table) or []
+
+    def _run(self, parser, lexer, text, debug, table=None):
+        """
+        اجرای parser با یک لیست خطای تازه
+
+        وضعیت پارس (debug، لیست خطا، جدول) روی lexer همین نمونه است و
+        قوانین گرامر آن را از p.lexer می‌خوانند؛ پس نمونه‌های جدا در
+        thread های مختلف بدون قفل همزمان پارس می‌کنند.
+        """
+        self.diagnostics = []
+        lexer.debug = debug
+        lexer.diagnostics = self.diagnostics
+        lexer.table = table
+        try:
+            return parser.parse(text, lexer=lexer)
+        finally:
+            lexer.table = None
+            self.parse_count += 1
+            self.error_count += len(self.diagnostics)
+
+
+# parser هر thread (هر thread نمونه‌ی جدای خود را یک بار می‌سازد)
+_local = threading.local()
+
+
+def get_parser():
+    """
+    parser مشترک thread جاری
+
+    CacheInstructionParser و اشیاء PLY آن برای استفاده‌ی همزمان امن نیستند؛
+    هر thread نمونه‌ی خود را دارد و پارس همزمان نیازی به قفل ندارد.
+
+    Returns:
+        CacheInstructionParser
+    """
+    parser = getattr(_local, 'parser', None)
+    if parser is None:
+        parser = _local.parser = CacheInstructionParser()
+    return parser
 
 
 # ═══════════════════════════════════════════════════════════════════
 #                          Parse Functions
 # ═══════════════════════════════════════════════════════════════════
 
-def parse_instruction(code, debug=False):
+def parse_instruction(code, debug=False, report=True):
     """
     پارس یک دستور
 
     Args:
         code: رشته دستور assembly
         debug: نمایش مراحل پارسینگ
+        report: نمایش خطاهای نحوی (در غیر این صورت فقط در get_parser().diagnostics)
 
     Returns:
         AST node یا None در صورت خطا
     """
-    lexer = build_lexer()
-    parser = build_parser(debug=debug)
-
+    parser = get_parser()
     try:
-        result = parser.parse(code, lexer=lexer)
-        return result
+        ast = parser.parse(code, debug=debug)
     except Exception as e:
         print(f"❌ خطا در پارسینگ: {e}")
         return None
 
+    if report and parser.diagnostics:
+        render_diagnostics(parser.diagnostics)
+    return ast
+
+
+def _source_line(line):
+    """متن دستور یک خط (بدون فاصله‌ها و کامنت انتهای خط)"""
+    return line.split(';')[0].strip()
+
+
+def source_lines(text):
+    """
+    خطوط متن با همان شمارش خط lexer (فقط '\n' پایان خط است)
+
+    str.splitlines خط را روی '\r'، '\x0b'، '\x0c'، '\x1c'-'\x1e'، '\x85' و
+    '\u2028' هم می‌شکند و شماره‌ی خطوط با شماره‌ی خط توکن‌ها ناهماهنگ می‌شود.
+    '\r' انتهای خط با _source_line حذف می‌شود.
+    """
+    return text.split('\n')
+
 
-def parse_file(filename, debug=False):
+def parse_file(filename, debug=False, table=None, jobs=1, cache=False):
     """
     پارس یک فایل assembly
 
+    کل فایل با یک فراخوانی parser (گرامر program) پارس می‌شود. خطوط نامعتبر
+    با بازیابی از خطا رد می‌شوند و پارس بقیه‌ی فایل در همان فراخوانی ادامه دارد.
+    با jobs > 1 فایل به بازه‌های هم‌تراز با پایان خط تقسیم و در چند پروسه پارس
+    می‌شود (parse_file_parallel). با cache=True نتیجه با کلید hash محتوا روی
+    دیسک ذخیره می‌شود و فایل بدون تغییر دوباره پارس نمی‌شود (result_cache).
+
     Args:
         filename: نام فایل
         debug: نمایش مراحل
+        table: InstructionTable (اختیاری) که parser دستورات معتبر را مستقیما در آن می‌نویسد
+        jobs: تعداد پروسه‌ها (1 = همین پروسه، 0 = تعداد هسته‌ها)
+        cache: استفاده از cache نتایج روی دیسک
 
     Returns:
-        لیست AST nodes
+        (results, diagnostics) - results لیست (شماره خط، متن، AST) و
+        diagnostics لیست Diagnostic ها (متن خط در source)
     """
-    lexer = build_lexer()
-    parser = build_parser(debug=debug)
+    if cache:
+        from result_cache import parse_file_cached
+        return parse_file_cached(filename, debug=debug, table=table, jobs=jobs)
 
-    results = []
-    errors = []
+    if jobs != 1:
+        return parse_file_parallel(filename, jobs, debug=debug, table=table)
+
+    parser = get_parser()
 
     try:
         with open(filename, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
+            text = f.read()
+    except FileNotFoundError:
+        print(f"❌ فایل '{filename}' پیدا نشد")
+        return None
+
+    lines = source_lines(text)
+
+    program = parser.parse_program(text, debug=debug, table=table)
+
+    results = [(ast.lineno, _source_line(lines[ast.lineno - 1]), ast) for ast in program]
+    diagnostics = parser.diagnostics
+    for diagnostic in diagnostics:
+        if 0 < diagnostic.line <= len(lines):
+            diagnostic.source = _source_line(lines[diagnostic.line - 1])
+
+    return results, diagnostics
+
+
+# ───────────────────────────────────────────────────────────────
+# پارس موازی (چند پروسه)
+# ───────────────────────────────────────────────────────────────
+
+# تعداد بازه‌ها به ازای هر پروسه (برای تقسیم بار بهتر)
+RANGES_PER_JOB = 4
+
+# حداکثر اندازه‌ی تقریبی هر بازه (بایت) - فایل‌های بزرگ بازه‌های بیشتری دارند
+RANGE_BYTES = 1 << 20
+
+# تعداد بازه‌های در جریان (ارسال‌شده و هنوز مصرف‌نشده) به ازای هر پروسه
+PENDING_RANGES_PER_JOB = 2
+
+
+def line_ranges(filename, parts):
+    """
+    تقسیم فایل به حداکثر parts بازه‌ی بایتی که هر کدام روی مرز خط شروع می‌شوند
+
+    Returns:
+        لیست (start، end) - بازه‌ها پشت‌سرهم و کل فایل را می‌پوشانند
+    """
+    size = os.path.getsize(filename)
+    bounds = [0]
+
+    with open(filename, 'rb') as f:
+        for i in range(1, parts):
+            if bounds[-1] >= size:
+                break
+            f.seek(max(size * i // parts, bounds[-1]))
+            f.readline()  # رفتن به ابتدای خط بعد
+            position = f.tell()
+            if position > bounds[-1]:
+                bounds.append(position)
+
+    if bounds[-1] < size:
+        bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+
+def _init_worker():
+    """ساخت parser کل فایل یک بار در هر پروسه‌ی کارگر"""
+    parser = get_parser()
+    parser.program_lexer
+    parser.program_parser
+
+
+def _parse_range(task):
+    """
+    پارس یک بازه‌ی بایتی فایل در پروسه‌ی کارگر
+
+    شماره خطوط نسبت به ابتدای بازه هستند (از 1) و در parse_file_parallel
+    به شماره خط سراسری تبدیل می‌شوند.
+
+    Returns:
+        (results، diagnostics، تعداد خطوط بازه)
+    """
+    filename, start, end, debug = task
+    with open(filename, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
 
-        for line_num, line in enumerate(lines, 1):
-            line = line.strip()
+    # همان تبدیل پایان خط حالت متنی open
+    text = data.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+    lines = source_lines(text)
 
-            # رد کردن خطوط خالی و کامنت‌ها
-            if not line or line.startswith(';'):
-                continue
+    parser = get_parser()
+    program = parser.parse_program(text, debug=debug)
 
-            # حذف کامنت انتهای خط
-            if ';' in line:
-                line = line.split(';')[0].strip()
+    results = [(ast.lineno, _source_line(lines[ast.lineno - 1]), ast) for ast in program]
+    diagnostics = parser.diagnostics
+    for diagnostic in diagnostics:
+        if 0 < diagnostic.line <= len(lines):
+            diagnostic.source = _source_line(lines[diagnostic.line - 1])
 
-            try:
-                ast = parser.parse(line, lexer=lexer)
-                if ast:
-                    results.append((line_num, line, ast))
-            except Exception as e:
-                errors.append((line_num, line, str(e)))
+    return results, diagnostics, text.count('\n')
 
+
+def _iter_ranges(filename, jobs, debug, executor=None):
+    """
+    پارس بازه‌های فایل در پروسه‌های کارگر و برگرداندن نتیجه‌ی هر بازه به ترتیب
+
+    بازه‌ها حداکثر حدود RANGE_BYTES بایت هستند و فقط jobs * PENDING_RANGES_PER_JOB
+    بازه همزمان ارسال می‌شوند؛ بازه‌ی بعدی وقتی ارسال می‌شود که نتیجه‌ی قبلی
+    مصرف شود. پس حافظه‌ی نتیجه‌ها مستقل از اندازه‌ی فایل محدود است. شماره
+    خطوط سراسری می‌شوند.
+
+    Args:
+        executor: ProcessPoolExecutor موجود (اختیاری) - بدون آن یک pool ساخته می‌شود
+
+    Yields:
+        (results، diagnostics) هر بازه
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    if executor is None:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker) as executor:
+            yield from _iter_ranges(filename, jobs, debug, executor)
+        return
+
+    parts = max(jobs * RANGES_PER_JOB, -(-os.path.getsize(filename) // RANGE_BYTES))
+    tasks = ((filename, start, end, debug) for start, end in line_ranges(filename, parts))
+    pending = collections.deque(executor.submit(_parse_range, task)
+                                for task in itertools.islice(tasks, jobs * PENDING_RANGES_PER_JOB))
+    line_offset = 0
+
+    while pending:
+        part_results, part_diagnostics, line_count = pending.popleft().result()
+        for task in itertools.islice(tasks, 1):
+            pending.append(executor.submit(_parse_range, task))
+
+        results = []
+        for line_num, source, ast in part_results:
+            ast.lineno = line_num + line_offset
+            results.append((ast.lineno, source, ast))
+        for diagnostic in part_diagnostics:
+            diagnostic.line += line_offset
+        line_offset += line_count
+        yield results, part_diagnostics
+
+
+def parse_file_parallel(filename, jobs=0, debug=False, table=None):
+    """
+    پارس موازی یک فایل assembly بزرگ با ProcessPoolExecutor
+
+    فایل به بازه‌های بایتی هم‌تراز با پایان خط تقسیم می‌شود؛ هر پروسه parser
+    را یک بار می‌سازد و بازه‌ها را مستقل پارس می‌کند. نتایج به ترتیب بازه‌ها
+    ادغام و شماره خطوط به شماره خط سراسری تبدیل می‌شوند.
+
+    Args:
+        filename: نام فایل
+        jobs: تعداد پروسه‌ها (0 = تعداد هسته‌ها)
+        debug: نمایش مراحل
+        table: InstructionTable (اختیاری) - دستورات معتبر به ترتیب خط اضافه می‌شوند
+
+    Returns:
+        مثل parse_file: (results, diagnostics) یا None اگر فایل پیدا نشود
+    """
+    if not os.path.exists(filename):
+        print(f"❌ فایل '{filename}' پیدا نشد")
+        return None
+
+    results = []
+    diagnostics = []
+    for part_results, part_diagnostics in _iter_ranges(filename, jobs or os.cpu_count() or 1, debug):
+        results.extend(part_results)
+        diagnostics.extend(part_diagnostics)
+        if table is not None:
+            for _, _, ast in part_results:
+                table.append(ast)
+
+    return results, diagnostics
+
+
+def iter_parse_file_parallel(filename, jobs=0, debug=False, executor=None):
+    """
+    پارس موازی و جریانی یک فایل بزرگ
+
+    مثل parse_file_parallel، ولی نتیجه‌ی هر بازه به ترتیب بازه‌ها برگردانده
+    می‌شود؛ فقط نتیجه‌ی حداکثر jobs * PENDING_RANGES_PER_JOB بازه‌ی حدود
+    RANGE_BYTES بایتی در حافظه است (_iter_ranges).
+
+    Args:
+        filename: نام فایل
+        jobs: تعداد پروسه‌ها (0 = تعداد هسته‌ها)
+        debug: نمایش مراحل
+        executor: ProcessPoolExecutor موجود (اختیاری) برای اجرای بازه‌ها
+
+    Yields:
+        مثل iter_parse_file: (شماره خط، Instruction یا Diagnostic) به ترتیب شماره خط
+    """
+    for results, diagnostics in _iter_ranges(filename, jobs or os.cpu_count() or 1, debug, executor):
+        yield from heapq.merge(((line_num, ast) for line_num, _, ast in results),
+                               ((diagnostic.line, diagnostic) for diagnostic in diagnostics),
+                               key=lambda item: item[0])
+
+
+# تعداد خطوط هر تکه در پارس جریانی
+CHUNK_LINES = 4096
+
+
+def _open_source(source):
+    """
+    باز کردن ورودی iter_parse_file
+
+    Returns:
+        (فایل متنی، آیا باید بسته شود)
+    """
+    if source == '-':
+        return sys.stdin, False
+    if hasattr(source, 'read'):
+        if isinstance(source.read(0), bytes):
+            # TextIOWrapper فایل را هنگام حذف شدن می‌بندد؛ detach در iter_parse_file
+            return io.TextIOWrapper(source, encoding='utf-8'), None
+        return source, False
+    return open(source, 'r', encoding='utf-8'), True
+
+
+def iter_parse_file(source, debug=False, table=None, chunk_lines=CHUNK_LINES):
+    """
+    پارس جریانی یک فایل assembly با حافظه‌ی محدود
+
+    فایل به‌صورت تکه‌های chunk_lines خطی خوانده می‌شود و هر تکه با یک
+    فراخوانی parser (گرامر program) پارس می‌شود؛ فقط یک تکه در حافظه است.
+
+    Args:
+        source: مسیر فایل، '-' برای stdin یا یک شیء فایل باز (متنی یا باینری)
+        debug: نمایش مراحل
+        table: InstructionTable (اختیاری) که دستورات معتبر در آن نوشته می‌شوند
+        chunk_lines: تعداد خطوط هر تکه
+
+    Yields:
+        (شماره خط، Instruction یا Diagnostic) به ترتیب شماره خط
+    """
+    parser = get_parser()
+    f, close = _open_source(source)
+    first_line = 1
+
+    try:
+        while True:
+            lines = list(itertools.islice(f, chunk_lines))
+            if not lines:
+                break
+
+            program = parser.parse_program(''.join(lines), debug=debug, table=table, first_line=first_line)
+            diagnostics = parser.diagnostics
+            for diagnostic in diagnostics:
+                index = diagnostic.line - first_line
+                if 0 <= index < len(lines):
+                    diagnostic.source = _source_line(lines[index])
+
+            # ادغام دستورات و خطاها به ترتیب خط (هر دو لیست مرتب هستند)
+            yield from heapq.merge(((ast.lineno, ast) for ast in program),
+                                   ((diagnostic.line, diagnostic) for diagnostic in diagnostics),
+                                   key=lambda item: item[0])
+            first_line += len(lines)
+    finally:
+        if close:
+            f.close()
+        elif close is None:
+            f.detach()
+
+
+def parse_mapped_file(filename, table=None):
+    """
+    پارس یک فایل assembly بزرگ با mmap (بدون کپی متن خطوط)
+
+    فایل به حافظه نگاشت می‌شود و lexer بایتی (cache_lexer.iter_spans) مستقیما
+    روی آن کار می‌کند؛ درایور lr_driver فقط مقدار توکن‌های لازم برای AST را
+    از بافر می‌خواند. برخلاف parse_file متن هر خط ساخته نمی‌شود و فقط خطاها
+    متن خط (source) دارند.
+
+    تفاوت با lexer پیش‌فرض: مثل حالت LEXER_KEYWORDS کل کلمه یک توکن است.
+
+    Args:
+        filename: نام فایل
+        table: InstructionTable (اختیاری) که دستورات معتبر در آن نوشته می‌شوند
+
+    Returns:
+        (program, diagnostics) - لیست Instruction ها و لیست Diagnostic ها
+        یا None اگر فایل پیدا نشود
+    """
+    from lr_driver import LRDriver
+
+    try:
+        f = open(filename, 'rb')
     except FileNotFoundError:
         print(f"❌ فایل '{filename}' پیدا نشد")
         return None
 
-    return results, errors
+    diagnostics = []
+    with f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return [], diagnostics  # mmap فایل خالی ممکن نیست
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            program = LRDriver(program=True).parse_buffer(buffer, diagnostics, table)
+
+    return program, diagnostics
 
 
 # ═══════════════════════════════════════════════════════════════════
@@ -580,19 +1387,12 @@ def parse_file(filename, debug=False):
 def analyze_instruction(ast):
     """تحلیل دقیق یک دستور"""
 
-    category = ast.get_instruction_category()
-
-    category_desc = {
-        'flush': 'Cache Flush - پاک‌سازی خط کش',
-        'writeback': 'Cache Write-Back - نوشتن به حافظه اصلی',
-        'prefetch': 'Cache Prefetch - پیش‌خوانی داده',
-        'invalidate': 'Cache Invalidate - باطل‌سازی کش'
-    }
+    info = ast.info
 
     analysis = {
         'mnemonic': ast.mnemonic,
-        'category': category,
-        'description': category_desc.get(category, 'نامشخص'),
+        'category': info.category,
+        'description': info.description,
         'has_operand': ast.operand is not None,
     }
 
@@ -626,7 +1426,7 @@ def print_analysis(analysis):
         if 'register_width' in op:
             print(f"  عرض رجیستر: {op['register_width']}-bit")
         if op['has_offset']:
-            print(f"  Offset: {op['offset_value']}")
+            print(f"  Offset: {op['offset_value']:+d}")
 
     print("═" * 70)
 
@@ -690,6 +1490,7 @@ if __name__ == "__main__":
 
             # JSON
             print("\n📄 JSON Output:")
+            import json
             print(json.dumps(ast.to_dict(), indent=2, ensure_ascii=False))
 
             success_count += 1
@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+رابط خط فرمان غیرتعاملی (batch) برای pipeline ها
+cacheparse - Batch Command-Line Interface
+تیم 15 - پروژه کامپایلر - دانشگاه شهید باهنر کرمان
+
+اجرا:
+    python cacheparse.py parse  examples/*.asm        # دستورات و خطاها (JSON Lines)
+    python cacheparse.py check  'src/**/*.asm' -j 8   # فقط خطاها و خلاصه‌ی هر فایل
+    python cacheparse.py stats  examples/*.asm        # شمارش دسته‌ها، mnemonic ها و رجیسترها
+    python cacheparse.py trace  "CLFLUSH [EAX+8]"     # مراحل shift-reduce
+    python cacheparse.py coverage examples/*.asm -o steps.csv --format csv
+                                                      # trace همه‌ی خطوط و پوشش گرامر
+    python cacheparse.py tables                       # جدول ACTION/GOTO
+
+هر سطر خروجی یک شیء JSON است. کدهای خروج:
+    0  همه‌ی ورودی‌ها معتبر هستند
+    1  حداقل یک خطای نحوی
+    2  خطای استفاده (فایل پیدا نشد، الگوی بدون فایل و ...)
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+
+
+EXIT_OK = 0
+EXIT_SYNTAX_ERROR = 1
+EXIT_USAGE = 2
+
+# فایل‌های بزرگ‌تر از این اندازه (بایت) با --jobs بازه به بازه در چند پروسه پارس می‌شوند
+PARALLEL_FILE_SIZE = 1 << 20
+
+
+# ═══════════════════════════════════════════════════════════════════
+#                          ورودی‌ها
+# ═══════════════════════════════════════════════════════════════════
+
+def expand_inputs(patterns):
+    """
+    تبدیل مسیرها و الگوهای glob به لیست فایل‌ها (بدون تکرار، به ترتیب)
+
+    Returns:
+        (files، missing) - missing الگوهایی که هیچ فایلی نداشتند
+    """
+    files = []
+    missing = []
+    for pattern in patterns:
+        if pattern == '-' or os.path.isfile(pattern):
+            matches = [pattern]
+        else:
+            matches = sorted(path for path in glob.glob(pattern, recursive=True) if os.path.isfile(path))
+        if not matches:
+            missing.append(pattern)
+        files.extend(matches)
+    return list(dict.fromkeys(files)), missing
+
+
+# ═══════════════════════════════════════════════════════════════════
+#                          دستورات (هر کدام رکوردهای یک فایل)
+# ═══════════════════════════════════════════════════════════════════
+
+def _is_large(path):
+    """فایلی که با --jobs به بازه‌ها تقسیم می‌شود (stdin هیچ‌وقت)"""
+    return path != '-' and os.path.getsize(path) > PARALLEL_FILE_SIZE
+
+
+def _parse_items(path, cache, jobs=1, executor=None):
+    """
+    (شماره خط، Instruction یا Diagnostic) های یک فایل به ترتیب خط
+
+    با jobs != 1 فایل بزرگ بازه به بازه در پروسه‌های کارگر (executor اگر داده
+    شود) پارس و نتیجه‌ی هر بازه جریانی برگردانده می‌شود.
+    """
+    from cache_parser import iter_parse_file, iter_parse_file_parallel, parse_file
+
+    parallel = jobs != 1 and _is_large(path)
+    if not cache or path == '-':
+        if parallel:
+            return iter_parse_file_parallel(path, jobs, executor=executor)
+        return iter_parse_file(path)
+
+    import heapq
+    results, diagnostics = parse_file(path, cache=True, jobs=jobs if parallel else 1)
+    return heapq.merge(((line_num, ast) for line_num, _, ast in results),
+                       ((diagnostic.line, diagnostic) for diagnostic in diagnostics),
+                       key=lambda item: item[0])
+
+
+def _error_record(path, diagnostic):
+    record = diagnostic.to_dict()
+    record['type'] = 'error'
+    record['file'] = path
+    return record
+
+
+def parse_records(path, cache=False, jobs=1, executor=None):
+    """رکورد هر دستور معتبر و هر خطا"""
+    for line_num, item in _parse_items(path, cache, jobs, executor):
+        if item.type == 'Instruction':
+            yield {'type': 'instruction', 'file': path, 'line': line_num,
+                   'asm': item.to_asm(), 'category': item.category, 'ast': item.to_dict()}
+        else:
+            yield _error_record(path, item)
+
+
+def check_records(path, cache=False, jobs=1, executor=None):
+    """رکورد هر خطا و یک خلاصه برای فایل"""
+    instructions = 0
+    errors = 0
+    for _, item in _parse_items(path, cache, jobs, executor):
+        if item.type == 'Instruction':
+            instructions += 1
+        else:
+            errors += 1
+            yield _error_record(path, item)
+    yield {'type': 'summary', 'file': path, 'instructions': instructions, 'errors': errors, 'ok': errors == 0}
+
+
+def stats_records(path, cache=False, jobs=1, executor=None):
+    """یک رکورد آمار برای فایل (InstructionTable)"""
+    from instruction_table import InstructionTable
+
+    table = InstructionTable()
+    errors = 0
+    for _, item in _parse_items(path, cache, jobs, executor):
+        if item.type == 'Instruction':
+            table.append(item)
+        else:
+            errors += 1
+    yield {
+        'type': 'stats', 'file': path, 'instructions': len(table), 'errors': errors,
+        'categories': table.category_counts(),
+        'mnemonics': {name: count for name, count in table.mnemonic_counts().items() if count},
+        'registers': table.register_histogram(),
+    }
+
+
+FILE_COMMANDS = {
+    'parse': parse_records,
+    'check': check_records,
+    'stats': stats_records,
+}
+
+
+def _file_lines(task):
+    """
+    اجرای یک دستور روی یک فایل کوچک در پروسه‌ی کارگر - سطرهای JSON و تعداد خطا
+
+    فقط فایل‌های حداکثر PARALLEL_FILE_SIZE بایتی اینجا می‌آیند، پس حافظه‌ی
+    سطرهای جمع‌شده محدود است.
+    """
+    command, path, cache = task
+    lines = []
+    errors = 0
+    for record in FILE_COMMANDS[command](path, cache):
+        if record['type'] == 'error':
+            errors += 1
+        lines.append(json.dumps(record, ensure_ascii=False))
+    return lines, errors
+
+
+def trace_records(instruction):
+    """
+    مراحل shift-reduce یک دستور، خطاهای lexer و خلاصه
+
+    ok مثل check است: پذیرش جدول (با نگهبان operand) و بدون خطای lexer.
+    """
+    from shift_reduce_trace import ShiftReduceTracer, Trace
+
+    diagnostics = []
+    steps = ShiftReduceTracer(diagnostics).trace(instruction)
+    accepted = isinstance(steps, Trace) and steps.accepted
+    for step in steps:
+        yield dict(step, type='step', instruction=instruction)
+    for diagnostic in diagnostics:
+        diagnostic.source = instruction
+        record = diagnostic.to_dict()
+        record['type'] = 'error'
+        record['instruction'] = instruction
+        yield record
+    yield {'type': 'summary', 'instruction': instruction, 'steps': len(steps),
+           'errors': len(diagnostics), 'ok': accepted and not diagnostics}
+
+
+def coverage_records(patterns, output=None, format='jsonl'):
+    """
+    trace همه‌ی خطوط فایل‌ها (نوشتن مراحل در output) و رکورد پوشش گرامر
+
+    Returns:
+        (رکوردها، missing)
+    """
+    from bulk_trace import trace_files, open_trace_output
+
+    files, missing = expand_inputs(patterns)
+    if output is None:
+        coverage, diagnostics, not_found = trace_files(files)
+    else:
+        with open_trace_output(output, format) as out:
+            coverage, diagnostics, not_found = trace_files(files, out, format)
+
+    records = [_error_record(path, error) for path, error in diagnostics]
+    records.append(dict({'type': 'coverage', 'files': len(files)}, **coverage.summary()))
+    return records, missing + not_found
+
+
+def table_records():
+    """سطرهای جدول LR (ACTION و GOTO هر state)"""
+    from lr_tables import LR_PARSING_TABLE
+
+    for state, row in sorted(LR_PARSING_TABLE.items()):
+        yield {
+            'type': 'state', 'state': state,
+            'action': {symbol: entry for symbol, entry in row.items() if not isinstance(entry, int)},
+            'goto': {symbol: entry for symbol, entry in row.items() if isinstance(entry, int)},
+        }
+
+
+# ═══════════════════════════════════════════════════════════════════
+#                          اجرا
+# ═══════════════════════════════════════════════════════════════════
+
+def build_argument_parser():
+    """تعریف subcommand ها و گزینه‌ها"""
+    parser = argparse.ArgumentParser(prog='cacheparse', description="Cache Control Instructions Parser - batch CLI")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    for name, help_text in (('parse', "پارس فایل‌ها: دستورات و خطاها"),
+                            ('check', "بررسی فایل‌ها: خطاها و خلاصه‌ی هر فایل"),
+                            ('stats', "آمار هر فایل")):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument('files', nargs='+', help="مسیر فایل، الگوی glob یا '-' برای stdin")
+        command.add_argument('-j', '--jobs', type=int, default=1, help="تعداد پروسه‌ها (0 = تعداد هسته‌ها)")
+        command.add_argument('--cache', action='store_true', help="استفاده از cache نتایج روی دیسک")
+
+    trace = commands.add_parser('trace', help="مراحل shift-reduce دستورات")
+    trace.add_argument('instructions', nargs='+', help="متن دستورات")
+
+    coverage = commands.add_parser('coverage', help="trace همه‌ی خطوط فایل‌ها و پوشش قوانین و state ها")
+    coverage.add_argument('files', nargs='+', help="مسیر فایل یا الگوی glob")
+    coverage.add_argument('-o', '--output', help="فایل خروجی مراحل (بدون آن فقط خلاصه‌ی پوشش)")
+    coverage.add_argument('--format', choices=('csv', 'jsonl', 'bin'), default='jsonl', help="قالب فایل مراحل")
+
+    commands.add_parser('tables', help="جدول ACTION/GOTO")
+    return parser
+
+
+def _write(out, record):
+    out.write(json.dumps(record, ensure_ascii=False))
+    out.write('\n')
+
+
+def _write_records(out, records):
+    """نوشتن رکوردها - تعداد رکوردهای خطا"""
+    errors = 0
+    for record in records:
+        if record['type'] == 'error':
+            errors += 1
+        _write(out, record)
+    return errors
+
+
+def run_files(command, patterns, jobs=1, cache=False, out=None):
+    """
+    اجرای parse/check/stats روی فایل‌ها و نوشتن JSON Lines
+
+    Returns:
+        کد خروج
+    """
+    out = out or sys.stdout
+    files, missing = expand_inputs(patterns)
+    for pattern in missing:
+        print(f"cacheparse: فایلی برای '{pattern}' پیدا نشد", file=sys.stderr)
+
+    errors = 0
+    if jobs == 1:
+        for path in files:
+            errors += _write_records(out, FILE_COMMANDS[command](path, cache))
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        from cache_parser import _init_worker
+
+        jobs = jobs or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker) as executor:
+            # فایل‌های کوچک کامل به کارگرها می‌روند؛ stdin (فقط در همین پروسه
+            # خواندنی است) و فایل‌های بزرگ (بازه به بازه روی همین pool) در
+            # همین پروسه و به ترتیب ورودی‌ها نوشته می‌شوند
+            pending = {path: executor.submit(_file_lines, (command, path, cache))
+                       for path in files if path != '-' and not _is_large(path)}
+            for path in files:
+                if path in pending:
+                    lines, file_errors = pending.pop(path).result()
+                    errors += file_errors
+                    for line in lines:
+                        out.write(line)
+                        out.write('\n')
+                else:
+                    errors += _write_records(out, FILE_COMMANDS[command](path, cache, jobs, executor))
+
+    if missing:
+        return EXIT_USAGE
+    return EXIT_SYNTAX_ERROR if errors else EXIT_OK
+
+
+def main(argv=None):
+    args = build_argument_parser().parse_args(argv)
+    out = sys.stdout
+
+    try:
+        if args.command in FILE_COMMANDS:
+            return run_files(args.command, args.files, args.jobs, args.cache, out)
+
+        if args.command == 'trace':
+            failed = False
+            for instruction in args.instructions:
+                for record in trace_records(instruction):
+                    if record['type'] == 'summary' and not record['ok']:
+                        failed = True
+                    _write(out, record)
+            return EXIT_SYNTAX_ERROR if failed else EXIT_OK
+
+        if args.command == 'coverage':
+            records, missing = coverage_records(args.files, args.output, args.format)
+            for pattern in missing:
+                print(f"cacheparse: فایلی برای '{pattern}' پیدا نشد", file=sys.stderr)
+            for record in records:
+                _write(out, record)
+            return EXIT_USAGE if missing else EXIT_OK
+
+        for record in table_records():
+            _write(out, record)
+        return EXIT_OK
+    except BrokenPipeError:
+        # خروجی بسته شد (مثلا | head)
+        sys.stderr.close()
+        return EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+گزارش خطاهای Lexer و Parser
+Structured Diagnostics
+تیم 15 - پروژه کامپایلر - دانشگاه شهید باهنر کرمان
+
+خطاها هنگام پارس فقط به‌صورت رکورد Diagnostic ثبت می‌شوند و متن قابل
+نمایش (کادر SYNTAX ERROR و پیشنهاد اصلاح) تنها هنگام نمایش ساخته می‌شود.
+"""
+
+import sys
+
+from instruction_set import OPERAND_MNEMONICS
+
+
+# ═══════════════════════════════════════════════════════════════════
+#                          کدهای پیشنهاد اصلاح
+# ═══════════════════════════════════════════════════════════════════
+
+REGISTER_NEEDS_BRACKETS = 'REGISTER_NEEDS_BRACKETS'
+NUMBER_NEEDS_SIGN = 'NUMBER_NEEDS_SIGN'
+MISSING_OPERAND = 'MISSING_OPERAND'
+OPERAND_REQUIRED = 'OPERAND_REQUIRED'
+UNCLOSED_BRACKET = 'UNCLOSED_BRACKET'
+ILLEGAL_CHARACTER = 'ILLEGAL_CHARACTER'
+
+SUGGESTIONS = {
+    REGISTER_NEEDS_BRACKETS: "رجیستر باید داخل کروشه باشد: [REGISTER]",
+    NUMBER_NEEDS_SIGN: "قبل از عدد باید + یا - باشد",
+    MISSING_OPERAND: "این دستور نیاز به operand دارد → MNEMONIC [REGISTER]",
+    OPERAND_REQUIRED: "{value} نیاز به operand دارد → {value} [REGISTER]",
+    UNCLOSED_BRACKET: "کروشه بسته نشده است: [REGISTER]",
+    ILLEGAL_CHARACTER: "کاراکتر '{value}' در گرامر تعریف نشده است",
+}
+
+# توکن‌های پایان (پایان ورودی یا پایان خط در پارس کل فایل)
+END_TOKENS = ('$end', 'NEWLINE')
+
+
+def column_of(lexdata, lexpos):
+    """شماره ستون (از 1) یک موقعیت در متن ورودی"""
+    return lexpos - lexdata.rfind('\n', 0, lexpos)
+
+
+def suggest(token_type, value, expected):
+    """
+    انتخاب کد پیشنهاد اصلاح برای یک خطای نحوی
+
+    Returns:
+        یکی از کدهای SUGGESTIONS یا None
+    """
+    if token_type == 'REGISTER':
+        return REGISTER_NEEDS_BRACKETS
+    if token_type == 'NUMBER':
+        return NUMBER_NEEDS_SIGN
+    if token_type in END_TOKENS:
+        if 'RBRACKET' in expected:
+            return UNCLOSED_BRACKET
+        if 'LBRACKET' in expected:
+            return MISSING_OPERAND
+    if token_type in OPERAND_MNEMONICS:
+        return OPERAND_REQUIRED
+    return None
+
+
+# ═══════════════════════════════════════════════════════════════════
+#                          Diagnostic
+# ═══════════════════════════════════════════════════════════════════
+
+class Diagnostic:
+    """
+    رکورد یک خطای lexer یا parser
+
+    Args:
+        line: شماره خط
+        column: شماره ستون (از 1)
+        token_type: نوع توکن خطا ('$end' برای پایان ورودی، 'ILLEGAL' برای خطای lexer)
+        value: مقدار توکن
+        expected: توکن‌های مورد انتظار در آن نقطه
+        suggestion: کد پیشنهاد اصلاح (کلید SUGGESTIONS) یا None
+    """
+
+    type = 'Diagnostic'
+
+    def __init__(self, line, column, token_type, value, expected=(), suggestion=None):
+        self.line = line
+        self.column = column
+        self.token_type = token_type
+        self.value = value
+        self.expected = expected
+        self.suggestion = suggestion
+        self.source = None  # متن خط (در صورت نیاز توسط parse_file پر می‌شود)
+
+    @classmethod
+    def syntax_error(cls, token, lexer, expected):
+        """ساخت Diagnostic از توکن خطا (None برای پایان ورودی)"""
+        if token is None:
+            return cls(lexer.lineno, column_of(lexer.lexdata, lexer.lexpos), '$end', None,
+                       expected, suggest('$end', None, expected))
+        return cls(token.lineno, column_of(lexer.lexdata, token.lexpos), token.type, token.value,
+                   expected, suggest(token.type, token.value, expected))
+
+    @classmethod
+    def illegal_character(cls, token):
+        """ساخت Diagnostic برای کاراکتر غیرمجاز در lexer"""
+        char = token.value[0]
+        return cls(token.lineno, column_of(token.lexer.lexdata, token.lexpos), 'ILLEGAL', char,
+                   (), ILLEGAL_CHARACTER)
+
+    def __repr__(self):
+        return f"Diagnostic({self.line}:{self.column}, {self.token_type}, {self.suggestion})"
+
+    def __str__(self):
+        return f"خط {self.line}، ستون {self.column}: {self.message}"
+
+    def to_dict(self):
+        """تبدیل به دیکشنری برای JSON"""
+        return {
+            'type': 'Diagnostic',
+            'line': self.line,
+            'column': self.column,
+            'token_type': self.token_type,
+            'value': self.value,
+            'expected': list(self.expected),
+            'suggestion': self.suggestion,
+            'message': self.message,
+            'hint': self.hint,
+            'source': self.source,
+        }
+
+    @property
+    def is_end(self):
+        """آیا خطا در پایان خط/ورودی رخ داده است"""
+        return self.token_type in END_TOKENS
+
+    @property
+    def message(self):
+        """پیام کوتاه یک‌خطی"""
+        if self.token_type == 'ILLEGAL':
+            return f"کاراکتر غیرمجاز '{self.value}'"
+        if self.is_end:
+            return "خطای نحوی در انتهای ورودی"
+        return f"خطای نحوی در توکن '{self.value}' ({self.token_type})"
+
+    @property
+    def hint(self):
+        """متن پیشنهاد اصلاح یا None"""
+        if self.suggestion is None:
+            return None
+        return SUGGESTIONS[self.suggestion].format(value=self.value)
+
+    def render(self):
+        """متن کامل قابل نمایش (کادر SYNTAX ERROR)"""
+        if self.token_type == 'ILLEGAL':
+            return f"کاراکتر غیرمجاز '{self.value}' در خط {self.line}"
+
+        lines = [
+            "",
+            "╔════════════════════════════════════════════════════════════════╗",
+            "║                      SYNTAX ERROR                              ║",
+            "╚════════════════════════════════════════════════════════════════╝",
+            "",
+        ]
+
+        if self.is_end:
+            lines.append("  خطای نحوی در انتهای ورودی")
+        else:
+            lines.append(f"  خطای نحوی در توکن: '{self.value}'")
+            lines.append(f"  نوع توکن: {self.token_type}")
+        lines.append(f"  موقعیت: خط {self.line}، ستون {self.column}")
+
+        if self.expected:
+            lines.append(f"  توکن‌های مورد انتظار: {', '.join(self.expected)}")
+
+        if self.is_end:
+            lines.extend([
+                "",
+                "  💡 احتمالا:",
+                "     - دستور ناقص است",
+                "     - کروشه بسته نشده",
+            ])
+        else:
+            lines.extend([
+                "",
+                "  💡 احتمالا مشکل در:",
+                "     - فرمت دستور اشتباه است",
+                "     - کروشه باز یا بسته فراموش شده",
+                "     - عملوند نامعتبر",
+                "     - دستورات CLFLUSH، CLFLUSHOPT، CLWB و PREFETCH* نیاز به operand دارند",
+            ])
+
+        lines.extend([
+            "",
+            "  ✓ فرمت صحیح:",
+            "     MNEMONIC [REGISTER]",
+            "     MNEMONIC [REGISTER+NUMBER]",
+            "     MNEMONIC [REGISTER-NUMBER]",
+            "     MNEMONIC [IDENTIFIER]",
+            "     WBINVD  (بدون operand)",
+            "     INVD    (بدون operand)",
+        ])
+
+        if self.hint:
+            lines.append("")
+            lines.append(f"  📌 پیشنهاد: {self.hint}")
+
+        return "\n".join(lines)
+
+
+def render_diagnostics(diagnostics, limit=None, file=None):
+    """
+    نمایش خطاها با محدودیت تعداد
+
+    Args:
+        diagnostics: لیست Diagnostic ها
+        limit: حداکثر تعداد خطای نمایش داده شده (None = همه)
+        file: جریان خروجی (پیش‌فرض sys.stdout)
+    """
+    out = file or sys.stdout
+    shown = diagnostics if limit is None else diagnostics[:limit]
+
+    for diagnostic in shown:
+        print(diagnostic.render(), file=out)
+
+    hidden = len(diagnostics) - len(shown)
+    if hidden > 0:
+        print(f"\n  ... و {hidden} خطای دیگر", file=out)
@@ -5,13 +5,14 @@
 
 import sys
 
-try:
-    from graphviz import Digraph
-except ImportError:
-    print("❌ کتابخانه graphviz نصب نیست.")
-    sys.exit(1)
-
 def create_automata():
+    # graphviz فقط هنگام رسم import می‌شود (import این ماژول سبک است)
+    try:
+        from graphviz import Digraph
+    except ImportError:
+        print("❌ کتابخانه graphviz نصب نیست.")
+        sys.exit(1)
+
     print("⏳ در حال تولید نمودار...")
 
     # استفاده از تنظیمات ساده که خطا ندهد
@@ -4,15 +4,27 @@
 اسکریپت تولید خودکار جدول LR(0) از lr_tables.py
 Auto-generate LR(0) table in various formats
 تیم 15 - پروژه کامپایلر
+
+اجرا:
+    python generate_lr_table.py          # جدول دستی LR_PARSING_TABLE
+    python generate_lr_table.py --slr    # جدول SLR تولیدشده از GRAMMAR_RULES (lr_generator)
+    python generate_lr_table.py --lalr   # جدول LALR(1) تولیدشده از GRAMMAR_RULES
 """
 
 import os
 import sys
 
-def import_lr_tables():
-    """Import کردن جدول و قوانین از lr_tables.py"""
+def import_lr_tables(method=None):
+    """Import کردن جدول و قوانین از lr_tables.py (یا تولید جدول SLR/LALR از قوانین)"""
     try:
         from lr_tables import LR_PARSING_TABLE, GRAMMAR_RULES
+        if method:
+            from lr_generator import generate_table
+
+            table, conflicts = generate_table(GRAMMAR_RULES, method)
+            for state, symbol, kept, dropped in conflicts:
+                print(f"⚠️  تعارض: State {state}، {symbol}: {kept} (به جای {dropped})")
+            return table, GRAMMAR_RULES
         return LR_PARSING_TABLE, GRAMMAR_RULES
     except ImportError:
         print("❌ خطا: فایل lr_tables.py یافت نشد!")
@@ -135,7 +147,8 @@ def main():
 
     # Import جدول
     print("🔄 در حال بارگذاری lr_tables.py...")
-    table, grammar = import_lr_tables()
+    method = next((arg[2:] for arg in sys.argv[1:] if arg in ('--slr', '--lalr')), None)
+    table, grammar = import_lr_tables(method)
 
     if table is None or grammar is None:
         return
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+پارس افزایشی فایل‌های در حال ویرایش
+Incremental Re-Parse (Watch Mode)
+تیم 15 - پروژه کامپایلر - دانشگاه شهید باهنر کرمان
+
+آخرین نتیجه‌ی پارس یک فایل در حافظه می‌ماند. با هر تغییر، خطوط مشترک
+ابتدا و انتهای فایل (مقایسه‌ی خط به خط) دست نمی‌خورند و فقط بازه‌ی
+تغییرکرده دوباره پارس می‌شود؛ لیست‌های results و diagnostics در جا
+به‌روز می‌شوند. هر دستور در یک خط است، پس پارس یک بازه‌ی خطوط مستقل از
+بقیه‌ی فایل است.
+"""
+
+import os
+import time
+
+from cache_parser import CacheInstructionParser, _source_line, source_lines
+
+
+# فاصله‌ی بررسی تغییر فایل در حالت watch (ثانیه)
+WATCH_INTERVAL = 0.5
+
+
+def _first_after(items, line, line_of):
+    """اندیس اولین عنصر با شماره خط بزرگ‌تر از line (لیست مرتب)"""
+    low, high = 0, len(items)
+    while low < high:
+        middle = (low + high) // 2
+        if line_of(items[middle]) <= line:
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+
+def _result_line(item):
+    return item[0]
+
+
+def _diagnostic_line(diagnostic):
+    return diagnostic.line
+
+
+class IncrementalParser:
+    """
+    نتیجه‌ی پارس یک فایل که با هر ویرایش به‌صورت افزایشی به‌روز می‌شود
+
+    results و diagnostics همان قالب خروجی parse_file را دارند.
+
+    Args:
+        parser: CacheInstructionParser (پیش‌فرض یک نمونه‌ی جدید)
+    """
+
+    def __init__(self, parser=None):
+        self.parser = parser or CacheInstructionParser()
+        self.lines = []
+        self.results = []       # (شماره خط، متن، AST)
+        self.diagnostics = []   # Diagnostic ها
+        self.reparsed_lines = 0  # تعداد خطوط پارس‌شده در آخرین update
+
+    def update(self, text):
+        """
+        اعمال متن جدید فایل
+
+        Returns:
+            (first_line، removed، added) - بازه‌ی تغییرکرده: از خط first_line،
+            removed خط قدیمی با added خط جدید جایگزین شده‌اند
+        """
+        old = self.lines
+        new = source_lines(text)
+
+        # طول پیشوند و پسوند مشترک
+        limit = min(len(old), len(new))
+        prefix = 0
+        while prefix < limit and old[prefix] == new[prefix]:
+            prefix += 1
+        suffix = 0
+        while suffix < limit - prefix and old[-1 - suffix] == new[-1 - suffix]:
+            suffix += 1
+
+        old_end = len(old) - suffix
+        new_end = len(new) - suffix
+        results, diagnostics = self._parse_lines(new[prefix:new_end], prefix + 1)
+
+        delta = new_end - old_end
+        self._splice(self.results, results, prefix, old_end, delta, _result_line, self._shift_result)
+        self._splice(self.diagnostics, diagnostics, prefix, old_end, delta, _diagnostic_line,
+                     self._shift_diagnostic)
+
+        self.lines = new
+        self.reparsed_lines = new_end - prefix
+        return prefix + 1, old_end - prefix, new_end - prefix
+
+    def _parse_lines(self, lines, first_line):
+        """پارس یک بازه از خطوط با شماره خط سراسری"""
+        if not lines:
+            return [], []
+
+        program = self.parser.parse_program('\n'.join(lines), first_line=first_line)
+        results = [(ast.lineno, _source_line(lines[ast.lineno - first_line]), ast) for ast in program]
+        diagnostics = self.parser.diagnostics
+        for diagnostic in diagnostics:
+            index = diagnostic.line - first_line
+            if 0 <= index < len(lines):
+                diagnostic.source = _source_line(lines[index])
+        return results, diagnostics
+
+    @staticmethod
+    def _splice(items, replacement, start, old_end, delta, line_of, shift):
+        """
+        جایگزینی عناصر خطوط (start, old_end] و جابجایی شماره خط عناصر بعدی
+
+        items در جا تغییر می‌کند.
+        """
+        low = _first_after(items, start, line_of)
+        high = _first_after(items, old_end, line_of)
+        items[low:high] = replacement
+        if delta:
+            for i in range(low + len(replacement), len(items)):
+                items[i] = shift(items[i], delta)
+
+    @staticmethod
+    def _shift_result(item, delta):
+        line_num, source, ast = item
+        ast.lineno = line_num + delta
+        return ast.lineno, source, ast
+
+    @staticmethod
+    def _shift_diagnostic(diagnostic, delta):
+        diagnostic.line += delta
+        return diagnostic
+
+
+def watch(filename, on_update, interval=WATCH_INTERVAL, parser=None):
+    """
+    پارس فایل و پارس افزایشی دوباره با هر تغییر (تا Ctrl+C)
+
+    تغییر فایل با مقایسه‌ی زمان و اندازه (os.stat) تشخیص داده می‌شود. اگر
+    فایل در حین ذخیره حذف و دوباره ساخته شود (ویرایشگرها)، خواندن در بررسی
+    بعدی تکرار می‌شود.
+
+    Args:
+        filename: مسیر فایل
+        on_update: تابع on_update(incremental, changed, seconds) بعد از هر پارس
+        interval: فاصله‌ی بررسی تغییر (ثانیه)
+        parser: CacheInstructionParser (اختیاری)
+    """
+    incremental = IncrementalParser(parser)
+    signature = None
+
+    while True:
+        try:
+            stat = os.stat(filename)
+        except FileNotFoundError:
+            stat = None
+
+        current = None if stat is None else (stat.st_mtime_ns, stat.st_size)
+        if current is not None and current != signature:
+            try:
+                with open(filename, 'r', encoding='utf-8') as f:
+                    text = f.read()
+            except FileNotFoundError:
+                text = None  # فایل بین stat و open حذف شد
+            if text is not None:
+                signature = current
+                start = time.perf_counter()
+                changed = incremental.update(text)
+                on_update(incremental, changed, time.perf_counter() - start)
+
+        time.sleep(interval)
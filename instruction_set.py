@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+جدول اطلاعات دستورات کنترل کش
+Mnemonic Metadata
+تیم 15 - پروژه کامپایلر - دانشگاه شهید باهنر کرمان
+
+یک جدول از پیش ساخته‌شده که lexer، parser، analyze_instruction و main
+همگی از آن استفاده می‌کنند: دسته، نیاز به operand، نام دسته در گرامر BNF
+و توضیح هر mnemonic. جستجو یک دسترسی dict است (O(1)).
+"""
+
+
+# ═══════════════════════════════════════════════════════════════════
+#                          دسته‌ها
+# ═══════════════════════════════════════════════════════════════════
+
+# (دسته، نام در گرامر BNF، برچسب، توضیح)
+_CATEGORIES = (
+    ('flush', 'CacheFlush', 'Cache Flush', 'Cache Flush - پاک‌سازی خط کش'),
+    ('writeback', 'CacheWrite', 'Cache WriteBack', 'Cache Write-Back - نوشتن به حافظه اصلی'),
+    ('prefetch', 'CachePrefetch', 'Cache Prefetch', 'Cache Prefetch - پیش‌خوانی داده'),
+    ('invalidate', 'CacheInvalidate', 'Cache Invalid', 'Cache Invalidate - باطل‌سازی کش'),
+)
+
+CATEGORIES = tuple(category for category, _, _, _ in _CATEGORIES)
+CATEGORY_ID = {category: i for i, category in enumerate(CATEGORIES)}
+CATEGORY_BNF = {category: bnf for category, bnf, _, _ in _CATEGORIES}
+CATEGORY_LABEL = {category: label for category, _, label, _ in _CATEGORIES}
+CATEGORY_DESCRIPTION = {category: description for category, _, _, description in _CATEGORIES}
+
+
+# ═══════════════════════════════════════════════════════════════════
+#                          Mnemonic ها
+# ═══════════════════════════════════════════════════════════════════
+
+# (mnemonic، دسته، نیاز به operand) - ترتیب همان ترتیب توکن‌های lexer است
+_MNEMONICS = (
+    ('CLFLUSH', 'flush', True),
+    ('CLFLUSHOPT', 'flush', True),
+    ('CLWB', 'writeback', True),
+    ('PREFETCHT0', 'prefetch', True),
+    ('PREFETCHT1', 'prefetch', True),
+    ('PREFETCHT2', 'prefetch', True),
+    ('PREFETCHNTA', 'prefetch', True),
+    ('WBINVD', 'invalidate', False),
+    ('INVD', 'invalidate', False),
+)
+
+
+class MnemonicInfo:
+    """
+    اطلاعات یک mnemonic
+
+    Args:
+        name: نام دستور
+        category: دسته (یکی از CATEGORIES یا 'unknown')
+        requires_operand: آیا دستور بدون operand نامعتبر است
+    """
+
+    __slots__ = ('id', 'name', 'category', 'category_id', 'requires_operand', 'bnf_name', 'description')
+
+    def __init__(self, id, name, category, requires_operand):
+        self.id = id
+        self.name = name
+        self.category = category
+        self.category_id = CATEGORY_ID.get(category, -1)
+        self.requires_operand = requires_operand
+        self.bnf_name = CATEGORY_BNF.get(category, 'Mnemonic')
+        self.description = CATEGORY_DESCRIPTION.get(category, 'نامشخص')
+
+    def __repr__(self):
+        return f"MnemonicInfo({self.name}, {self.category})"
+
+    def __reduce__(self):
+        # بعد از unpickle همان نمونه‌ی جدول برگردانده می‌شود
+        return (lookup, (self.name,))
+
+
+MNEMONICS = tuple(name for name, _, _ in _MNEMONICS)
+
+INSTRUCTION_SET = {name: MnemonicInfo(i, name, category, requires_operand)
+                   for i, (name, category, requires_operand) in enumerate(_MNEMONICS)}
+
+# برای mnemonic های ناشناخته (مثلا Instruction ساخته‌شده به‌صورت دستی)
+UNKNOWN = MnemonicInfo(-1, '?', 'unknown', False)
+
+OPERAND_MNEMONICS = frozenset(name for name, info in INSTRUCTION_SET.items() if info.requires_operand)
+NO_OPERAND_MNEMONICS = frozenset(name for name, info in INSTRUCTION_SET.items() if not info.requires_operand)
+
+
+def lookup(mnemonic):
+    """
+    اطلاعات یک mnemonic
+
+    Returns:
+        MnemonicInfo (یا UNKNOWN)
+    """
+    return INSTRUCTION_SET.get(mnemonic, UNKNOWN)
+
+
+def mnemonics_by_category():
+    """
+    mnemonic های هر دسته
+
+    Returns:
+        dict دسته → لیست mnemonic ها (به ترتیب CATEGORIES)
+    """
+    groups = {category: [] for category in CATEGORIES}
+    for name, info in INSTRUCTION_SET.items():
+        groups[info.category].append(name)
+    return groups
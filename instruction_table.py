@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+جدول ستونی دستورات
+Columnar Instruction Store
+تیم 15 - پروژه کامپایلر - دانشگاه شهید باهنر کرمان
+
+InstructionTable دستورات پارس‌شده را به‌صورت آرایه‌های موازی فشرده
+(ماژول array) نگه می‌دارد تا شمارش دسته‌ها، هیستوگرام رجیسترها و
+فیلتر offset روی میلیون‌ها سطر بدون پیمایش اشیاء Instruction انجام شود.
+اگر NumPy نصب باشد، ستون‌ها بدون کپی به آرایه‌ی NumPy تبدیل می‌شوند.
+"""
+
+from array import array
+from collections import Counter
+
+from cache_parser import Instruction, MemoryOperand, Register, Identifier
+from instruction_set import MNEMONICS, CATEGORIES
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # NumPy اختیاری است
+
+
+# ═══════════════════════════════════════════════════════════════════
+#                          شناسه‌های ثابت
+# ═══════════════════════════════════════════════════════════════════
+
+# نوع base عملوند
+BASE_NONE = 0
+BASE_REGISTER = 1
+BASE_IDENTIFIER = 2
+
+NO_ID = -1
+
+# مقدار ستون has_offset
+OFFSET_NONE = 0
+OFFSET_COLUMN = 1   # offset در ستون int64
+OFFSET_BIG = 2      # offset خارج از int64 (NUMBER حد ندارد) - در big_offsets
+
+INT64_MIN = -2 ** 63
+INT64_MAX = 2 ** 63 - 1
+
+
+class InstructionTable:
+    """
+    ذخیره‌ی ستونی (struct-of-arrays) دستورات
+
+    ستون‌ها (هر سطر = یک دستور):
+        line        شماره خط
+        mnemonic    شناسه در MNEMONICS
+        category    شناسه در CATEGORIES
+        base_kind   BASE_NONE / BASE_REGISTER / BASE_IDENTIFIER
+        register    شناسه در self.registers یا NO_ID
+        identifier  شناسه در self.identifiers یا NO_ID
+        offset      offset علامت‌دار (0 اگر has_offset برابر OFFSET_COLUMN نباشد)
+        has_offset  OFFSET_NONE / OFFSET_COLUMN / OFFSET_BIG
+
+    offset های خارج از بازه‌ی int64 در دیکشنری big_offsets (سطر → offset)
+    نگه داشته می‌شوند.
+    """
+
+    COLUMNS = ('line', 'mnemonic', 'category', 'base_kind', 'register', 'identifier', 'offset', 'has_offset')
+
+    def __init__(self):
+        self.line = array('I')
+        self.mnemonic = array('B')
+        self.category = array('B')
+        self.base_kind = array('B')
+        self.register = array('h')
+        self.identifier = array('i')
+        self.offset = array('q')
+        self.has_offset = array('B')
+
+        # جدول رشته‌های یکتا (نام → شناسه و شناسه → نام)
+        self.registers = []
+        self.identifiers = []
+        self._register_id = {}
+        self._identifier_id = {}
+
+        self.big_offsets = {}
+
+    @classmethod
+    def from_instructions(cls, instructions):
+        """ساخت جدول از لیست Instruction ها"""
+        table = cls()
+        for ast in instructions:
+            table.append(ast)
+        return table
+
+    def __len__(self):
+        return len(self.line)
+
+    def _intern(self, names, ids, name):
+        """شناسه‌ی یک نام در جدول رشته‌ها"""
+        index = ids.get(name)
+        if index is None:
+            index = ids[name] = len(names)
+            names.append(name)
+        return index
+
+    def append(self, ast):
+        """افزودن یک Instruction به انتهای جدول"""
+        info = ast.info
+        self.line.append(ast.lineno or 0)
+        self.mnemonic.append(info.id)
+        self.category.append(info.category_id)
+
+        operand = ast.operand
+        if operand is None:
+            self.base_kind.append(BASE_NONE)
+            self.register.append(NO_ID)
+            self.identifier.append(NO_ID)
+        elif isinstance(operand.base, Register):
+            self.base_kind.append(BASE_REGISTER)
+            self.register.append(self._intern(self.registers, self._register_id, operand.base.name))
+            self.identifier.append(NO_ID)
+        else:
+            self.base_kind.append(BASE_IDENTIFIER)
+            self.register.append(NO_ID)
+            self.identifier.append(self._intern(self.identifiers, self._identifier_id, operand.base.name))
+
+        if operand is None or operand.offset is None:
+            self.offset.append(0)
+            self.has_offset.append(OFFSET_NONE)
+        elif INT64_MIN <= operand.offset <= INT64_MAX:
+            self.offset.append(operand.offset)
+            self.has_offset.append(OFFSET_COLUMN)
+        else:
+            self.big_offsets[len(self.offset)] = operand.offset
+            self.offset.append(0)
+            self.has_offset.append(OFFSET_BIG)
+
+    def instruction(self, row):
+        """بازسازی Instruction سطر row"""
+        kind = self.base_kind[row]
+        operand = None
+        if kind != BASE_NONE:
+            if kind == BASE_REGISTER:
+                base = Register(self.registers[self.register[row]])
+            else:
+                base = Identifier(self.identifiers[self.identifier[row]])
+            operand = MemoryOperand(base, self._offset(row))
+        return Instruction(MNEMONICS[self.mnemonic[row]], operand, self.line[row])
+
+    def _offset(self, row):
+        """offset سطر row (یا None)"""
+        flag = self.has_offset[row]
+        if flag == OFFSET_COLUMN:
+            return self.offset[row]
+        if flag == OFFSET_BIG:
+            return self.big_offsets[row]
+        return None
+
+    def __iter__(self):
+        for row in range(len(self)):
+            yield self.instruction(row)
+
+    # ───────────────────────────────────────────────────────────────
+    # پرس‌وجوهای ستونی
+    # ───────────────────────────────────────────────────────────────
+
+    def to_numpy(self):
+        """
+        ستون‌ها به‌صورت آرایه‌های NumPy (بدون کپی)
+
+        Returns:
+            dict نام ستون → numpy.ndarray (offset سطرهای OFFSET_BIG صفر است؛ big_offsets)
+        """
+        if np is None:
+            raise ImportError("کتابخانه numpy نصب نیست: pip install numpy")
+        return {name: np.frombuffer(getattr(self, name), dtype=getattr(self, name).typecode)
+                for name in self.COLUMNS}
+
+    def _counts(self, column, size):
+        """تعداد هر شناسه در یک ستون (شناسه‌های 0 تا size-1)"""
+        if np is not None and len(column):
+            view = np.frombuffer(column, dtype=column.typecode)
+            return np.bincount(view[view >= 0], minlength=size).tolist()
+        counter = Counter(column)
+        return [counter[i] for i in range(size)]
+
+    def category_counts(self):
+        """تعداد دستورات هر دسته - dict نام دسته → تعداد"""
+        return dict(zip(CATEGORIES, self._counts(self.category, len(CATEGORIES))))
+
+    def mnemonic_counts(self):
+        """تعداد هر mnemonic - dict"""
+        return dict(zip(MNEMONICS, self._counts(self.mnemonic, len(MNEMONICS))))
+
+    def register_histogram(self):
+        """تعداد استفاده از هر رجیستر به‌عنوان base - dict نام رجیستر → تعداد"""
+        return dict(zip(self.registers, self._counts(self.register, len(self.registers))))
+
+    def rows_with_offset(self, minimum=None, maximum=None):
+        """
+        سطرهای دارای offset در بازه‌ی [minimum, maximum]
+
+        Returns:
+            لیست شماره سطرها (مرتب)
+        """
+        def within(value):
+            return (minimum is None or value >= minimum) and (maximum is None or value <= maximum)
+
+        big = [row for row, value in self.big_offsets.items() if within(value)]
+        low = INT64_MIN if minimum is None else max(minimum, INT64_MIN)
+        high = INT64_MAX if maximum is None else min(maximum, INT64_MAX)
+        if low > high:
+            return sorted(big)
+
+        if np is not None and len(self):
+            offset = np.frombuffer(self.offset, dtype=self.offset.typecode)
+            mask = np.frombuffer(self.has_offset, dtype=self.has_offset.typecode) == OFFSET_COLUMN
+            mask &= (offset >= low) & (offset <= high)
+            rows = np.flatnonzero(mask).tolist()
+        else:
+            rows = [row for row, (flag, value) in enumerate(zip(self.has_offset, self.offset))
+                    if flag == OFFSET_COLUMN and low <= value <= high]
+        return sorted(rows + big) if big else rows
+
+    def nbytes(self):
+        """حجم کل ستون‌ها (بایت)"""
+        return sum(len(column) * column.itemsize for column in (getattr(self, name) for name in self.COLUMNS))
@@ -0,0 +1,565 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+درایور جدول‌محور LR
+Table-Driven LR Driver
+تیم 15 - پروژه کامپایلر - دانشگاه شهید باهنر کرمان
+
+این درایور از جدول lr_tables.LR_PARSING_TABLE استفاده می‌کند؛ جدول یک بار
+(هنگام import) به آرایه‌های عددی تبدیل می‌شود و طول و LHS قوانین از قبل
+محاسبه می‌شوند. خروجی همان AST های cache_parser است.
+
+درایور جدول را به شکل فشرده (PackedTables) می‌خواند: reduce پیش‌فرض برای
+state هایی که فقط یک reduce دارند و سطرهای خلوت ACTION/GOTO با row
+displacement در آرایه‌های تخت مشترک. lalr_tables() همین قالب را از جدول
+LALR(1) تولیدشده توسط lr_generator می‌سازد. آرایه‌های کامل ACTION و GOTO
+برای trace (shift_reduce_trace) باقی مانده‌اند.
+
+کدهای ACTION:
+    0          خطا
+    1..N-1     shift به state
+    ACCEPT     پذیرش (= تعداد state ها)
+    -rule      reduce با قانون rule
+"""
+
+from cache_parser import Instruction, MemoryOperand, Register, Identifier
+from cache_lexer import tokens, iter_spans, span_value, span_column, span_line, TOKEN_ID
+from diagnostics import Diagnostic, suggest
+from instruction_set import MNEMONICS, OPERAND_MNEMONICS, NO_OPERAND_MNEMONICS
+from lr_tables import LR_PARSING_TABLE, GRAMMAR_RULES
+
+
+# ═══════════════════════════════════════════════════════════════════
+#                    تبدیل جدول به آرایه‌های عددی
+# ═══════════════════════════════════════════════════════════════════
+
+END = '$'
+
+# ترمینال‌ها: توکن‌های lexer و نشانه‌ی پایان
+TERMINALS = tokens + (END,)
+TERMINAL_ID = {name: i for i, name in enumerate(TERMINALS)}
+END_ID = TERMINAL_ID[END]
+
+# قوانین به صورت (LHS، لیست RHS)
+_RULES = {num: (rule.split(' -> ')[0], rule.split(' -> ')[1].split()) for num, rule in GRAMMAR_RULES.items()}
+
+# غیرترمینال‌ها به ترتیب اولین ظهور در قوانین
+NONTERMINALS = tuple(dict.fromkeys(lhs for lhs, _ in _RULES.values()))
+NONTERMINAL_ID = {name: i for i, name in enumerate(NONTERMINALS)}
+
+N_STATES = len(LR_PARSING_TABLE)
+N_TERMINALS = len(TERMINALS)
+N_NONTERMINALS = len(NONTERMINALS)
+ACCEPT = N_STATES
+
+# طول RHS و شناسه‌ی LHS هر قانون (اندیس = شماره قانون)
+RULE_LEN = [0] * (max(_RULES) + 1)
+RULE_LHS = [0] * (max(_RULES) + 1)
+for _num, (_lhs, _rhs) in _RULES.items():
+    RULE_LEN[_num] = len(_rhs)
+    RULE_LHS[_num] = NONTERMINAL_ID[_lhs]
+
+
+def _compile_table():
+    """
+    تبدیل LR_PARSING_TABLE به آرایه‌های تخت ACTION و GOTO
+
+    Returns:
+        (action, goto) - action[state * N_TERMINALS + terminal] و
+        goto[state * N_NONTERMINALS + nonterminal]
+    """
+    action = [0] * (N_STATES * N_TERMINALS)
+    goto = [0] * (N_STATES * N_NONTERMINALS)
+
+    for state, row in LR_PARSING_TABLE.items():
+        for symbol, entry in row.items():
+            if isinstance(entry, int):
+                goto[state * N_NONTERMINALS + NONTERMINAL_ID[symbol]] = entry
+            elif entry == 'acc':
+                action[state * N_TERMINALS + TERMINAL_ID[symbol]] = ACCEPT
+            elif entry[0] == 's':
+                action[state * N_TERMINALS + TERMINAL_ID[symbol]] = int(entry[1:])
+            else:
+                action[state * N_TERMINALS + TERMINAL_ID[symbol]] = -int(entry[1:])
+
+    return action, goto
+
+
+ACTION, GOTO = _compile_table()
+
+# state بعد از mnemonic در جدول دستی (همان PackedTables().operand_state) - run_table
+# در این state مثل LRDriver نگهبان operand را اعمال می‌کند
+OPERAND_STATE = LR_PARSING_TABLE[0]['mnemonic']
+
+
+# ═══════════════════════════════════════════════════════════════════
+#                    جدول‌های فشرده (row displacement)
+# ═══════════════════════════════════════════════════════════════════
+
+def pack_rows(rows, width):
+    """
+    فشرده‌سازی سطرهای خلوت با row displacement (comb)
+
+    سطرها (پرترین اول) در اولین جابجایی قرار می‌گیرند که خانه‌های پرشان با
+    خانه‌های سطرهای قبلی برخورد نکند؛ check صاحب هر خانه را نگه می‌دارد.
+    آرایه‌ها به اندازه‌ی width بلندتر هستند تا base[row] + column همیشه معتبر باشد.
+
+    Args:
+        rows: لیست دیکشنری‌های {ستون: مقدار غیرصفر}
+        width: تعداد ستون‌ها
+
+    Returns:
+        (base, check, value) - value[base[row] + column] اگر check[...] == row، وگرنه خالی
+    """
+    base = [0] * len(rows)
+    check = []
+    value = []
+    free = 0  # همه‌ی خانه‌های قبل از free پر هستند
+
+    for row in sorted(range(len(rows)), key=lambda row: (-len(rows[row]), row)):
+        columns = rows[row]
+        if columns:
+            first = min(columns)
+            offset = max(0, free - first)
+            while any(offset + column < len(check) and check[offset + column] != -1 for column in columns):
+                offset += 1
+        else:
+            offset = 0
+        base[row] = offset
+
+        size = offset + width
+        if len(check) < size:
+            check.extend([-1] * (size - len(check)))
+            value.extend([0] * (size - len(value)))
+        for column, entry in columns.items():
+            check[offset + column] = row
+            value[offset + column] = entry
+        while free < len(check) and check[free] != -1:
+            free += 1
+
+    return base, check, value
+
+
+def _action_code(entry, accept):
+    """کد عددی یک خانه‌ی ACTION ('sN'، 'rN' یا 'acc')"""
+    if entry == 'acc':
+        return accept
+    if entry[0] == 's':
+        return int(entry[1:])
+    return -int(entry[1:])
+
+
+class PackedTables:
+    """
+    جدول ACTION/GOTO فشرده برای LRDriver
+
+    ACTION: code = action[base[s] + t] اگر check[base[s] + t] == s، وگرنه default[s]
+    GOTO:   goto[goto_base[s] + A] (بعد از reduce معتبر خانه همیشه پر است)
+
+    کدها مثل ACTION (0 خطا، >0 shift، accept پذیرش، <0 reduce). با reduce
+    پیش‌فرض (مثل PLY) state ای که همه‌ی عمل‌هایش reduce با یک قانون است
+    بدون نگاه به توکن reduce می‌کند و سطرش از آرایه حذف می‌شود؛ خطا در
+    state بعدی پیدا می‌شود.
+
+    Args:
+        table: جدول با قالب LR_PARSING_TABLE روی قوانین GRAMMAR_RULES
+        default_reductions: فعال کردن reduce پیش‌فرض
+    """
+
+    def __init__(self, table=None, default_reductions=True):
+        table = LR_PARSING_TABLE if table is None else table
+        n_states = len(table)
+        self.n_states = n_states
+        self.accept = n_states
+
+        action_rows = []
+        goto_rows = []
+        self.default = [0] * n_states
+        self.expected_ids = []
+
+        for state in range(n_states):
+            actions = {}
+            gotos = {}
+            for symbol, entry in table[state].items():
+                if isinstance(entry, int):
+                    gotos[NONTERMINAL_ID[symbol]] = entry
+                else:
+                    actions[TERMINAL_ID[symbol]] = _action_code(entry, n_states)
+
+            self.expected_ids.append(sorted(actions))
+            codes = set(actions.values())
+            if default_reductions and len(codes) == 1 and min(codes) < 0:
+                self.default[state] = codes.pop()
+                actions = {}
+
+            action_rows.append(actions)
+            goto_rows.append(gotos)
+
+        self.base, self.check, self.action = pack_rows(action_rows, N_TERMINALS)
+        self.goto_base, _, self.goto = pack_rows(goto_rows, N_NONTERMINALS)
+
+        # state بعد از mnemonic - نگهبان operand در LRDriver فقط LBRACKET
+        # (shift) و پایان (reduce با instruction -> mnemonic) را جدا می‌کند
+        self.operand_state = table[0]['mnemonic']
+        row = table[self.operand_state]
+        actions = {symbol: entry for symbol, entry in row.items() if not isinstance(entry, int)}
+        if (set(actions) != {'LBRACKET', END} or actions['LBRACKET'][0] != 's'
+                or actions[END] != f'r{RULE_NO_OPERAND}'):
+            raise ValueError(f"state {self.operand_state} بعد از mnemonic شکل مورد انتظار نگهبان operand را ندارد: "
+                             f"{actions}")
+
+    def lookup(self, state, term):
+        """کد ACTION یک state و شناسه‌ی ترمینال"""
+        i = self.base[state] + term
+        return self.action[i] if self.check[i] == state else self.default[state]
+
+    def expected(self, state, end_name):
+        """توکن‌های مورد انتظار یک state (از سطر کامل، برای Diagnostic)"""
+        return tuple(sorted(end_name if term == END_ID else TERMINALS[term]
+                            for term in self.expected_ids[state]))
+
+    def size(self):
+        """تعداد خانه‌های آرایه‌های جدول (base، check، action، default، goto_base، goto)"""
+        return (len(self.base) + len(self.check) + len(self.action) + len(self.default)
+                + len(self.goto_base) + len(self.goto))
+
+
+_packed_tables = {}
+
+
+def _hand_tables():
+    """PackedTables جدول دستی LR_PARSING_TABLE (یک بار ساخته می‌شود)"""
+    if 'hand' not in _packed_tables:
+        _packed_tables['hand'] = PackedTables()
+    return _packed_tables['hand']
+
+
+def lalr_tables():
+    """
+    جدول LALR(1) تولیدشده از GRAMMAR_RULES (lr_generator) به شکل PackedTables
+
+    فقط یک بار ساخته می‌شود.
+    """
+    if 'lalr' not in _packed_tables:
+        from lr_generator import generate_table, METHOD_LALR
+
+        table, conflicts = generate_table(GRAMMAR_RULES, METHOD_LALR)
+        if conflicts:
+            raise ValueError(f"تداخل در جدول LALR: {conflicts}")
+        _packed_tables['lalr'] = PackedTables(table)
+    return _packed_tables['lalr']
+
+
+# ═══════════════════════════════════════════════════════════════════
+#                          اعمال معنایی قوانین
+# ═══════════════════════════════════════════════════════════════════
+
+# در جدول‌ها بعد از reduce به mnemonic هر mnemonic می‌تواند بدون operand
+# بیاید (instruction -> mnemonic)؛ گرامر cache_parser فقط WBINVD و INVD را بدون
+# operand و بقیه را فقط با operand می‌پذیرد. پس در state بعد از mnemonic
+# توکن بعدی با خود mnemonic بررسی می‌شود (نگهبان operand).
+LBRACKET_ID = TERMINAL_ID['LBRACKET']
+OPERAND_EXPECTED = ('LBRACKET',)
+
+
+def _pass(v, lineno):
+    return v[0]
+
+
+# عمل معنایی هر قانون با کلید متن قانون (نه شماره‌ی آن در GRAMMAR_RULES)
+PRODUCTION_ACTIONS = {
+    'instruction -> mnemonic operand': lambda v, lineno: Instruction(v[0], v[1], lineno),
+    'instruction -> mnemonic': lambda v, lineno: Instruction(v[0], lineno=lineno),
+    'operand -> memory_address': _pass,
+    'memory_address -> LBRACKET base_expr RBRACKET': lambda v, lineno: v[1],
+    'base_expr -> REGISTER offset': lambda v, lineno: MemoryOperand(Register(v[0]), v[1]),
+    'base_expr -> REGISTER': lambda v, lineno: MemoryOperand(Register(v[0])),
+    'base_expr -> IDENTIFIER': lambda v, lineno: MemoryOperand(Identifier(v[0])),
+    'offset -> PLUS NUMBER': lambda v, lineno: v[1],
+    'offset -> MINUS NUMBER': lambda v, lineno: -v[1],
+}
+
+# قانون instruction -> mnemonic (برای نگهبان operand)
+NO_OPERAND_PRODUCTION = 'instruction -> mnemonic'
+
+
+def _semantic_actions():
+    """
+    عمل معنایی هر شماره‌ی قانون GRAMMAR_RULES از روی متن قانون
+
+    قوانین «mnemonic -> X» مقدار توکن را برمی‌گردانند. اگر GRAMMAR_RULES با
+    PRODUCTION_ACTIONS، RULE_LEN یا mnemonic های instruction_set هماهنگ نباشد
+    ValueError (هنگام import) - نه AST اشتباه.
+    """
+    actions = [None] * len(RULE_LEN)
+    mnemonics = set()
+
+    for num, rule in GRAMMAR_RULES.items():
+        lhs, rhs = rule.split(' -> ')
+        rhs = rhs.split()
+        if RULE_LEN[num] != len(rhs) or RULE_LHS[num] != NONTERMINAL_ID[lhs]:
+            raise ValueError(f"RULE_LEN/RULE_LHS با قانون {num} ({rule}) هماهنگ نیست")
+        if rule in PRODUCTION_ACTIONS:
+            actions[num] = PRODUCTION_ACTIONS[rule]
+        elif lhs == 'mnemonic' and len(rhs) == 1 and rhs[0] in MNEMONICS:
+            actions[num] = _pass
+            mnemonics.add(rhs[0])
+        else:
+            raise ValueError(f"عمل معنایی برای قانون {num} ({rule}) تعریف نشده است")
+
+    missing = set(PRODUCTION_ACTIONS) - set(GRAMMAR_RULES.values())
+    if missing:
+        raise ValueError(f"قوانین PRODUCTION_ACTIONS در GRAMMAR_RULES نیستند: {sorted(missing)}")
+    if mnemonics != set(MNEMONICS) or set(MNEMONICS) != OPERAND_MNEMONICS | NO_OPERAND_MNEMONICS:
+        raise ValueError("قوانین mnemonic با instruction_set هماهنگ نیستند")
+    return actions
+
+
+SEMANTIC_ACTIONS = _semantic_actions()
+RULE_NO_OPERAND = next(num for num, rule in GRAMMAR_RULES.items() if rule == NO_OPERAND_PRODUCTION)
+
+
+# ═══════════════════════════════════════════════════════════════════
+#                          LR Driver
+# ═══════════════════════════════════════════════════════════════════
+
+class LRDriver:
+    """
+    parser جدول‌محور با رابط parse(text, lexer=...) مثل parser های PLY
+
+    Args:
+        program: پارس کل فایل - NEWLINE پایان هر دستور است و خطوط نامعتبر
+                 (مثل «line : error NEWLINE» در گرامر PLY) رد می‌شوند
+        tables: PackedTables (پیش‌فرض جدول دستی LR_PARSING_TABLE؛ lalr_tables()
+                برای جدول LALR تولیدشده)
+    """
+
+    def __init__(self, program=False, tables=None):
+        self.program = program
+        self.tables = tables or _hand_tables()
+        end_name = 'NEWLINE' if program else '$end'
+        self.end_name = end_name
+        self.expected = [self.tables.expected(state, end_name) for state in range(self.tables.n_states)]
+
+        self.terminal_id = dict(TERMINAL_ID)
+        if program:
+            self.terminal_id['NEWLINE'] = END_ID
+
+    def _operand_expected(self, mnemonic):
+        """توکن مورد انتظار بعد از mnemonic (نگهبان operand)"""
+        return (self.end_name,) if mnemonic in NO_OPERAND_MNEMONICS else OPERAND_EXPECTED
+
+    def parse(self, text, lexer):
+        """
+        پارس متن ورودی
+
+        Returns:
+            program=False: AST یا None در صورت خطا
+            program=True: لیست Instruction های معتبر
+        خطاها به lexer.diagnostics اضافه می‌شوند.
+        """
+        lexer.input(text)
+        next_token = lexer.token
+        terminal_id = self.terminal_id
+        program = self.program
+        debug = lexer.debug
+        table = lexer.table if program else None
+
+        tables = self.tables
+        base, check, action, default = tables.base, tables.check, tables.action, tables.default
+        goto_base, goto = tables.goto_base, tables.goto
+        accept = tables.accept
+        operand_state = tables.operand_state
+        rule_len = RULE_LEN
+        rule_lhs = RULE_LHS
+        semantic = SEMANTIC_ACTIONS
+
+        results = []
+        states = [0]
+        values = []
+        lineno = None
+        tok = next_token()
+
+        while True:
+            state = states[-1]
+
+            if tok is None:
+                if program and state == 0:
+                    return results
+                term = END_ID
+            else:
+                term = terminal_id[tok.type]
+                if term == END_ID and state == 0:
+                    tok = next_token()  # خط خالی
+                    continue
+
+            i = base[state] + term
+            code = action[i] if check[i] == state else default[state]
+            if state == operand_state and term != (END_ID if values[-1] in NO_OPERAND_MNEMONICS else LBRACKET_ID):
+                code = 0
+
+            if code > 0 and code != accept:
+                if state == 0:
+                    lineno = tok.lineno
+                states.append(code)
+                values.append(tok.value)
+                tok = next_token()
+
+            elif code < 0:
+                rule = -code
+                n = rule_len[rule]
+                args = values[-n:]
+                del values[-n:]
+                del states[-n:]
+                values.append(semantic[rule](args, lineno))
+                states.append(goto[goto_base[states[-1]] + rule_lhs[rule]])
+                if debug:
+                    print(f"  [REDUCE] R{rule}: {GRAMMAR_RULES[rule]}")
+
+            elif code == accept:
+                if not program:
+                    return values[0]
+                results.append(values[0])
+                if table is not None:
+                    table.append(values[0])
+                states = [0]
+                values = []
+                tok = next_token()
+
+            else:
+                if state == operand_state:
+                    expected = self._operand_expected(values[-1])
+                else:
+                    expected = self.expected[state]
+                self._error(tok, lexer, expected)
+                if not program:
+                    return None
+                tok = self._skip_line(tok, next_token)
+                if tok is None:
+                    return results
+                states = [0]
+                values = []
+
+    def parse_buffer(self, buffer, diagnostics, table=None):
+        """
+        پارس کل فایل مستقیما روی بافر بایتی (bytes یا mmap) - فقط program=True
+
+        توکن‌ها span های cache_lexer.iter_spans هستند؛ مقدار فقط برای توکن‌هایی
+        که در AST می‌آیند (REGISTER، IDENTIFIER، NUMBER) از بافر خوانده می‌شود
+        و متن خطوط فقط برای خطاها ساخته می‌شود.
+
+        Returns:
+            لیست Instruction های معتبر (خطاها به diagnostics اضافه می‌شوند)
+        """
+        spans = iter_spans(buffer, diagnostics)
+        newline = TOKEN_ID['NEWLINE']
+
+        tables = self.tables
+        base, check, action, default = tables.base, tables.check, tables.action, tables.default
+        goto_base, goto = tables.goto_base, tables.goto
+        accept = tables.accept
+        operand_state = tables.operand_state
+        rule_len = RULE_LEN
+        rule_lhs = RULE_LHS
+        semantic = SEMANTIC_ACTIONS
+
+        results = []
+        states = [0]
+        values = []
+        lineno = 1        # خط span فعلی
+        first_line = None  # خط اولین توکن دستور فعلی
+        span = next(spans, None)
+
+        while True:
+            state = states[-1]
+
+            if span is None:
+                if state == 0:
+                    return results
+                term = END_ID
+            else:
+                term = span[2]
+                if term == newline:
+                    if state == 0:
+                        lineno += span[1]  # خط خالی یا پایان دستور قبلی
+                        span = next(spans, None)
+                        continue
+                    term = END_ID
+
+            i = base[state] + term
+            code = action[i] if check[i] == state else default[state]
+            if state == operand_state and term != (END_ID if values[-1] in NO_OPERAND_MNEMONICS else LBRACKET_ID):
+                code = 0
+
+            if code > 0 and code != accept:
+                if state == 0:
+                    first_line = lineno
+                states.append(code)
+                values.append(span_value(buffer, *span))
+                span = next(spans, None)
+
+            elif code < 0:
+                rule = -code
+                n = rule_len[rule]
+                args = values[-n:]
+                del values[-n:]
+                del states[-n:]
+                values.append(semantic[rule](args, first_line))
+                states.append(goto[goto_base[states[-1]] + rule_lhs[rule]])
+
+            elif code == accept:
+                # NEWLINE مصرف نمی‌شود تا شمارش خط در state 0 انجام شود
+                results.append(values[0])
+                if table is not None:
+                    table.append(values[0])
+                states = [0]
+                values = []
+
+            else:
+                if state == operand_state:
+                    expected = self._operand_expected(values[-1])
+                else:
+                    expected = self.expected[state]
+                diagnostics.append(self._span_error(buffer, span, lineno, expected))
+                span = self._skip_span_line(span, spans, newline)
+                states = [0]
+                values = []
+
+    def _span_error(self, buffer, span, lineno, expected):
+        """Diagnostic برای span خطا (None یعنی پایان ورودی)"""
+        if span is None:
+            offset, token_type, value = len(buffer), '$end', None
+        else:
+            offset = span[0]
+            token_type = tokens[span[2]]
+            value = '\n' if token_type == 'NEWLINE' else span_value(buffer, *span)
+            if value is None:
+                value = buffer[offset:offset + span[1]].decode('ascii')
+        column = span_column(buffer, buffer.rfind(b'\n', 0, offset) + 1, offset)
+        diagnostic = Diagnostic(lineno, column, token_type, value, expected, suggest(token_type, value, expected))
+        diagnostic.source = span_line(buffer, offset)
+        return diagnostic
+
+    def _skip_span_line(self, span, spans, newline):
+        """رد کردن span ها تا NEWLINE (خود NEWLINE مصرف نمی‌شود) یا پایان ورودی"""
+        while span is not None and span[2] != newline:
+            span = next(spans, None)
+        return span
+
+    def _error(self, tok, lexer, expected):
+        """ثبت خطای نحوی (tok=None یعنی پایان ورودی)"""
+        lexer.diagnostics.append(Diagnostic.syntax_error(tok, lexer, expected))
+
+    def _skip_line(self, tok, next_token):
+        """
+        بازیابی از خطا: رد کردن توکن‌ها تا پایان خط
+
+        Returns:
+            اولین توکن خط بعد یا None در پایان ورودی
+        """
+        terminal_id = self.terminal_id
+        while tok is not None and terminal_id[tok.type] != END_ID:
+            tok = next_token()
+        if tok is None:
+            return None
+        return next_token()
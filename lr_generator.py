@@ -0,0 +1,505 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+تولید خودکار جدول LR(0)/SLR/LALR(1) از قوانین گرامر
+LR(0) / SLR / LALR(1) Table Generator
+تیم 15 - پروژه کامپایلر - دانشگاه شهید باهنر کرمان
+
+مجموعه‌ی کانونی آیتم‌های LR(0) از GRAMMAR_RULES ساخته می‌شود و جدول
+ACTION/GOTO با همان قالب lr_tables.LR_PARSING_TABLE خروجی داده می‌شود
+({state: {symbol: 's3' | 'r2' | 'acc' | goto}}).
+
+هر مجموعه آیتم یک عدد صحیح (bitset) است: آیتم‌های یک قانون شماره‌های
+پشت‌سرهم دارند، پس goto با یک AND و یک shift بیتی ساخته می‌شود. closure
+هر غیرترمینال یک بار از قبل محاسبه می‌شود و closure هر kernel در cache
+نگه داشته می‌شود.
+
+lookahead های LALR(1) با روش DeRemer–Pennello روی همان automaton محاسبه
+می‌شوند (روابط reads و includes روی انتقال‌های غیرترمینال و الگوریتم
+digraph)؛ مجموعه‌های ترمینال هم bitset هستند.
+
+اجرا:
+    python lr_generator.py          # جدول‌ها، تعارض‌ها و تفاوت با جدول دستی
+"""
+
+from lr_tables import GRAMMAR_RULES
+
+
+END = '$'
+AUGMENTED_START = "S'"
+
+# روش محاسبه‌ی reduce ها
+METHOD_LR0 = 'lr0'   # reduce روی همه‌ی ترمینال‌ها
+METHOD_SLR = 'slr'   # reduce روی FOLLOW(LHS)
+METHOD_LALR = 'lalr'  # reduce روی lookahead های LALR(1) (DeRemer–Pennello)
+
+
+def _bits(mask):
+    """شماره‌ی بیت‌های روشن یک bitset به ترتیب صعودی"""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+# ═══════════════════════════════════════════════════════════════════
+#                          گرامر و آیتم‌ها
+# ═══════════════════════════════════════════════════════════════════
+
+class LRGrammar:
+    """
+    گرامر افزوده و آیتم‌های LR(0) آن
+
+    Args:
+        rules: {شماره: "LHS -> RHS"} مثل GRAMMAR_RULES ('ε' برای RHS خالی)
+        start: نماد شروع (پیش‌فرض LHS کوچک‌ترین شماره قانون)
+    """
+
+    def __init__(self, rules=GRAMMAR_RULES, start=None):
+        self.rules = {}
+        for num in sorted(rules):
+            lhs, rhs = rules[num].split(' -> ')
+            self.rules[num] = (lhs.strip(), tuple(symbol for symbol in rhs.split() if symbol != 'ε'))
+
+        self.start = start or self.rules[min(self.rules)][0]
+        self.rules[0] = (AUGMENTED_START, (self.start,))
+
+        # غیرترمینال‌ها به ترتیب ظهور، سپس ترمینال‌ها به ترتیب ظهور
+        self.nonterminals = tuple(dict.fromkeys(lhs for num, (lhs, _) in sorted(self.rules.items()) if num))
+        nonterminal_set = set(self.nonterminals)
+        self.terminals = tuple(dict.fromkeys(
+            symbol for num, (_, rhs) in sorted(self.rules.items()) for symbol in rhs
+            if symbol not in nonterminal_set)) + (END,)
+        self.symbols = self.nonterminals + self.terminals
+
+        # آیتم (rule, dot) → شماره؛ آیتم‌های هر قانون پشت‌سرهم هستند
+        self.items = []
+        self.rule_base = {}
+        for num, (_, rhs) in sorted(self.rules.items()):
+            self.rule_base[num] = len(self.items)
+            self.items.extend((num, dot) for dot in range(len(rhs) + 1))
+
+        # bitset آیتم‌هایی که نماد بعد از نقطه‌ی آن‌ها symbol است
+        self.symbol_id = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.next_symbol = []   # شناسه‌ی نماد بعد از نقطه‌ی هر آیتم (None = کامل)
+        self.before = {symbol: 0 for symbol in self.symbols}
+        self.complete = 0
+        for item, (num, dot) in enumerate(self.items):
+            rhs = self.rules[num][1]
+            if dot < len(rhs):
+                self.before[rhs[dot]] |= 1 << item
+                self.next_symbol.append(self.symbol_id[rhs[dot]])
+            else:
+                self.complete |= 1 << item
+                self.next_symbol.append(None)
+
+        self._nonterminal_closure = self._closures()
+        self._closure_cache = {}
+
+    def _closures(self):
+        """
+        closure هر غیرترمینال: آیتم‌های (rule, 0) همه‌ی غیرترمینال‌هایی که از
+        سمت چپ آن قابل دسترسی هستند
+        """
+        first_symbol = {nonterminal: set() for nonterminal in self.nonterminals}
+        start_items = {nonterminal: 0 for nonterminal in self.nonterminals}
+        for num, (lhs, rhs) in self.rules.items():
+            if not num:
+                continue
+            start_items[lhs] |= 1 << self.rule_base[num]
+            if rhs and rhs[0] in first_symbol:
+                first_symbol[lhs].add(rhs[0])
+
+        closures = {}
+        for nonterminal in self.nonterminals:
+            mask = 0
+            seen = {nonterminal}
+            pending = [nonterminal]
+            while pending:
+                current = pending.pop()
+                mask |= start_items[current]
+                for symbol in first_symbol[current] - seen:
+                    seen.add(symbol)
+                    pending.append(symbol)
+            closures[nonterminal] = mask
+        return closures
+
+    def closure(self, kernel):
+        """closure یک مجموعه آیتم (bitset) - با cache"""
+        result = self._closure_cache.get(kernel)
+        if result is None:
+            result = kernel
+            for symbol in self.symbols_after(kernel):
+                if symbol in self._nonterminal_closure:
+                    result |= self._nonterminal_closure[symbol]
+            self._closure_cache[kernel] = result
+        return result
+
+    def symbols_after(self, items):
+        """نمادهای بعد از نقطه در یک مجموعه آیتم به ترتیب symbols"""
+        next_symbol = self.next_symbol
+        ids = {next_symbol[item] for item in _bits(items & ~self.complete)}
+        return [self.symbols[i] for i in sorted(ids)]
+
+    def goto(self, items, symbol):
+        """kernel حاصل از عبور symbol (آیتم بعدی هر قانون = بیت بعدی)"""
+        return (items & self.before[symbol]) << 1
+
+    def first_follow(self):
+        """
+        مجموعه‌های FIRST و FOLLOW غیرترمینال‌ها (نقطه‌ی ثابت)
+
+        Returns:
+            (first، follow، nullable)
+        """
+        nullable = set()
+        first = {nonterminal: set() for nonterminal in self.nonterminals}
+        follow = {nonterminal: set() for nonterminal in self.nonterminals}
+        follow[self.start].add(END)
+
+        def first_of(symbol):
+            return first[symbol] if symbol in first else {symbol}
+
+        changed = True
+        while changed:
+            changed = False
+            for num, (lhs, rhs) in self.rules.items():
+                if not num:
+                    continue
+                size = len(first[lhs])
+                for symbol in rhs:
+                    first[lhs] |= first_of(symbol)
+                    if symbol not in nullable:
+                        break
+                else:
+                    if lhs not in nullable:
+                        nullable.add(lhs)
+                        changed = True
+                changed = changed or len(first[lhs]) != size
+
+        changed = True
+        while changed:
+            changed = False
+            for num, (lhs, rhs) in self.rules.items():
+                if not num:
+                    continue
+                trailer = set(follow[lhs])
+                for symbol in reversed(rhs):
+                    if symbol in follow:
+                        size = len(follow[symbol])
+                        follow[symbol] |= trailer
+                        changed = changed or len(follow[symbol]) != size
+                        trailer = trailer | first[symbol] if symbol in nullable else set(first[symbol])
+                    else:
+                        trailer = {symbol}
+
+        return first, follow, nullable
+
+
+# ═══════════════════════════════════════════════════════════════════
+#                          مجموعه‌ی کانونی و جدول
+# ═══════════════════════════════════════════════════════════════════
+
+def canonical_collection(grammar):
+    """
+    مجموعه‌ی کانونی آیتم‌های LR(0)
+
+    state ها به ترتیب BFS و نمادها به ترتیب grammar.symbols شماره‌گذاری
+    می‌شوند (state 0 = closure آیتم S' -> . start).
+
+    Returns:
+        (states، transitions) - states لیست bitset ها و transitions لیست
+        دیکشنری‌های {symbol: state} برای هر state
+    """
+    start = grammar.closure(1 << grammar.rule_base[0])
+    states = [start]
+    index = {1 << grammar.rule_base[0]: 0}
+    transitions = []
+
+    position = 0
+    while position < len(states):
+        items = states[position]
+        row = {}
+        for symbol in grammar.symbols_after(items):
+            kernel = grammar.goto(items, symbol)
+            target = index.get(kernel)
+            if target is None:
+                target = index[kernel] = len(states)
+                states.append(grammar.closure(kernel))
+            row[symbol] = target
+        transitions.append(row)
+        position += 1
+
+    return states, transitions
+
+
+def build_table(grammar, states, transitions, reduce_lookaheads):
+    """
+    ساخت جدول ACTION/GOTO از automaton و lookahead های هر reduce
+
+    تعارض‌ها مثل yacc حل می‌شوند: shift بر reduce و قانون با شماره‌ی
+    کوچک‌تر بر قانون دیگر مقدم است.
+
+    Args:
+        reduce_lookaheads: تابع (state، شماره قانون) → ترمینال‌های reduce
+
+    Returns:
+        (table، conflicts) - conflicts لیست (state، symbol، انتخاب‌شده، حذف‌شده)
+    """
+    nonterminals = set(grammar.nonterminals)
+    accept_item = grammar.rule_base[0] + 1
+    table = {}
+    conflicts = []
+
+    for state, items in enumerate(states):
+        row = {}
+        gotos = {}
+        for symbol, target in transitions[state].items():
+            if symbol in nonterminals:
+                gotos[symbol] = target
+            else:
+                row[symbol] = f"s{target}"
+
+        for item in _bits(items & grammar.complete):
+            if item == accept_item:
+                row[END] = 'acc'
+                continue
+            num = grammar.items[item][0]
+            action = f"r{num}"
+            for terminal in reduce_lookaheads(state, num):
+                current = row.get(terminal)
+                if current is None:
+                    row[terminal] = action
+                elif current[0] == 's' or (current[0] == 'r' and int(current[1:]) < num):
+                    conflicts.append((state, terminal, current, action))
+                else:
+                    conflicts.append((state, terminal, action, current))
+                    row[terminal] = action
+
+        row.update(gotos)  # مثل جدول دستی: ACTION ها و سپس GOTO ها
+        table[state] = row
+
+    return table, conflicts
+
+
+def _digraph(relation, initial):
+    """
+    الگوریتم digraph (DeRemer–Pennello): F(x) = F'(x) ∪ F(y) برای همه‌ی x R+ y
+
+    اعضای هر مؤلفه‌ی قویا همبند مقدار یکسان می‌گیرند (پیاده‌سازی بدون بازگشت).
+
+    Args:
+        relation: لیست یال‌های خروجی هر گره
+        initial: لیست مقدار اولیه‌ی هر گره (bitset)
+    """
+    done = len(relation) + 1
+    result = list(initial)
+    depth = [0] * len(relation)
+    stack = []
+
+    for root in range(len(relation)):
+        if depth[root]:
+            continue
+        stack.append(root)
+        depth[root] = len(stack)
+        work = [(root, 0, len(stack))]
+
+        while work:
+            x, i, entry = work[-1]
+            edges = relation[x]
+            if i < len(edges):
+                work[-1] = (x, i + 1, entry)
+                y = edges[i]
+                if not depth[y]:
+                    stack.append(y)
+                    depth[y] = len(stack)
+                    work.append((y, 0, len(stack)))
+                else:
+                    depth[x] = min(depth[x], depth[y])
+                    result[x] |= result[y]
+                continue
+
+            work.pop()
+            if depth[x] == entry:
+                while True:
+                    top = stack.pop()
+                    depth[top] = done
+                    result[top] = result[x]
+                    if top == x:
+                        break
+            if work:
+                parent = work[-1][0]
+                depth[parent] = min(depth[parent], depth[x])
+                result[parent] |= result[x]
+
+    return result
+
+
+def lalr_lookaheads(grammar, transitions):
+    """
+    lookahead های LALR(1) هر reduce با روش DeRemer–Pennello
+
+    DR(p,A) ترمینال‌های قابل shift بعد از goto(p,A) است؛ Read با رابطه‌ی
+    reads (عبور از غیرترمینال‌های nullable) و Follow با رابطه‌ی includes
+    بسته می‌شوند و LA(q, A -> ω) اجتماع Follow انتقال‌های lookback است.
+
+    Returns:
+        دیکشنری (state، شماره قانون) → bitset ترمینال‌ها (بیت i = grammar.terminals[i])
+    """
+    nullable = grammar.first_follow()[2]
+    terminal_bit = {terminal: 1 << i for i, terminal in enumerate(grammar.terminals)}
+    nonterminals = set(grammar.nonterminals)
+    rules_of = {nonterminal: [] for nonterminal in grammar.nonterminals}
+    for num, (lhs, _) in grammar.rules.items():
+        if num:
+            rules_of[lhs].append(num)
+
+    # انتقال‌های غیرترمینال (p, A)
+    edges = [(p, symbol) for p, row in enumerate(transitions) for symbol in row if symbol in nonterminals]
+    index = {edge: i for i, edge in enumerate(edges)}
+
+    direct = []
+    reads = []
+    for p, symbol in edges:
+        r = transitions[p][symbol]
+        bits = 0
+        for next_symbol in transitions[r]:
+            if next_symbol in terminal_bit:
+                bits |= terminal_bit[next_symbol]
+        if p == 0 and symbol == grammar.start:
+            bits |= terminal_bit[END]
+        direct.append(bits)
+        reads.append([index[(r, next_symbol)] for next_symbol in transitions[r] if next_symbol in nullable])
+
+    read = _digraph(reads, direct)
+
+    includes = [[] for _ in edges]
+    lookback = {}
+    for i, (p, lhs) in enumerate(edges):
+        for num in rules_of[lhs]:
+            rhs = grammar.rules[num][1]
+            q = p
+            for k, symbol in enumerate(rhs):
+                if symbol in nonterminals and all(rest in nullable for rest in rhs[k + 1:]):
+                    includes[index[(q, symbol)]].append(i)
+                q = transitions[q][symbol]
+            lookback.setdefault((q, num), []).append(i)
+
+    follow = _digraph(includes, read)
+
+    lookaheads = {}
+    for key, sources in lookback.items():
+        bits = 0
+        for i in sources:
+            bits |= follow[i]
+        lookaheads[key] = bits
+    return lookaheads
+
+
+def generate_table(rules=GRAMMAR_RULES, method=METHOD_SLR, start=None):
+    """
+    تولید جدول LR(0)، SLR یا LALR(1) از قوانین گرامر
+
+    Args:
+        rules: {شماره: "LHS -> RHS"}
+        method: METHOD_LR0، METHOD_SLR یا METHOD_LALR
+
+    Returns:
+        (table، conflicts) - table با قالب LR_PARSING_TABLE
+    """
+    grammar = LRGrammar(rules, start)
+    states, transitions = canonical_collection(grammar)
+
+    if method == METHOD_LR0:
+        terminals = grammar.terminals
+        lookaheads = lambda state, num: terminals
+    elif method == METHOD_SLR:
+        follow = grammar.first_follow()[1]
+        ordered = {lhs: [terminal for terminal in grammar.terminals if terminal in follow[lhs]]
+                   for lhs in grammar.nonterminals}
+        lookaheads = lambda state, num: ordered[grammar.rules[num][0]]
+    elif method == METHOD_LALR:
+        bits = lalr_lookaheads(grammar, transitions)
+        terminals = grammar.terminals
+        lookaheads = lambda state, num: [terminals[i] for i in _bits(bits.get((state, num), 0))]
+    else:
+        raise ValueError(f"روش نامعتبر: {method}")
+
+    return build_table(grammar, states, transitions, lookaheads)
+
+
+# ═══════════════════════════════════════════════════════════════════
+#                          مقایسه‌ی جدول‌ها
+# ═══════════════════════════════════════════════════════════════════
+
+def table_differences(reference, generated):
+    """
+    مقایسه‌ی دو جدول با پیمایش هم‌زمان (شماره‌ی state ها لازم نیست یکسان باشد)
+
+    از state 0 هر دو جدول با همان نمادها جلو می‌رویم؛ هر خانه‌ای که نوع یا
+    قانون reduce آن متفاوت باشد گزارش می‌شود.
+
+    Returns:
+        لیست (state مرجع، state تولیدشده، symbol، خانه‌ی مرجع، خانه‌ی تولیدشده)
+    """
+    differences = []
+    seen = {(0, 0)}
+    pending = [(0, 0)]
+
+    while pending:
+        ref_state, gen_state = pending.pop(0)
+        ref_row = reference.get(ref_state, {})
+        gen_row = generated.get(gen_state, {})
+
+        for symbol in list(dict.fromkeys(list(ref_row) + list(gen_row))):
+            ref_entry = ref_row.get(symbol)
+            gen_entry = gen_row.get(symbol)
+            ref_target = _target(ref_entry)
+            gen_target = _target(gen_entry)
+
+            if ref_target is not None and gen_target is not None:
+                if (ref_target, gen_target) not in seen:
+                    seen.add((ref_target, gen_target))
+                    pending.append((ref_target, gen_target))
+            elif ref_entry != gen_entry:
+                differences.append((ref_state, gen_state, symbol, ref_entry, gen_entry))
+
+    return differences
+
+
+def _target(entry):
+    """state مقصد یک shift یا goto (None برای reduce، acc و خانه‌ی خالی)"""
+    if isinstance(entry, int):
+        return entry
+    if entry and entry[0] == 's':
+        return int(entry[1:])
+    return None
+
+
+# ═══════════════════════════════════════════════════════════════════
+#                          اجرای مستقل
+# ═══════════════════════════════════════════════════════════════════
+
+def main():
+    from lr_tables import LR_PARSING_TABLE
+
+    print("\n" + "═" * 100)
+    print(" تولید جدول از GRAMMAR_RULES")
+    print("═" * 100)
+
+    for method in (METHOD_LR0, METHOD_SLR, METHOD_LALR):
+        table, conflicts = generate_table(method=method)
+        print(f"\n📋 {method.upper()}: {len(table)} state، {len(conflicts)} تعارض")
+        for state, symbol, kept, dropped in conflicts:
+            print(f"  ⚠️  State {state}، {symbol}: {kept} (به جای {dropped})")
+
+    table, _ = generate_table()
+    differences = table_differences(LR_PARSING_TABLE, table)
+    print(f"\n🔍 تفاوت جدول دستی با جدول SLR: {len(differences)} خانه")
+    for ref_state, gen_state, symbol, ref_entry, gen_entry in differences:
+        print(f"  State {ref_state} / {gen_state}، {symbol}: دستی={ref_entry} تولیدشده={gen_entry}")
+    print("═" * 100 + "\n")
+
+
+if __name__ == "__main__":
+    main()
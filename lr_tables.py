@@ -269,6 +269,21 @@ def verify_table():
             if not isinstance(action, (int, str)):
                 issues.append(f"❌ State {state}, Symbol {symbol}: نوع action نامعتبر ({type(action)})")
 
+    # مقایسه با جدول SLR تولیدشده از GRAMMAR_RULES (lr_generator)
+    from lr_generator import generate_table, table_differences
+
+    generated, conflicts = generate_table()
+    for state, symbol, kept, dropped in conflicts:
+        issues.append(f"❌ تعارض در گرامر: State {state}، {symbol}: {kept} / {dropped}")
+
+    differences = table_differences(LR_PARSING_TABLE, generated)
+    for state, _, symbol, entry, generated_entry in differences:
+        # جدول دستی همه‌ی mnemonic ها را با یک قانون reduce می‌کند (r3 و r10)
+        if entry is not None and generated_entry is not None and entry[0] == generated_entry[0] == 'r':
+            continue
+        print(f"ℹ️  State {state}، {symbol}: دستی={entry} و SLR={generated_entry}")
+    print(f"✅ مقایسه با جدول SLR تولیدشده: {len(generated)} state، {len(differences)} خانه‌ی متفاوت")
+
     if issues:
         print("\n⚠️  مشکلات پیدا شده:")
         for issue in issues:
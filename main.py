@@ -12,10 +12,7 @@ Cache Control Instructions Parser - Main Interface
 import sys
 import os
 
-# 1️⃣ غیرفعال کردن cache برای همیشه
-sys.dont_write_bytecode = True
-
-# 2️⃣ تنظیم UTF-8 برای Windows (فارسی درست نمایش بده)
+# تنظیم UTF-8 برای Windows (فارسی درست نمایش بده)
 if sys.platform == 'win32':
     try:
         import codecs
@@ -25,46 +22,12 @@ if sys.platform == 'win32':
     except:
         pass
 
-# 3️⃣ پاک‌سازی خودکار cache در هر اجرا
-import shutil
-from pathlib import Path
-
-
-def clear_cache():
-    """پاک کردن فایل‌های cache"""
-    try:
-        # پاک کردن __pycache__
-        if os.path.exists('__pycache__'):
-            shutil.rmtree('__pycache__')
-
-        # پاک کردن parser.out
-        if os.path.exists('parser.out'):
-            os.remove('parser.out')
-
-        # پاک کردن parsetab.py
-        if os.path.exists('parsetab.py'):
-            os.remove('parsetab.py')
-
-    except Exception:
-        pass  # اگر خطایی بود نادیده بگیر
-
-
-# پاک‌سازی خودکار در شروع
-clear_cache()
-
-# حالا import های اصلی برنامه
-import json
+# ماژول‌های parser (PLY، cache_parser) و کتابخانه‌های دیگر فقط در گزینه‌ای که
+# به آن‌ها نیاز دارد import می‌شوند تا اجراهای کوتاه (--help، --watch) سریع باشند.
+# فایل‌های __pycache__ و جدول‌های پارس حفظ می‌شوند (پاک‌سازی: گزینه c).
 
-# Import Parser Components
-from cache_parser import (
-    parse_instruction,
-    parse_file,
-    analyze_instruction,
-    Instruction,
-    Register,
-    Identifier
-)
-from cache_lexer import build_lexer
+# تعداد پروسه‌های پارس فایل (گزینه‌ی --jobs)
+PARSE_JOBS = 1
 
 
 # ═══════════════════════════════════════════════════════════════════
@@ -142,6 +105,8 @@ def print_main_menu():
 
 def option_parse_single():
     """گزینه 1: پارس یک دستور"""
+    from cache_parser import parse_instruction, analyze_instruction
+
     print_header("پارس یک دستور")
 
     code = input("\n➤ دستور: ").strip()
@@ -187,7 +152,7 @@ def option_parse_single():
             if 'register_width' in op:
                 print(f"  عرض رجیستر: {op['register_width']}-bit")
             if op['has_offset']:
-                print(f"  Offset: {op['offset_value']}")
+                print(f"  Offset: {op['offset_value']:+d}")
 
         print("═" * 70)
     else:
@@ -198,6 +163,9 @@ def option_parse_single():
 
 def option_json_output():
     """گزینه 2: نمایش JSON"""
+    import json
+    from cache_parser import parse_instruction
+
     print_header("نمایش خروجی JSON")
 
     code = input("\n➤ دستور: ").strip()
@@ -231,6 +199,10 @@ def option_json_output():
 
 def option_parse_file():
     """گزینه 3: پارس فایل Assembly"""
+    import heapq
+    from pathlib import Path
+    from cache_parser import parse_file, iter_parse_file, Instruction
+
     print_header("پارس فایل Assembly")
 
     filename = input("\n➤ نام فایل: ").strip()
@@ -276,55 +248,60 @@ def option_parse_file():
     print(f"\n📁 فایل یافت شد: {file_path}")
     print("\n🔄 در حال پارس فایل...")
 
-    results = []
-    errors = []
-
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-
-        for line_num, line in enumerate(lines, 1):
-            code = line.strip()
-
-            # رد کردن خطوط خالی و کامنت
-            if not code or code.startswith(';'):
-                continue
-
-            # حذف کامنت انتهای خط
-            if ';' in code:
-                code = code.split(';')[0].strip()
-
-            try:
-                ast = parse_instruction(code, debug=False)
-                if ast:
-                    results.append((line_num, code, ast))
-                else:
-                    errors.append((line_num, code, "پارس ناموفق"))
-            except Exception as e:
-                errors.append((line_num, code, str(e)))
+        # پارس جریانی: فقط چند نمونه‌ی اول برای نمایش نگه داشته می‌شود
+        results = []
+        errors = []
+        result_count = 0
+        error_count = 0
+        error_line_count = 0
+        last_error_line = None
+
+        if PARSE_JOBS == 1:
+            items = iter_parse_file(file_path)
+        else:
+            # پارس موازی و ادغام دستورات و خطاها به ترتیب خط
+            parsed, diagnostics = parse_file(file_path, jobs=PARSE_JOBS)
+            items = heapq.merge(((line_num, ast) for line_num, _, ast in parsed),
+                                ((diagnostic.line, diagnostic) for diagnostic in diagnostics),
+                                key=lambda item: item[0])
+
+        for line_num, item in items:
+            if isinstance(item, Instruction):
+                result_count += 1
+                if len(results) < 15:
+                    results.append((line_num, item))
+            else:
+                error_count += 1
+                if line_num != last_error_line:
+                    error_line_count += 1
+                    last_error_line = line_num
+                if len(errors) < 5:
+                    errors.append(item)
 
         # نمایش نتایج
         print(f"\n📊 نتیجه:")
-        print(f"  ✓ موفق: {len(results)} دستور")
-        print(f"  ✗ خطا: {len(errors)} دستور")
+        print(f"  ✓ موفق: {result_count} دستور")
+        print(f"  ✗ خطا: {error_line_count} دستور")
 
         if results:
             print("\n✅ دستورات معتبر:")
-            for line_num, code, ast in results[:15]:
-                category = ast.get_instruction_category()
-                print(f"  خط {line_num:3d}: {code:35s} → {category}")
+            for line_num, ast in results:
+                print(f"  خط {line_num:3d}: {ast.to_asm():35s} → {ast.category}")
 
-            if len(results) > 15:
-                print(f"  ... و {len(results) - 15} دستور دیگر")
+            if result_count > 15:
+                print(f"  ... و {result_count - 15} دستور دیگر")
 
         if errors:
             print("\n❌ خطاها:")
-            for line_num, code, error in errors[:5]:
-                print(f"  خط {line_num:3d}: {code}")
-                print(f"         → {error}")
+            for diagnostic in errors:
+                print(f"  خط {diagnostic.line:3d}: {diagnostic.source}")
+                print(f"         → {diagnostic.message}")
+                if diagnostic.hint:
+                    print(f"         📌 {diagnostic.hint}")
 
-            if len(errors) > 5:
-                print(f"  ... و {len(errors) - 5} خطای دیگر")
+            if error_count > 5:
+                print(f"  ... و {error_count - 5} خطای دیگر")
 
     except Exception as e:
         print(f"❌ خطا در خواندن فایل: {e}")
@@ -399,6 +376,8 @@ def option_shift_reduce():
 
 def option_run_tests():
     """گزینه 6: اجرای تست‌ها"""
+    from cache_parser import parse_instruction
+
     print_header("اجرای تست‌های خودکار")
 
     print("\n🧪 در حال اجرای تست‌ها...\n")
@@ -522,6 +501,8 @@ def option_show_grammar():
 
 def option_interactive():
     """گزینه 8: حالت تعاملی"""
+    from cache_parser import parse_instruction
+
     print_header("حالت تعاملی (Interactive)")
 
     print("""
@@ -542,7 +523,7 @@ def option_interactive():
         ast = parse_instruction(code, debug=False)
 
         if ast:
-            print(f"✅ {ast.mnemonic} - دسته: {ast.get_instruction_category()}")
+            print(f"✅ {ast.mnemonic} - دسته: {ast.category}")
             if ast.operand:
                 print(f"   Operand: {ast.operand}")
         else:
@@ -553,6 +534,8 @@ def option_interactive():
 
 def option_show_automata():
     """گزینه 9: نمایش Automata"""
+    from pathlib import Path
+
     print_header("نمودار Automata")
 
     print("\n🔍 اطلاعات اتوماتا LR(0):")
@@ -607,9 +590,14 @@ def option_show_automata():
 
 def option_about():
     """گزینه 10: درباره"""
+    from instruction_set import CATEGORY_LABEL, mnemonics_by_category
+
     print_header("درباره پروژه")
 
-    about = """
+    supported = "\n".join(f"  {CATEGORY_LABEL[category] + ':':<16} {', '.join(names)}"
+                          for category, names in mnemonics_by_category().items())
+
+    about = f"""
 ╔══════════════════════════════════════════════════════════════════╗
 ║         Cache Control Instructions Parser                        ║
 ║                   تحلیل‌گر دستورات کنترل کش                       ║
@@ -657,10 +645,7 @@ def option_about():
 
 📦 دستورات پشتیبانی شده:
 
-  Cache Flush:     CLFLUSH, CLFLUSHOPT
-  Cache WriteBack: CLWB
-  Cache Prefetch:  PREFETCHT0, PREFETCHT1, PREFETCHT2, PREFETCHNTA
-  Cache Invalid:   WBINVD, INVD
+{supported}
 
 ═══════════════════════════════════════════════════════════════════
 """
@@ -671,6 +656,9 @@ def option_about():
 
 def option_clean_cache():
     """پاک‌سازی کش"""
+    import shutil
+    from pathlib import Path
+
     print_header("پاک‌سازی فایل‌های کش")
 
     print("\n🧹 در حال پاک‌سازی...\n")
@@ -689,6 +677,20 @@ def option_clean_cache():
                 print(f"✅ حذف شد: {item}")
             removed += 1
 
+    # جدول‌های پارس ذخیره‌شده خارج از پوشه‌ی پروژه
+    from cache_parser import clear_table_cache, table_cache_dir
+    tables = clear_table_cache()
+    if tables:
+        print(f"✅ حذف شد: {tables} جدول از {table_cache_dir()}")
+        removed += tables
+
+    # نتایج پارس فایل‌ها (parse_file با cache=True)
+    from result_cache import clear_result_cache, result_cache_dir
+    results = clear_result_cache()
+    if results:
+        print(f"✅ حذف شد: {results} نتیجه از {result_cache_dir()}")
+        removed += results
+
     if removed == 0:
         print("💡 فایل کشی برای پاک‌سازی یافت نشد")
     else:
@@ -747,8 +749,41 @@ def option_help():
 #                          Main Loop
 # ═══════════════════════════════════════════════════════════════════
 
+def parse_args(argv):
+    """گزینه‌های خط فرمان"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Cache Control Instructions Parser")
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help="تعداد پروسه‌های پارس فایل (0 = تعداد هسته‌ها)")
+    parser.add_argument('-w', '--watch', metavar='FILE',
+                        help="پارس افزایشی FILE با هر ذخیره (بدون منو، خروج با Ctrl+C)")
+    return parser.parse_args(argv)
+
+
+def run_watch(filename):
+    """حالت watch: پارس دوباره‌ی فقط خطوط تغییرکرده با هر ذخیره‌ی فایل"""
+    from incremental import watch
+
+    def report(incremental, changed, seconds):
+        first_line, removed, added = changed
+        print(f"\n🔄 {filename}: از خط {first_line}، {removed} خط حذف و {added} خط پارس شد "
+              f"({seconds * 1000:.1f} ms)")
+        print(f"  ✓ موفق: {len(incremental.results)} دستور")
+        print(f"  ✗ خطا: {len(incremental.diagnostics)}")
+        for diagnostic in incremental.diagnostics[:5]:
+            print(f"  خط {diagnostic.line:3d}: {diagnostic.source}")
+            print(f"         → {diagnostic.message}")
+        if len(incremental.diagnostics) > 5:
+            print(f"  ... و {len(incremental.diagnostics) - 5} خطای دیگر")
+
+    print(f"👀 در حال نظارت بر {filename} (خروج با Ctrl+C)")
+    watch(filename, report)
+
+
 def main():
     """حلقه اصلی برنامه"""
+    from cache_parser import parse_instruction
 
     # نمایش بنر
     print_banner()
@@ -821,8 +856,13 @@ def main():
 # ═══════════════════════════════════════════════════════════════════
 
 if __name__ == "__main__":
+    args = parse_args(sys.argv[1:])
+    PARSE_JOBS = args.jobs
     try:
-        main()
+        if args.watch:
+            run_watch(args.watch)
+        else:
+            main()
     except KeyboardInterrupt:
         print("\n\n👋 خروج با Ctrl+C")
         sys.exit(0)
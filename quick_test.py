@@ -89,11 +89,11 @@ def main():
     # فرمت: (نام تست، کد اسمبلی، نام دستور مورد انتظار، افست مورد انتظار)
     tests = [
         ("دستور ساده", "CLFLUSH [EAX]", "CLFLUSH", None),
-        ("دستور با Offset مثبت", "CLFLUSHOPT [EBX+16]", "CLFLUSHOPT", "+16"),
-        ("دستور با Offset منفی", "PREFETCHT0 [ECX-8]", "PREFETCHT0", "-8"),
+        ("دستور با Offset مثبت", "CLFLUSHOPT [EBX+16]", "CLFLUSHOPT", 16),
+        ("دستور با Offset منفی", "PREFETCHT0 [ECX-8]", "PREFETCHT0", -8),
         ("دستور بدون Operand", "WBINVD", "WBINVD", None),
         ("دستور با Label", "CLWB [cache_line]", "CLWB", None),
-        ("دستور 64 بیتی", "PREFETCHNTA [RAX+128]", "PREFETCHNTA", "+128"),
+        ("دستور 64 بیتی", "PREFETCHNTA [RAX+128]", "PREFETCHNTA", 128),
     ]
     
     passed = 0
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+cache نتیجه‌ی پارس فایل‌ها روی دیسک
+Content-Addressed Result Cache
+تیم 15 - پروژه کامپایلر - دانشگاه شهید باهنر کرمان
+
+نتیجه‌ی parse_file با کلید hash محتوای فایل و اثر انگشت گرامر ذخیره می‌شود.
+دستورات به‌صورت ستون‌های InstructionTable (آرایه‌های فشرده) و با marshal
+نوشته می‌شوند؛ فایل بدون تغییر در اجرای بعدی بدون پارس بارگذاری می‌شود و
+هر تغییری در محتوا، گرامر یا lexer یک کلید جدید می‌سازد.
+"""
+
+import hashlib
+import marshal
+import os
+import threading
+
+from cache_parser import (
+    get_parser, parse_file_parallel, grammar_fingerprint, table_cache_dir,
+    _source_line, source_lines, START_PROGRAM,
+)
+from cache_lexer import lexer_fingerprint
+from diagnostics import Diagnostic
+from instruction_table import InstructionTable
+
+
+# نسخه‌ی قالب فایل - با تغییر نحوه‌ی ذخیره‌سازی افزایش یابد
+RESULT_CACHE_VERSION = 2
+
+MAGIC = b'CPRC'
+
+
+def result_cache_dir():
+    """پوشه‌ی cache نتایج (زیرپوشه‌ی table_cache_dir)"""
+    return os.path.join(table_cache_dir(), 'results')
+
+
+def result_key(text):
+    """
+    کلید یک فایل: hash محتوا، اثر انگشت گرامر و lexer و نسخه‌ی قالب
+
+    Args:
+        text: متن فایل (پس از تبدیل پایان خطوط)
+    """
+    h = hashlib.sha256()
+    h.update(f"v{RESULT_CACHE_VERSION}:{marshal.version}:{grammar_fingerprint(START_PROGRAM)}:"
+             f"{lexer_fingerprint()}\n".encode())
+    h.update(text.encode('utf-8'))
+    return h.hexdigest()
+
+
+def _result_path(key):
+    return os.path.join(result_cache_dir(), f"{key}.bin")
+
+
+# ═══════════════════════════════════════════════════════════════════
+#                          ذخیره و بارگذاری
+# ═══════════════════════════════════════════════════════════════════
+
+def save_result(key, program, diagnostics):
+    """
+    ذخیره‌ی اتمیک نتیجه‌ی پارس (فایل موقت و os.replace)
+
+    Returns:
+        True در صورت موفقیت (پوشه‌ی غیرقابل نوشتن یا نتیجه‌ی غیرقابل رمزگذاری
+        خطا نیست - فقط cache نمی‌شود)
+    """
+    try:
+        table = InstructionTable.from_instructions(program)
+        payload = (
+            tuple(getattr(table, name).tobytes() for name in InstructionTable.COLUMNS),
+            tuple(table.registers),
+            tuple(table.identifiers),
+            tuple(table.big_offsets.items()),
+            tuple((d.line, d.column, d.token_type, d.value, tuple(d.expected), d.suggestion) for d in diagnostics),
+        )
+        data = marshal.dumps(payload)
+    except (OverflowError, ValueError, TypeError):
+        return False
+
+    path = _result_path(key)
+    tmpfile = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmpfile, 'wb') as f:
+            f.write(MAGIC)
+            f.write(data)
+        os.replace(tmpfile, path)
+        return True
+    except OSError:
+        return False
+    finally:
+        if os.path.exists(tmpfile):
+            os.remove(tmpfile)
+
+
+def load_result(key):
+    """
+    بارگذاری نتیجه‌ی ذخیره‌شده
+
+    فایل خراب (ستون ناهم‌طول، اندیس خارج از محدوده، رکورد ناقص) یک miss است و
+    حذف می‌شود تا پارس بعدی دوباره آن را بنویسد.
+
+    Returns:
+        (program, diagnostics) یا None اگر موجود یا معتبر نباشد
+    """
+    path = _result_path(key)
+    try:
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError("magic نامعتبر")
+            columns, registers, identifiers, big_offsets, records = marshal.load(f)
+
+        table = InstructionTable()
+        for name, data in zip(InstructionTable.COLUMNS, columns):
+            getattr(table, name).frombytes(data)
+        if len({len(getattr(table, name)) for name in InstructionTable.COLUMNS}) != 1:
+            raise ValueError("طول ستون‌ها یکسان نیست")
+        table.registers = list(registers)
+        table.identifiers = list(identifiers)
+        table.big_offsets = dict(big_offsets)
+
+        program = list(table)
+        diagnostics = [Diagnostic(*record) for record in records]
+    except OSError:
+        return None
+    except (EOFError, ValueError, TypeError, IndexError, KeyError):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        return None
+    return program, diagnostics
+
+
+def clear_result_cache():
+    """
+    حذف همه‌ی نتایج ذخیره‌شده
+
+    Returns:
+        تعداد فایل‌های حذف‌شده
+    """
+    cache_dir = result_cache_dir()
+    removed = 0
+    if os.path.isdir(cache_dir):
+        for name in os.listdir(cache_dir):
+            if name.endswith('.bin'):
+                os.remove(os.path.join(cache_dir, name))
+                removed += 1
+    return removed
+
+
+# ═══════════════════════════════════════════════════════════════════
+#                          پارس با cache
+# ═══════════════════════════════════════════════════════════════════
+
+def parse_file_cached(filename, debug=False, table=None, jobs=1):
+    """
+    parse_file با cache نتایج روی دیسک
+
+    فایل‌های بدون تغییر (همان محتوا و همان گرامر) بدون پارس بارگذاری می‌شوند
+    و فقط فایل‌های جدید یا تغییرکرده پارس و ذخیره می‌شوند.
+
+    Returns:
+        مثل parse_file: (results, diagnostics) یا None اگر فایل پیدا نشود
+    """
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            text = f.read()
+    except FileNotFoundError:
+        print(f"❌ فایل '{filename}' پیدا نشد")
+        return None
+
+    key = result_key(text)
+    cached = None if debug else load_result(key)
+
+    if cached is not None:
+        program, diagnostics = cached
+    elif jobs != 1:
+        results, diagnostics = parse_file_parallel(filename, jobs)
+        program = [ast for _, _, ast in results]
+        save_result(key, program, diagnostics)
+    else:
+        parser = get_parser()
+        program = parser.parse_program(text, debug=debug)
+        diagnostics = parser.diagnostics
+        save_result(key, program, diagnostics)
+
+    if table is not None:
+        for ast in program:
+            table.append(ast)
+
+    lines = source_lines(text)
+    results = [(ast.lineno, _source_line(lines[ast.lineno - 1]), ast) for ast in program]
+    for diagnostic in diagnostics:
+        if 0 < diagnostic.line <= len(lines):
+            diagnostic.source = _source_line(lines[diagnostic.line - 1])
+
+    return results, diagnostics
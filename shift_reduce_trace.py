@@ -8,8 +8,242 @@
 نسخه نهایی - ژانویه 2026
 """
 
-from cache_lexer import build_lexer
-from lr_tables import LR_PARSING_TABLE, GRAMMAR_RULES
+from cache_parser import get_parser
+from lr_tables import GRAMMAR_RULES
+from instruction_set import NO_OPERAND_MNEMONICS
+from lr_driver import (
+    ACTION, GOTO, ACCEPT, N_TERMINALS, N_NONTERMINALS, TERMINAL_ID, END_ID,
+    NONTERMINALS, RULE_LEN, RULE_LHS, OPERAND_STATE,
+)
+
+
+LBRACKET_ID = TERMINAL_ID['LBRACKET']
+NO_OPERAND_IDS = frozenset(TERMINAL_ID[mnemonic] for mnemonic in NO_OPERAND_MNEMONICS)
+
+
+# ═════════════════════════════════════════════════════════════════════
+# رکوردهای فشرده‌ی مراحل
+# ═════════════════════════════════════════════════════════════════════
+
+# کد عملیات هر مرحله
+STEP_START = 0
+STEP_SHIFT = 1
+STEP_REDUCE = 2
+STEP_ACCEPT = 3
+STEP_ERROR = 4        # Action تعریف نشده
+STEP_GOTO_ERROR = 5   # Goto نامعتبر بعد از reduce
+
+STEP_ACTIONS = {
+    STEP_START: "شروع پارسینگ",
+    STEP_SHIFT: "Shift",
+    STEP_REDUCE: "Reduce",
+    STEP_ACCEPT: "Accept",
+    STEP_ERROR: "❌ خطا: Action تعریف نشده",
+    STEP_GOTO_ERROR: "❌ خطا",
+}
+
+
+class Trace:
+    """
+    مراحل یک trace به صورت رکوردهای فشرده
+
+    هر مرحله یک tuple (depth، action، arg، index) است: عمق پشته‌ی state ها بعد
+    از مرحله، کد عملیات (STEP_*)، آرگومان (state مقصد برای shift، شماره قانون
+    برای reduce، state جاری برای خطا) و اندیس اولین توکن باقی‌مانده. متن
+    پشته و ورودی (جدول چاپی یا دیکشنری هر مرحله) فقط هنگام دسترسی و با
+    اجرای دوباره‌ی رکوردها در زمان خطی ساخته می‌شود.
+
+    دسترسی به مراحل مثل لیست دیکشنری‌های قبلی است
+    (step، stack، input، action، rule).
+    """
+
+    def __init__(self, tokens, records):
+        self.tokens = tokens      # (type, value) ها با ('$', '$') در انتها
+        self.records = records
+
+    def __len__(self):
+        return len(self.records)
+
+    def __iter__(self):
+        for step, stack, index in self._replay():
+            yield self._step_dict(step, stack, index)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            # یک بار اجرا تا آخرین مرحله‌ی خواسته‌شده؛ متن فقط برای همان مراحل
+            wanted = range(*index.indices(len(self)))
+            if not wanted:
+                return []
+            picked = {}
+            for step, stack, position in self._replay(max(wanted[0], wanted[-1]) + 1):
+                if position in wanted:
+                    picked[position] = self._step_dict(step, stack, position)
+            return [picked[i] for i in wanted]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        for step, stack, position in self._replay(index + 1):
+            pass
+        return self._step_dict(step, stack, position)
+
+    @property
+    def accepted(self):
+        """آیا آخرین مرحله پذیرش است"""
+        return bool(self.records) and self.records[-1][1] == STEP_ACCEPT
+
+    @property
+    def first_step(self):
+        """دیکشنری مرحله‌ی اول (بدون اجرای بقیه‌ی مراحل)"""
+        return self[0]
+
+    @property
+    def last_step(self):
+        """دیکشنری مرحله‌ی آخر (یک بار اجرای رکوردها)"""
+        return self[-1]
+
+    def rules_used(self):
+        """شماره قوانین reduce شده به ترتیب اولین استفاده"""
+        return list(dict.fromkeys(arg for _, action, arg, _ in self.records if action == STEP_REDUCE))
+
+    def _replay(self, count=None):
+        """
+        اجرای دوباره‌ی رکوردها روی پشته‌ی نمادها
+
+        Yields:
+            (شماره مرحله، پشته‌ی نمادها، اندیس رکورد) - پشته همان لیست است
+            و در مرحله‌ی بعد تغییر می‌کند
+        """
+        tokens = self.tokens
+        stack = ['$']
+        for i, (_, action, arg, index) in enumerate(self.records[:count]):
+            if action == STEP_SHIFT:
+                stack.append(str(tokens[index - 1][1]))
+            elif action == STEP_REDUCE:
+                if RULE_LEN[arg]:
+                    del stack[-RULE_LEN[arg]:]
+                stack.append(NONTERMINALS[RULE_LHS[arg]])
+            yield i + 1, stack, i
+
+    def _input_text(self, index, width=None):
+        """ورودی باقی‌مانده از توکن index (با width فقط همان تعداد کاراکتر ساخته می‌شود)"""
+        tokens = self.tokens
+        parts = []
+        length = -1
+        for i in range(index, len(tokens)):
+            token_type, value = tokens[i]
+            text = str(value) if value else token_type
+            parts.append(text)
+            length += len(text) + 1
+            if width is not None and length >= width:
+                break
+        text = ' '.join(parts)
+        return text if width is None else text[:width]
+
+    @staticmethod
+    def _stack_text(stack, width=None):
+        """متن پشته‌ی نمادها (با width فقط پایین پشته)"""
+        if width is None:
+            return ' '.join(stack)
+        parts = []
+        length = -1
+        for symbol in stack:
+            parts.append(symbol)
+            length += len(symbol) + 1
+            if length >= width:
+                break
+        return ' '.join(parts)[:width]
+
+    def _rule_text(self, position):
+        _, action, arg, index = self.records[position]
+        if action == STEP_SHIFT:
+            return f"انتقال {self.tokens[index - 1][0]} → State {arg}"
+        if action == STEP_REDUCE:
+            return f"R{arg}: {GRAMMAR_RULES[arg]}"
+        if action == STEP_ACCEPT:
+            return "✅ پذیرش"
+        if action == STEP_ERROR:
+            return f"State={arg}, Token={self.tokens[index][0]}"
+        if action == STEP_GOTO_ERROR:
+            return f"Goto نامعتبر ({arg}, {NONTERMINALS[self.records[position - 1][2]]})"
+        return ""
+
+    def _step_dict(self, step, stack, position):
+        return {
+            'step': step,
+            'stack': self._stack_text(stack),
+            'input': self._input_text(self.records[position][3]),
+            'action': STEP_ACTIONS[self.records[position][1]],
+            'rule': self._rule_text(position),
+        }
+
+    def rows(self, stack_width=None, input_width=None):
+        """
+        سطرهای جدول (step، stack، input، action، rule) با متن کوتاه‌شده
+
+        با عرض محدود، هزینه‌ی هر سطر مستقل از طول ورودی است.
+        """
+        for step, stack, position in self._replay():
+            yield (step, self._stack_text(stack, stack_width),
+                   self._input_text(self.records[position][3], input_width),
+                   STEP_ACTIONS[self.records[position][1]], self._rule_text(position))
+
+
+def run_table(terminals, state_hits=None):
+    """
+    اجرای جدول LR روی شناسه‌ی ترمینال‌ها و ساخت رکوردهای فشرده‌ی مراحل
+
+    هر مرحله O(1) است (بدون ساخت متن پشته یا ورودی). مثل LRDriver در state
+    بعد از mnemonic فقط '[' (mnemonic نیازمند operand) یا پایان (mnemonic بدون
+    operand) پذیرفته می‌شود؛ در غیر این صورت مرحله STEP_ERROR است.
+
+    Args:
+        terminals: شناسه‌های TERMINAL_ID با END_ID در انتها (None = توکن ناشناخته)
+        state_hits: لیست شمارنده (اندیس = state) برای پوشش state ها (اختیاری)
+
+    Returns:
+        لیست رکوردهای (depth، action، arg، index)
+    """
+    records = [(1, STEP_START, 0, 0)]
+    append = records.append
+    stack = [0]
+    index = 0
+
+    while True:
+        state = stack[-1]
+        if state_hits is not None:
+            state_hits[state] += 1
+        terminal = terminals[index]
+        action = 0 if terminal is None else ACTION[state * N_TERMINALS + terminal]
+        if state == OPERAND_STATE and terminal != (END_ID if terminals[index - 1] in NO_OPERAND_IDS else LBRACKET_ID):
+            action = 0
+
+        if action == ACCEPT:
+            append((len(stack), STEP_ACCEPT, 0, index))
+            break
+
+        if action > 0:
+            stack.append(action)
+            index += 1
+            append((len(stack), STEP_SHIFT, action, index))
+
+        elif action < 0:
+            rule = -action
+            if RULE_LEN[rule]:
+                del stack[-RULE_LEN[rule]:]
+            goto_state = stack[-1]
+            next_state = GOTO[goto_state * N_NONTERMINALS + RULE_LHS[rule]]
+            if not next_state:
+                append((len(stack), STEP_GOTO_ERROR, goto_state, index))
+                break
+            stack.append(next_state)
+            append((len(stack), STEP_REDUCE, rule, index))
+
+        else:
+            append((len(stack), STEP_ERROR, state, index))
+            break
+
+    return records
 
 
 # ═════════════════════════════════════════════════════════════════════
@@ -19,11 +253,16 @@ from lr_tables import LR_PARSING_TABLE, GRAMMAR_RULES
 class ShiftReduceTracer:
     """تحلیل‌گر گام‌به‌گام Shift-Reduce"""
 
-    def __init__(self):
-        # ساخت lexer
-        self.lexer = build_lexer()
+    def __init__(self, diagnostics=None):
+        """
+        Args:
+            diagnostics: لیستی که خطاهای lexer (کاراکتر غیرمجاز) در آن ثبت می‌شوند؛
+                         بدون آن خطاها چاپ می‌شوند
+        """
+        # کپی از lexer مشترک (بدون ساخت دوباره‌ی regex ها)
+        self.lexer = get_parser().lexer.clone()
+        self.lexer.diagnostics = diagnostics
         self.steps = []
-        self.step_counter = 0
 
     def tokenize(self, instruction_text):
         """
@@ -35,6 +274,7 @@ class ShiftReduceTracer:
         Returns:
             list: لیست توکن‌ها به صورت (type, value)
         """
+        self.lexer.lineno = 1
         self.lexer.input(instruction_text)
         tokens = []
 
@@ -54,136 +294,28 @@ class ShiftReduceTracer:
             instruction_text (str): دستور ورودی
 
         Returns:
-            list: لیست مراحل پارسینگ
+            Trace: مراحل پارسینگ (یا [{'error': ...}] اگر توکنی نباشد)
         """
-        self.steps = []
-        self.step_counter = 0
-
-        try:
-            # Tokenize
-            tokens = self.tokenize(instruction_text)
-
-            if not tokens:
-                return [{'error': 'توکن‌سازی ناموفق بود'}]
-
-            # Add end marker
+        tokens = self.tokenize(instruction_text)
+        if not tokens:
+            self.steps = [{'error': 'توکن‌سازی ناموفق بود'}]
+        else:
             tokens.append(('$', '$'))
+            self.steps = self.trace_tokens(tokens)
+        return self.steps
 
-            # Initialize
-            stack = [0]  # State stack
-            symbol_stack = ['$']  # Symbol stack for display
-            token_index = 0
-
-            # Format initial input - ✅ تصحیح شده: تبدیل همه به string
-            input_str = ' '.join([str(t[1]) for t in tokens])
-
-            self._add_step(stack, symbol_stack, tokens, token_index,
-                           "شروع پارسینگ", "")
-
-            while True:
-                current_state = stack[-1]
-                current_token_type, current_token_value = tokens[token_index]
-
-                # Get action from table
-                action = LR_PARSING_TABLE.get(current_state, {}).get(current_token_type)
-
-                if not action:
-                    self._add_step(stack, symbol_stack, tokens, token_index,
-                                   f"❌ خطا: Action تعریف نشده",
-                                   f"State={current_state}, Token={current_token_type}")
-                    break
-
-                # SHIFT
-                if isinstance(action, str) and action.startswith('s'):
-                    next_state = int(action[1:])
-                    stack.append(next_state)
-                    # ✅ تبدیل به string برای نمایش
-                    symbol_stack.append(str(current_token_value))
-                    token_index += 1
-
-                    self._add_step(stack, symbol_stack, tokens, token_index,
-                                   f"Shift",
-                                   f"انتقال {current_token_type} → State {next_state}")
-
-                # REDUCE
-                elif isinstance(action, str) and action.startswith('r'):
-                    rule_num = int(action[1:])
-                    rule = GRAMMAR_RULES[rule_num]
-
-                    # Parse rule: "LHS -> RHS"
-                    lhs, rhs = rule.split(' -> ')
-                    rhs_symbols = rhs.split() if rhs != 'ε' else []
-
-                    # Pop from stack
-                    pop_count = len(rhs_symbols)
-                    if pop_count > 0:
-                        for _ in range(pop_count):
-                            stack.pop()
-                            symbol_stack.pop()
-
-                    # Get goto state
-                    goto_state = stack[-1]
-                    goto_action = LR_PARSING_TABLE.get(goto_state, {}).get(lhs)
-
-                    # ✅ تصحیح: بررسی نوع int (نه string!)
-                    if goto_action is not None and isinstance(goto_action, int):
-                        next_state = goto_action
-                        stack.append(next_state)
-                        symbol_stack.append(lhs)
-
-                        self._add_step(stack, symbol_stack, tokens, token_index,
-                                       f"Reduce",
-                                       f"R{rule_num}: {rule}")
-                    else:
-                        self._add_step(stack, symbol_stack, tokens, token_index,
-                                       f"❌ خطا",
-                                       f"Goto نامعتبر ({goto_state}, {lhs})")
-                        break
-
-                # ACCEPT
-                elif action == 'acc':
-                    self._add_step(stack, symbol_stack, tokens, token_index,
-                                   "Accept",
-                                   "✅ پذیرش")
-                    break
-
-                else:
-                    self._add_step(stack, symbol_stack, tokens, token_index,
-                                   f"❌ خطا",
-                                   f"Action نامعتبر: {action}")
-                    break
-
-            return self.steps
-
-        except Exception as e:
-            import traceback
-            traceback.print_exc()
-            return [{'error': f'خطا در تحلیل: {str(e)}'}]
-
-    def _add_step(self, stack, symbol_stack, tokens, token_index, action, rule=''):
-        """اضافه کردن یک مرحله به trace"""
-        self.step_counter += 1
-
-        # Format stack display
-        stack_display = ' '.join(str(s) for s in symbol_stack)
-
-        # Format remaining input - ✅ تصحیح شده: تبدیل به string
-        remaining = []
-        for i in range(token_index, len(tokens)):
-            token_type, token_val = tokens[i]
-            # تبدیل همه مقادیر به string
-            remaining.append(str(token_val) if token_val else token_type)
-        input_str = ' '.join(remaining)
-
-        step = {
-            'step': self.step_counter,
-            'stack': stack_display,
-            'input': input_str,
-            'action': action,
-            'rule': rule
-        }
+    @staticmethod
+    def trace_tokens(tokens):
+        """
+        اجرای جدول LR روی توکن‌ها و ثبت رکورد فشرده‌ی هر مرحله
 
-        self.steps.append(step)
+        Args:
+            tokens: لیست (type, value) با ('$', '$') در انتها
+
+        Returns:
+            Trace
+        """
+        return Trace(tokens, run_table([TERMINAL_ID.get(token_type) for token_type, _ in tokens]))
 
     def print_trace(self, steps):
         """چاپ trace به صورت جدول"""
@@ -193,7 +325,7 @@ class ShiftReduceTracer:
             return
 
         # Check for error
-        if 'error' in steps[0]:
+        if not isinstance(steps, Trace):
             print(f"\n❌ {steps[0]['error']}\n")
             return
 
@@ -204,22 +336,15 @@ class ShiftReduceTracer:
         print(header)
         print("─" * 100)
 
-        # Rows
-        for step in steps:
-            step_num = step.get('step', '')
-            stack = step.get('stack', '')[:28]
-            input_str = step.get('input', '')[:23]
-            action = step.get('action', '')[:13]
-            rule = step.get('rule', '')[:18]
-
-            row = f"{step_num:<8} | {stack:<30} | {input_str:<25} | {action:<15} | {rule:<20}"
+        # Rows - متن هر سطر فقط تا عرض ستون ساخته می‌شود
+        for step_num, stack, input_str, action, rule in steps.rows(28, 23):
+            row = f"{step_num:<8} | {stack:<30} | {input_str:<25} | {action[:13]:<15} | {rule[:18]:<20}"
             print(row)
 
         print("─" * 100)
 
         # Summary
-        final_step = steps[-1]
-        if '✅' in final_step.get('rule', '') or 'Accept' in final_step.get('action', ''):
+        if steps.accepted:
             print("✅ پارس موفق - دستور معتبر است\n")
         else:
             print("❌ پارس ناموفق - دستور نامعتبر است\n")
@@ -248,21 +373,13 @@ def trace_shift_reduce(instruction):
     tracer.print_trace(steps)
 
     # Show grammar rules used
-    if steps and 'error' not in steps[0]:
+    if isinstance(steps, Trace):
         print("─" * 100)
         print("📜 قوانین گرامر استفاده شده:")
         print("─" * 100)
 
-        rules_used = []
-        for step in steps:
-            rule_text = step.get('rule', '')
-            if rule_text.startswith('R') and ':' in rule_text:
-                rule_line = rule_text.split(':')[0].strip()
-                if rule_line not in rules_used:
-                    rules_used.append(rule_line)
-
-        for rule_line in rules_used:
-            print(f"  • {rule_line}")
+        for rule_num in steps.rules_used():
+            print(f"  • R{rule_num}")
 
     print("═" * 100 + "\n")
 
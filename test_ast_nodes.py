@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+تست گره‌های AST (__slots__ و نمونه‌های یکتا)
+AST Node Test
+"""
+
+import pickle
+
+from cache_lexer import tokens
+from cache_parser import parse_instruction, analyze_instruction, Instruction, MemoryOperand, Register, Identifier
+from instruction_set import INSTRUCTION_SET, MNEMONICS, OPERAND_MNEMONICS, lookup
+
+
+def test_slots():
+    """گره‌ها __dict__ ندارند و type ویژگی کلاس است"""
+    ast = parse_instruction("CLFLUSHOPT [EBX+16]")
+
+    for node in (ast, ast.operand, ast.operand.base):
+        assert not hasattr(node, '__dict__'), type(node).__name__
+    assert (ast.type, ast.operand.type, ast.operand.base.type) == ('Instruction', 'MemoryOperand', 'Register')
+
+
+def test_interned_nodes():
+    """Register و Identifier با نام یکسان یک شیء هستند"""
+    first = parse_instruction("CLFLUSH [RAX]")
+    second = parse_instruction("CLWB [RAX-8]")
+    assert first.operand.base is second.operand.base
+    assert Register('RAX') is first.operand.base
+    assert Register('RAX').bit_width == 64 and Register('EAX').bit_width == 32
+
+    assert Identifier('cache_line') is parse_instruction("CLWB [cache_line]").operand.base
+    assert Identifier('cache_line') is not Register('RAX')
+
+
+def test_pickle_keeps_interning():
+    """بعد از pickle هم Register ها یکتا می‌مانند"""
+    ast = Instruction('CLWB', MemoryOperand(Register('R8'), 64), lineno=3)
+    copy = pickle.loads(pickle.dumps(ast))
+
+    assert repr(copy) == repr(ast)
+    assert copy.lineno == 3
+    assert copy.operand.base is Register('R8')
+
+
+def test_integer_offsets():
+    """offset عدد صحیح علامت‌دار است و فقط هنگام نمایش به متن تبدیل می‌شود"""
+    plus = parse_instruction("CLFLUSHOPT [EBX+16]").operand
+    minus = parse_instruction("PREFETCHT0 [ECX-8]").operand
+    zero = parse_instruction("CLWB [EAX+0]").operand
+
+    assert (plus.offset, minus.offset, zero.offset) == (16, -8, 0)
+    assert (plus.offset_text, minus.offset_text, zero.offset_text) == ('+16', '-8', '+0')
+    assert repr(minus) == "Memory([ECX-8])"
+    assert parse_instruction("CLWB [EAX]").operand.offset is None
+
+    steps = parse_instruction("PREFETCHT0 [ECX-8]").derivation_steps()
+    assert steps[-1] == "→ PREFETCHT0 [ ECX - 8 ]"
+
+
+
+def test_mnemonic_metadata():
+    """دسته و اطلاعات mnemonic هنگام ساخت Instruction از جدول instruction_set گرفته می‌شود"""
+    ast = parse_instruction("PREFETCHT1 [ESI]")
+    assert ast.info is INSTRUCTION_SET['PREFETCHT1']
+    assert ast.category == ast.get_instruction_category() == 'prefetch'
+    assert analyze_instruction(ast)['description'] == 'Cache Prefetch - پیش‌خوانی داده'
+    assert ast.full_parse_tree()[2] == "│   └── CachePrefetch"
+
+    assert Instruction('MOV').category == 'unknown'
+    assert lookup('WBINVD').requires_operand is False
+    assert OPERAND_MNEMONICS == set(MNEMONICS) - {'WBINVD', 'INVD'}
+    assert tokens[:len(MNEMONICS)] == MNEMONICS
+    assert pickle.loads(pickle.dumps(ast)).info is ast.info
+
+
+if __name__ == "__main__":
+    tests = [
+        test_slots,
+        test_interned_nodes,
+        test_pickle_keeps_interning,
+        test_integer_offsets,
+        test_mnemonic_metadata,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__doc__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__doc__} {e}")
+
+    print(f"\n📊 نتیجه: {passed} موفق، {len(tests) - passed} ناموفق")
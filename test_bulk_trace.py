@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+تست trace دسته‌ای فایل‌ها
+Bulk Trace Export Test
+"""
+
+import csv
+import io
+import json
+import os
+import tempfile
+
+from bulk_trace import (trace_buffer, trace_files, load_trace, open_trace_output, TRACE_WRITERS,
+                        FORMAT_CSV, FORMAT_JSONL, FORMAT_BINARY)
+from shift_reduce_trace import ShiftReduceTracer
+
+
+def test_same_steps_as_tracer():
+    """رکوردهای هر خط همان رکوردهای ShiftReduceTracer برای آن دستور است"""
+    text = "; کامنت\nCLFLUSH [EAX]\n\nCLWB [RCX-8]  ; x\nCLFLUSH EAX\nWBINVD"
+    out = io.StringIO()
+    coverage = trace_buffer(text.encode(), 'a.asm', TRACE_WRITERS[FORMAT_JSONL](out))
+
+    objects = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [(o['line'], o['accepted']) for o in objects] == [(2, True), (4, True), (5, False), (6, True)]
+
+    tracer = ShiftReduceTracer()
+    lines = text.split('\n')
+    for o in objects:
+        expected = tracer.trace(lines[o['line'] - 1]).records
+        assert [tuple(record) for record in o['records']] == expected, o['line']
+
+    summary = coverage.summary()
+    assert (summary['instructions'], summary['accepted'], summary['rejected']) == (4, 3, 1)
+    assert summary['steps'] == sum(o['steps'] for o in objects)
+    assert summary['rules'][13] == 2 and summary['rules'][2] == 1
+    assert 17 in summary['unused_rules'] and 18 not in summary['unused_rules']
+
+
+def test_export_formats():
+    """قالب‌های CSV، JSON Lines و باینری همان مراحل را دارند"""
+    files = ['examples/test_mixed.asm', 'examples/advanced_test.asm']
+    directory = tempfile.mkdtemp()
+    paths = {format: os.path.join(directory, f"steps.{format}") for format in (FORMAT_CSV, FORMAT_JSONL, FORMAT_BINARY)}
+    try:
+        for format, path in paths.items():
+            with open_trace_output(path, format) as out:
+                coverage, _, missing = trace_files(files + ['missing.asm'], out, format)
+            assert missing == ['missing.asm']
+
+        with open(paths[FORMAT_JSONL], encoding='utf-8') as f:
+            objects = [json.loads(line) for line in f]
+        with open(paths[FORMAT_CSV], encoding='utf-8', newline='') as f:
+            rows = list(csv.DictReader(f))
+        columns = load_trace(paths[FORMAT_BINARY])
+
+        assert len(objects) == coverage.instructions == len(columns['line'])
+        assert len(rows) == coverage.steps == len(columns['action'])
+        assert columns['files'] == files
+        assert [columns['files'][i] for i in columns['file']] == [o['file'] for o in objects]
+        assert list(columns['line']) == [o['line'] for o in objects]
+        assert list(columns['arg']) == [record[2] for o in objects for record in o['records']]
+        assert [row['action'] for row in rows[:3]] == ['start', 'shift', 'reduce']
+    finally:
+        for path in paths.values():
+            if os.path.exists(path):
+                os.remove(path)
+        os.rmdir(directory)
+
+
+def test_binary_wide_values():
+    """مقادیر بزرگ‌تر از 65535 در ستون‌های مراحل باینری حفظ می‌شوند"""
+    from shift_reduce_trace import STEP_START, STEP_SHIFT, STEP_ERROR
+
+    records = [(1, STEP_START, 0, 0), (70000, STEP_SHIFT, 66000, 1 << 20), (70000, STEP_ERROR, 70001, 1 << 20)]
+    fd, path = tempfile.mkstemp(suffix='.bin')
+    os.close(fd)
+    try:
+        with open_trace_output(path, FORMAT_BINARY) as out:
+            writer = TRACE_WRITERS[FORMAT_BINARY](out)
+            writer.write('long.asm', 100000, records)
+            writer.close()
+        columns = load_trace(path)
+        assert list(columns['line']) == [100000] and list(columns['accepted']) == [False]
+        assert list(zip(columns['depth'], columns['action'], columns['arg'], columns['index'])) == records
+    finally:
+        os.remove(path)
+
+
+def test_accepted_matches_check():
+    """accepted هر خط (با نگهبان operand) همان دستورات معتبر check است"""
+    import cacheparse
+    from shift_reduce_trace import STEP_ERROR
+
+    with open('examples/test_mixed.asm', encoding='utf-8') as f:
+        text = f.read() + "CLFLUSH\nWBINVD [EAX]\nCLWB\nINVD\nCLWB [RAX]\n"
+    fd, path = tempfile.mkstemp(suffix='.asm')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write(text)
+    try:
+        valid = [r['line'] for r in cacheparse.parse_records(path) if r['type'] == 'instruction']
+        out = io.StringIO()
+        coverage = trace_buffer(text.encode(), path, TRACE_WRITERS[FORMAT_JSONL](out))
+        objects = [json.loads(line) for line in out.getvalue().splitlines()]
+
+        assert [o['line'] for o in objects if o['accepted']] == valid
+        assert coverage.summary()['accepted'] == len(valid)
+        # رد با نگهبان: mnemonic بدون operand با '[' و mnemonic نیازمند operand با پایان
+        guarded = {o['line']: o['records'][-1][1] for o in objects[-5:]}
+        assert [guarded[line] == STEP_ERROR for line in sorted(guarded)] == [True, True, True, False, False]
+
+        buffer = io.BytesIO()
+        writer = TRACE_WRITERS[FORMAT_BINARY](buffer)
+        trace_buffer(text.encode(), path, writer)
+        writer.close()
+        binary = path + '.bin'
+        with open(binary, 'wb') as f:
+            f.write(buffer.getvalue())
+        columns = load_trace(binary)
+        os.remove(binary)
+        assert [line for line, flag in zip(columns['line'], columns['accepted']) if flag] == valid
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    tests = [
+        test_same_steps_as_tracer,
+        test_export_formats,
+        test_binary_wide_values,
+        test_accepted_matches_check,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__doc__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__doc__} {e}")
+
+    print(f"\n📊 نتیجه: {passed} موفق، {len(tests) - passed} ناموفق")
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+تست رابط خط فرمان batch
+cacheparse CLI Test
+"""
+
+import io
+import json
+import sys
+
+import cacheparse
+
+
+def _run(argv):
+    """اجرای cacheparse و برگرداندن (کد خروج، رکوردها)"""
+    out = io.StringIO()
+    previous = sys.stdout
+    sys.stdout = out
+    try:
+        code = cacheparse.main(argv)
+    finally:
+        sys.stdout = previous
+    return code, [json.loads(line) for line in out.getvalue().splitlines()]
+
+
+def test_parse_and_exit_codes():
+    """parse رکورد دستورات و خطاها را می‌دهد؛ کد خروج 0، 1 یا 2"""
+    code, records = _run(['parse', 'examples/test_mixed.asm'])
+    assert code == cacheparse.EXIT_SYNTAX_ERROR
+    assert sum(r['type'] == 'instruction' for r in records) == 15
+    assert sum(r['type'] == 'error' for r in records) == 9
+    assert [r['line'] for r in records] == sorted(r['line'] for r in records)
+
+    code, _ = _run(['parse', 'examples/advanced_test.asm'])
+    assert code == cacheparse.EXIT_OK
+
+    code, records = _run(['check', 'examples/does_not_exist_*.asm'])
+    assert code == cacheparse.EXIT_USAGE and records == []
+
+
+def test_check_globs_and_jobs():
+    """الگوهای glob و --jobs خروجی یکسان و مرتب (به ترتیب فایل) دارند"""
+    serial = _run(['check', 'examples/*.asm'])
+    parallel = _run(['check', 'examples/*.asm', '--jobs', '2'])
+
+    assert serial == parallel
+    summaries = [r for r in serial[1] if r['type'] == 'summary']
+    assert [r['file'] for r in summaries] == sorted(r['file'] for r in summaries)
+    assert [r['ok'] for r in summaries] == [True, True, False]
+
+
+def test_stdin_with_jobs():
+    """stdin با --jobs در همین پروسه خوانده می‌شود و خطاهایش گم نمی‌شوند"""
+    previous = sys.stdin
+    sys.stdin = io.StringIO("CLWB [RAX]\nCLFLUSH EAX\n")
+    try:
+        code, records = _run(['check', 'examples/advanced_test.asm', '-', '-j', '2'])
+    finally:
+        sys.stdin = previous
+
+    assert code == cacheparse.EXIT_SYNTAX_ERROR
+    assert [(r['file'], r['line']) for r in records if r['type'] == 'error'] == [('-', 2)]
+    summaries = [r for r in records if r['type'] == 'summary']
+    assert [(r['file'], r['instructions'], r['ok']) for r in summaries] == [
+        ('examples/advanced_test.asm', 90, True), ('-', 1, False)]
+
+
+def test_large_file_ranges():
+    """فایل بزرگ با --jobs بازه به بازه پارس می‌شود و خروجی همان اجرای سریال است"""
+    serial = _run(['parse', 'examples/test_mixed.asm', 'examples/advanced_test.asm'])
+    previous = cacheparse.PARALLEL_FILE_SIZE
+    cacheparse.PARALLEL_FILE_SIZE = 0
+    try:
+        assert _run(['parse', 'examples/test_mixed.asm', '-j', '2']) == _run(['parse', 'examples/test_mixed.asm'])
+        assert _run(['parse', 'examples/test_mixed.asm', 'examples/advanced_test.asm', '-j', '2']) == serial
+    finally:
+        cacheparse.PARALLEL_FILE_SIZE = previous
+
+
+def test_trace_agrees_with_check():
+    """trace خطاهای lexer را به‌صورت رکورد JSON می‌دهد و ok آن همان نتیجه‌ی check است"""
+    for code in ("CLFLUSH [EAX]@", "CLFLUSH", "WBINVD [EAX]", "CLWB [RAX]", "INVD", "CLWB [RAX] ; x"):
+        previous = sys.stdin
+        sys.stdin = io.StringIO(code + "\n")
+        try:
+            _, checked = _run(['check', '-'])
+        finally:
+            sys.stdin = previous
+        code_exit, records = _run(['trace', code])  # هر سطر stdout یک شیء JSON است
+
+        summary = records[-1]
+        assert summary['ok'] == checked[-1]['ok'], code
+        assert code_exit == (cacheparse.EXIT_OK if summary['ok'] else cacheparse.EXIT_SYNTAX_ERROR), code
+        assert summary['errors'] == sum(r['type'] == 'error' for r in records), code
+
+    _, records = _run(['trace', 'CLFLUSH [EAX]@'])
+    assert [(r['token_type'], r['value'], r['column']) for r in records if r['type'] == 'error'] == [('ILLEGAL', '@', 14)]
+
+
+def test_stats_trace_tables():
+    """stats، trace و tables"""
+    code, (stats,) = _run(['stats', 'examples/advanced_test.asm'])
+    assert code == 0 and stats['instructions'] == 90
+    assert sum(stats['categories'].values()) == 90
+
+    code, records = _run(['trace', 'CLWB [RAX]', 'CLWB RAX'])
+    assert code == cacheparse.EXIT_SYNTAX_ERROR
+    assert [r['ok'] for r in records if r['type'] == 'summary'] == [True, False]
+
+    code, records = _run(['tables'])
+    assert code == 0 and records[1]['action'] == {'$': 'acc'}
+
+
+if __name__ == "__main__":
+    tests = [
+        test_parse_and_exit_codes,
+        test_check_globs_and_jobs,
+        test_stdin_with_jobs,
+        test_large_file_ranges,
+        test_trace_agrees_with_check,
+        test_stats_trace_tables,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__doc__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__doc__} {e}")
+
+    print(f"\n📊 نتیجه: {passed} موفق، {len(tests) - passed} ناموفق")
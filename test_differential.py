@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+تست تفاضلی: parser PLY در برابر درایور جدول‌محور
+Differential Test - PLY vs LR Driver
+
+پیکره‌ی تصادفی دستورات از قوانین GRAMMAR_RULES مشتق می‌شود (معتبر) و با
+جهش توکن‌ها (حذف، تکرار، جابجایی، درج، کاراکتر غیرمجاز و ...) خراب می‌شود
+(نامعتبر). هر تکه‌ی پیکره در یک پروسه‌ی کارگر با ENGINE_PLY، ENGINE_LR و
+ENGINE_LALR پارس می‌شود و پذیرش/رد، AST و خطاها باید یکسان باشند.
+
+اجرا:
+    python test_differential.py                  # تست‌ها
+    python test_differential.py 200000 -j 4      # پیکره‌ی بزرگ و گزارش توان عملیاتی
+"""
+
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from cache_lexer import REGISTERS
+from cache_parser import CacheInstructionParser, ENGINE_PLY, ENGINE_LR, ENGINE_LALR
+from lr_tables import GRAMMAR_RULES
+
+
+ENGINES = (ENGINE_PLY, ENGINE_LR, ENGINE_LALR)
+
+# قوانین هر غیرترمینال: LHS → لیست RHS ها
+PRODUCTIONS = {}
+for _rule in GRAMMAR_RULES.values():
+    _lhs, _rhs = _rule.split(' -> ')
+    PRODUCTIONS.setdefault(_lhs, []).append(_rhs.split())
+
+REGISTER_NAMES = sorted(REGISTERS)
+IDENTIFIERS = ('cache_line', 'buf', 'data_0', '_tmp', 'x')
+SYMBOL_TEXT = {'LBRACKET': '[', 'RBRACKET': ']', 'PLUS': '+', 'MINUS': '-'}
+ILLEGAL_CHARS = ('@', ',', '#', '*')
+
+# ترمینال‌هایی که جهش درج به دستور اضافه می‌کند
+MUTATION_TERMINALS = tuple(SYMBOL_TEXT) + ('REGISTER', 'IDENTIFIER', 'NUMBER', 'CLFLUSH', 'WBINVD')
+
+
+# ═══════════════════════════════════════════════════════════════════
+#                          تولید پیکره
+# ═══════════════════════════════════════════════════════════════════
+
+def _lexeme(rng, terminal):
+    """متن تصادفی یک ترمینال"""
+    if terminal == 'REGISTER':
+        return rng.choice(REGISTER_NAMES)
+    if terminal == 'IDENTIFIER':
+        return rng.choice(IDENTIFIERS)
+    if terminal == 'NUMBER':
+        return str(rng.choice((0, 8, 16, 64, rng.randrange(1 << 20))))
+    return SYMBOL_TEXT.get(terminal, terminal)
+
+
+def derive(rng, symbol='instruction'):
+    """مشتق تصادفی یک نماد گرامر - لیست متن توکن‌ها"""
+    if symbol not in PRODUCTIONS:
+        return [_lexeme(rng, symbol)]
+    words = []
+    for child in rng.choice(PRODUCTIONS[symbol]):
+        words.extend(derive(rng, child))
+    return words
+
+
+def mutate(rng, words):
+    """یک یا دو جهش تصادفی روی توکن‌های یک دستور"""
+    words = list(words)
+    for _ in range(rng.randint(1, 2)):
+        i = rng.randrange(len(words) + 1)
+        kind = rng.randrange(6)
+        if kind == 0 and words:
+            del words[min(i, len(words) - 1)]
+        elif kind == 1 and words:
+            words.insert(i, words[min(i, len(words) - 1)])
+        elif kind == 2 and len(words) > 1:
+            j = min(i, len(words) - 2)
+            words[j], words[j + 1] = words[j + 1], words[j]
+        elif kind == 3:
+            words.insert(i, _lexeme(rng, rng.choice(MUTATION_TERMINALS)))
+        elif kind == 4:
+            words.insert(i, rng.choice(ILLEGAL_CHARS))
+        elif words:
+            words[0] = words[0].lower()  # mnemonic کوچک یک IDENTIFIER است
+    return words
+
+
+def _is_word(char):
+    return char.isalnum() or char == '_'
+
+
+def _join(rng, words):
+    """چسباندن توکن‌ها با فاصله‌ی تصادفی (کلمات مجاور همیشه جدا می‌مانند)"""
+    text = ''
+    for word in words:
+        if text and (rng.random() < 0.7 or _is_word(text[-1]) and _is_word(word[0])):
+            text += ' ' * rng.randint(1, 2)
+        text += word
+    return text
+
+
+def generate_corpus(count, seed=0, invalid_ratio=0.5):
+    """
+    پیکره‌ی تصادفی دستورات
+
+    Returns:
+        لیست (متن، معتبر) - معتبر یعنی مشتق مستقیم GRAMMAR_RULES (بدون جهش)؛
+        این گرامر شرط operand را ندارد، پس بخشی از دستورات معتبر هم رد می‌شوند
+    """
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(count):
+        words = derive(rng)
+        valid = rng.random() >= invalid_ratio
+        if not valid:
+            words = mutate(rng, words)
+        corpus.append((_join(rng, words), valid))
+    return corpus
+
+
+# ═══════════════════════════════════════════════════════════════════
+#                          اجرای موتورها (پروسه‌ی کارگر)
+# ═══════════════════════════════════════════════════════════════════
+
+def _outcome(parser, ast):
+    """نتیجه‌ی قابل مقایسه: AST (یا None) و خطاها"""
+    return (None if ast is None else repr(ast.to_dict()),
+            [(d.line, d.column, d.token_type, d.value, d.expected) for d in parser.diagnostics])
+
+
+def _program_outcome(parser, program):
+    """نتیجه‌ی پارس کل فایل (expected در گرامر program موتورها متفاوت است)"""
+    return ([(ast.lineno, repr(ast.to_dict())) for ast in program],
+            [(d.line, d.column, d.token_type) for d in parser.diagnostics])
+
+
+def run_chunk(lines):
+    """
+    پارس یک تکه‌ی پیکره با هر موتور - دستور به دستور و کل تکه به‌صورت یک فایل
+
+    Returns:
+        {engine: (نتیجه‌ی هر دستور، نتیجه‌ی کل تکه، زمان ثانیه)}
+    """
+    results = {}
+    text = '\n'.join(lines)
+    for engine in ENGINES:
+        parser = CacheInstructionParser(engine=engine)
+        parser.parse(lines[0])  # ساخت جدول‌ها خارج از زمان‌سنجی
+
+        start = time.perf_counter()
+        outcomes = [_outcome(parser, parser.parse(line)) for line in lines]
+        elapsed = time.perf_counter() - start
+        program = _program_outcome(parser, parser.parse_program(text))
+        results[engine] = (outcomes, program, elapsed)
+    return results
+
+
+def run_differential(count=2000, seed=0, jobs=2, chunk_size=500):
+    """
+    اجرای تست تفاضلی روی یک پیکره‌ی تصادفی
+
+    Returns:
+        گزارش: تعداد دستورات، پذیرفته‌شده‌های معتبر/نامعتبر، لیست اختلاف‌ها
+        (متن، موتور، نتیجه‌ی PLY، نتیجه‌ی موتور) و دستور در ثانیه‌ی هر موتور
+    """
+    corpus = generate_corpus(count, seed)
+    chunks = [[text for text, _ in corpus[i:i + chunk_size]] for i in range(0, len(corpus), chunk_size)]
+
+    report = {
+        'instructions': len(corpus),
+        'valid': sum(valid for _, valid in corpus),
+        'accepted': {True: 0, False: 0},
+        'mismatches': [],
+        'seconds': dict.fromkeys(ENGINES, 0.0),
+    }
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        for index, (chunk, results) in enumerate(zip(chunks, executor.map(run_chunk, chunks))):
+            reference, reference_program, _ = results[ENGINE_PLY]
+            for engine in ENGINES:
+                outcomes, program, elapsed = results[engine]
+                report['seconds'][engine] += elapsed
+                for text, expected, got in zip(chunk, reference, outcomes):
+                    if expected != got:
+                        report['mismatches'].append((text, engine, expected, got))
+                if program != reference_program:
+                    report['mismatches'].append((f"<تکه {index}>", engine, reference_program[1], program[1]))
+
+            for (_, valid), (ast, _) in zip(corpus[index * chunk_size:], reference):
+                report['accepted'][valid] += ast is not None
+
+    report['throughput'] = {engine: len(corpus) / seconds
+                            for engine, seconds in report['seconds'].items() if seconds}
+    return report
+
+
+# ═══════════════════════════════════════════════════════════════════
+#                          تست‌ها
+# ═══════════════════════════════════════════════════════════════════
+
+def test_corpus_generation():
+    """پیکره‌ی تکرارپذیر با دستورات معتبر و جهش‌یافته"""
+    corpus = generate_corpus(1000, seed=7)
+    assert corpus == generate_corpus(1000, seed=7)
+    assert 300 < sum(valid for _, valid in corpus) < 700
+    assert any(text.startswith('CLFLUSH') for text, _ in corpus)
+    assert any(any(char in text for char in ILLEGAL_CHARS) for text, valid in corpus if not valid)
+
+    parser = CacheInstructionParser(engine=ENGINE_PLY)
+    accepted = [parser.parse(text) is not None for text, valid in corpus if valid]
+    assert sum(accepted) > len(accepted) // 2  # بقیه mnemonic نیازمند operand بدون operand
+
+
+def test_engines_agree():
+    """PLY، درایور LR و درایور LALR روی پیکره‌ی تصادفی یک نتیجه دارند"""
+    report = run_differential(count=3000, seed=1, jobs=2)
+
+    assert report['mismatches'] == [], report['mismatches'][:3]
+    assert report['accepted'][True] > 0
+    assert report['accepted'][False] < report['instructions'] - report['valid']
+    assert set(report['throughput']) == set(ENGINES)
+
+
+def print_report(report):
+    """چاپ خلاصه‌ی تست تفاضلی و توان عملیاتی"""
+    invalid = report['instructions'] - report['valid']
+    print(f"  دستورات: {report['instructions']} "
+          f"(معتبر: {report['valid']}، پذیرفته: {report['accepted'][True]} | "
+          f"جهش‌یافته: {invalid}، پذیرفته: {report['accepted'][False]})")
+    for engine, rate in report['throughput'].items():
+        print(f"  {engine:<10} {rate:>12,.0f} دستور در ثانیه")
+    print(f"  اختلاف‌ها: {len(report['mismatches'])}")
+    for text, engine, expected, got in report['mismatches'][:10]:
+        print(f"    ❌ {engine}: {text!r}\n       PLY: {expected}\n       {engine}: {got}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        jobs = int(sys.argv[sys.argv.index('-j') + 1]) if '-j' in sys.argv else 2
+        started = time.perf_counter()
+        report = run_differential(count=int(sys.argv[1]), jobs=jobs)
+        print_report(report)
+        print(f"  زمان کل: {time.perf_counter() - started:.1f} s")
+        sys.exit(1 if report['mismatches'] else 0)
+
+    tests = [
+        test_corpus_generation,
+        test_engines_agree,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__doc__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__doc__} {e}")
+
+    print(f"\n📊 نتیجه: {passed} موفق، {len(tests) - passed} ناموفق")
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+تست پارس افزایشی
+Incremental Re-Parse Test
+"""
+
+import random
+
+from cache_parser import get_parser, _source_line, source_lines
+from incremental import IncrementalParser
+
+
+def _full_parse(text):
+    """نتیجه‌ی پارس کامل برای مقایسه"""
+    parser = get_parser()
+    program = parser.parse_program(text)
+    lines = source_lines(text)
+    return ([(ast.lineno, _source_line(lines[ast.lineno - 1]), repr(ast)) for ast in program],
+            [(d.line, d.column, d.token_type, _source_line(lines[d.line - 1])) for d in parser.diagnostics])
+
+
+def _summary(incremental):
+    return ([(line_num, code, repr(ast)) for line_num, code, ast in incremental.results],
+            [(d.line, d.column, d.token_type, d.source) for d in incremental.diagnostics])
+
+
+def test_only_changed_lines_reparsed():
+    """فقط بازه‌ی تغییرکرده پارس می‌شود و شماره خطوط بعدی جابجا می‌شوند"""
+    incremental = IncrementalParser()
+    incremental.update("CLFLUSH [EAX]\nMOV EAX\nWBINVD\nCLWB [x]")
+    results = incremental.results
+    wbinvd = results[1][2]
+
+    assert incremental.update("CLFLUSH [EAX]\nINVD\n\nWBINVD\nCLWB [x]") == (2, 1, 2)
+    assert incremental.reparsed_lines == 2
+    assert incremental.results is results  # به‌روزرسانی در جا
+    assert results[2][2] is wbinvd and wbinvd.lineno == 4
+    assert [line_num for line_num, _, _ in results] == [1, 2, 4, 5]
+    assert incremental.diagnostics == []
+
+
+def test_random_edits_match_full_parse():
+    """نتیجه پس از ویرایش‌های تصادفی همان پارس کامل است"""
+    with open('examples/test_mixed.asm', encoding='utf-8') as f:
+        lines = f.read().splitlines()
+    pool = lines + ["MOV EAX", "CLWB [x]", "", "CLFLUSH EAX", "CLWB [", "INVD"]
+
+    rng = random.Random(15)
+    incremental = IncrementalParser()
+    current = list(lines)
+    for _ in range(200):
+        index = rng.randrange(len(current) + 1)
+        choice = rng.random()
+        if choice < 0.4 or not current:
+            current.insert(index, rng.choice(pool))
+        elif choice < 0.7:
+            del current[min(index, len(current) - 1)]
+        else:
+            current[min(index, len(current) - 1)] = rng.choice(pool)
+
+        text = '\n'.join(current)
+        incremental.update(text)
+        assert _summary(incremental) == _full_parse(text)
+
+
+def test_watch_survives_replaced_file():
+    """watch با حذف و ساخت دوباره‌ی فایل هنگام ذخیره متوقف نمی‌شود"""
+    import os
+    import tempfile
+    import incremental
+
+    with tempfile.NamedTemporaryFile('w', suffix='.asm', delete=False, encoding='utf-8') as f:
+        f.write("CLFLUSH [EAX]\nMOV EAX\n")
+    updates = []
+    missing = [True]  # اولین open: فایل بین stat و open حذف شده است
+
+    def fake_open(*args, **kwargs):
+        if missing:
+            missing.pop()
+            raise FileNotFoundError(args[0])
+        return open(*args, **kwargs)
+
+    class Stop(Exception):
+        pass
+
+    def on_update(state, changed, seconds):
+        updates.append(_summary(state))
+        if len(updates) == 2:
+            raise Stop
+
+    def fake_sleep(seconds):
+        if len(updates) == 1:
+            with open(f.name, 'w', encoding='utf-8') as out:
+                out.write("CLFLUSH [EAX]\nINVD\n")
+            os.utime(f.name, ns=(0, 10 ** 9))  # زمان تغییر متفاوت حتی در همان tick
+
+    incremental.open = fake_open
+    sleep = incremental.time.sleep
+    incremental.time.sleep = fake_sleep
+    try:
+        incremental.watch(f.name, on_update, interval=0)
+    except Stop:
+        pass
+    finally:
+        del incremental.open
+        incremental.time.sleep = sleep
+        os.remove(f.name)
+
+    assert [len(results) for results, _ in updates] == [1, 2]
+    assert [[line for line, _, _, _ in diagnostics] for _, diagnostics in updates] == [[2], []]
+
+
+if __name__ == "__main__":
+    tests = [
+        test_only_changed_lines_reparsed,
+        test_random_edits_match_full_parse,
+        test_watch_survives_replaced_file,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__doc__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__doc__} {e}")
+
+    print(f"\n📊 نتیجه: {passed} موفق، {len(tests) - passed} ناموفق")
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+تست جدول ستونی دستورات
+InstructionTable Test
+"""
+
+import os
+import tempfile
+from collections import Counter
+
+import instruction_table
+from cache_parser import parse_file, CacheInstructionParser, ENGINE_LR
+from instruction_table import InstructionTable, BASE_REGISTER, BASE_IDENTIFIER, OFFSET_COLUMN, OFFSET_BIG
+
+
+def test_parse_file_fills_table():
+    """parse_file دستورات معتبر را مستقیما در جدول می‌نویسد"""
+    table = InstructionTable()
+    results, _ = parse_file('examples/test_mixed.asm', table=table)
+
+    assert len(table) == len(results) == 15
+    assert [repr(ast) for ast in table] == [repr(ast) for _, _, ast in results]
+    assert list(table.line) == [line_num for line_num, _, _ in results]
+
+
+def test_lr_engine_fills_table():
+    """درایور LR هم جدول را پر می‌کند"""
+    with open('examples/advanced_test.asm', 'r', encoding='utf-8') as f:
+        text = f.read()
+
+    table = InstructionTable()
+    program = CacheInstructionParser(engine=ENGINE_LR).parse_program(text, table=table)
+    assert len(table) == len(program) == 90
+
+
+def test_columnar_queries():
+    """شمارش دسته‌ها، هیستوگرام رجیسترها و فیلتر offset"""
+    results, _ = parse_file('examples/advanced_test.asm')
+    program = [ast for _, _, ast in results]
+    table = InstructionTable.from_instructions(program)
+
+    assert table.category_counts() == dict(Counter(ast.get_instruction_category() for ast in program))
+
+    registers = Counter(ast.operand.base.name for ast in program
+                        if ast.operand is not None and ast.operand.base.type == 'Register')
+    assert table.register_histogram() == dict(registers)
+
+    negative = [row for row, ast in enumerate(program)
+                if ast.operand is not None and ast.operand.offset is not None and ast.operand.offset < 0]
+    assert table.rows_with_offset(maximum=-1) == negative
+
+
+def test_without_numpy():
+    """نتیجه‌ی پرس‌وجوها بدون NumPy یکسان است"""
+    table = InstructionTable.from_instructions(ast for _, _, ast in parse_file('examples/advanced_test.asm')[0])
+    expected = (table.category_counts(), table.register_histogram(), table.rows_with_offset(minimum=8))
+
+    saved = instruction_table.np
+    instruction_table.np = None
+    try:
+        assert (table.category_counts(), table.register_histogram(), table.rows_with_offset(minimum=8)) == expected
+    finally:
+        instruction_table.np = saved
+
+
+def test_base_kinds():
+    """نوع base و جدول رشته‌ها"""
+    table = InstructionTable.from_instructions(
+        ast for _, _, ast in parse_file('examples/cache_instructions.asm')[0])
+
+    for row, ast in enumerate(table):
+        if table.base_kind[row] == BASE_REGISTER:
+            assert table.registers[table.register[row]] == ast.operand.base.name
+        elif table.base_kind[row] == BASE_IDENTIFIER:
+            assert table.identifiers[table.identifier[row]] == ast.operand.base.name
+
+
+def test_offset_outside_int64():
+    """offset خارج از int64 پارس را متوقف نمی‌کند و در big_offsets حفظ می‌شود"""
+    path = tempfile.mktemp(suffix='.asm')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("CLFLUSH [EAX+99999999999999999999]\nCLWB [RBX-8]\n"
+                "PREFETCHT0 [ECX-99999999999999999999]\nCLWB [RDX+16]\n")
+    try:
+        table = InstructionTable()
+        results, diagnostics = parse_file(path, table=table)
+    finally:
+        os.remove(path)
+
+    assert diagnostics == [] and len(table) == len(results) == 4
+    assert [repr(ast) for ast in table] == [repr(ast) for _, _, ast in results]
+    assert list(table.has_offset) == [OFFSET_BIG, OFFSET_COLUMN, OFFSET_BIG, OFFSET_COLUMN]
+    assert table.big_offsets == {0: 99999999999999999999, 2: -99999999999999999999}
+
+    saved = instruction_table.np
+    try:
+        for numpy in (saved, None):
+            instruction_table.np = numpy
+            assert table.rows_with_offset() == [0, 1, 2, 3]
+            assert table.rows_with_offset(maximum=-1) == [1, 2]
+            assert table.rows_with_offset(minimum=2 ** 64) == [0]
+            assert table.rows_with_offset(minimum=0, maximum=100) == [3]
+    finally:
+        instruction_table.np = saved
+
+
+if __name__ == "__main__":
+    tests = [
+        test_parse_file_fills_table,
+        test_lr_engine_fills_table,
+        test_columnar_queries,
+        test_without_numpy,
+        test_base_kinds,
+        test_offset_outside_int64,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__doc__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__doc__} {e}")
+
+    print(f"\n📊 نتیجه: {passed} موفق، {len(tests) - passed} ناموفق")
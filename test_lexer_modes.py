@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+تست حالت‌های lexer (قوانین t_* و جدول کلمات کلیدی)
+Lexer Modes Test
+"""
+
+import glob
+
+from cache_lexer import build_lexer, LEXER_RULES, LEXER_KEYWORDS, KEYWORDS
+from cache_parser import CacheInstructionParser
+
+
+def tokenize(mode, text):
+    lexer = build_lexer(emit_newlines=True, mode=mode)
+    lexer.diagnostics = []
+    lexer.input(text)
+    return [(tok.type, tok.value, tok.lineno, tok.lexpos) for tok in lexer]
+
+
+def test_same_tokens_on_examples():
+    """هر دو حالت برای فایل‌های نمونه توکن‌های یکسان تولید می‌کنند"""
+    for path in glob.glob('examples/*.asm'):
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        assert tokenize(LEXER_RULES, text) == tokenize(LEXER_KEYWORDS, text), path
+
+
+def test_keyword_table():
+    """جدول کلمات کلیدی شامل همه‌ی mnemonic ها و رجیسترها است"""
+    assert KEYWORDS['CLFLUSHOPT'] == 'CLFLUSHOPT'
+    assert KEYWORDS['R15D'] == 'REGISTER'
+    assert KEYWORDS['RIP'] == 'REGISTER'
+    assert 'cache_line' not in KEYWORDS
+
+    types = [t for t, _, _, _ in tokenize(LEXER_KEYWORDS, "PREFETCHNTA [R8W+64] cache_line")]
+    assert types == ['PREFETCHNTA', 'LBRACKET', 'REGISTER', 'PLUS', 'NUMBER', 'RBRACKET', 'IDENTIFIER']
+
+
+def test_parser_with_keyword_lexer():
+    """parser با lexer حالت LEXER_KEYWORDS همان AST را می‌سازد"""
+    rules = CacheInstructionParser()
+    keywords = CacheInstructionParser(lexer_mode=LEXER_KEYWORDS)
+
+    for code in ["CLFLUSH [EAX]", "CLFLUSHOPT [EBX+16]", "PREFETCHT0 [ECX-8]", "WBINVD", "CLWB [cache_line]"]:
+        assert repr(rules.parse(code)) == repr(keywords.parse(code)), code
+
+
+if __name__ == "__main__":
+    tests = [
+        test_same_tokens_on_examples,
+        test_keyword_table,
+        test_parser_with_keyword_lexer,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__doc__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__doc__} {e}")
+
+    print(f"\n📊 نتیجه: {passed} موفق، {len(tests) - passed} ناموفق")
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+تست درایور جدول‌محور LR
+LR Driver Test
+"""
+
+import glob
+
+from cache_parser import CacheInstructionParser, ENGINE_PLY, ENGINE_LR, ENGINE_LALR
+from lr_driver import (ACTION, GOTO, RULE_LEN, RULE_LHS, NONTERMINAL_ID, N_STATES, N_TERMINALS, TERMINAL_ID,
+                       PackedTables, pack_rows)
+
+
+def dump(program):
+    return [(ast.lineno, repr(ast)) for ast in program]
+
+
+def test_compiled_table():
+    """جدول به آرایه‌های عددی تبدیل شده است"""
+    assert ACTION[0 * N_TERMINALS + TERMINAL_ID['CLFLUSH']] == 3
+    assert ACTION[8 * N_TERMINALS + TERMINAL_ID['RBRACKET']] == -15
+    assert RULE_LEN[13] == 3
+    assert RULE_LHS[13] == NONTERMINAL_ID['memory_address']
+    assert len(GOTO) % len(NONTERMINAL_ID) == 0
+
+
+def test_same_ast_as_ply():
+    """درایور LR همان AST و خطاهای PLY را برای فایل‌های نمونه می‌سازد"""
+    ply_parser = CacheInstructionParser(engine=ENGINE_PLY)
+    lr_parser = CacheInstructionParser(engine=ENGINE_LR)
+
+    for path in glob.glob('examples/*.asm'):
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        assert dump(ply_parser.parse_program(text)) == dump(lr_parser.parse_program(text)), path
+        assert [d.line for d in ply_parser.diagnostics] == [d.line for d in lr_parser.diagnostics], path
+
+
+def test_single_instructions():
+    """پارس تک دستور با هر دو موتور"""
+    ply_parser = CacheInstructionParser(engine=ENGINE_PLY)
+    lr_parser = CacheInstructionParser(engine=ENGINE_LR)
+
+    for code in ["CLFLUSH [EAX]", "PREFETCHT0 [ECX-8]", "INVD", "CLWB [cache_line]",
+                 "CLFLUSH", "CLFLUSH EAX", "WBINVD [EAX]", "CLWB [EAX", ""]:
+        assert repr(ply_parser.parse(code)) == repr(lr_parser.parse(code)), code
+        assert len(ply_parser.diagnostics) == len(lr_parser.diagnostics), code
+
+
+def test_operand_required():
+    """دستورات نیازمند operand بدون operand رد می‌شوند (با وجود r3 مشترک در جدول)"""
+    lr_parser = CacheInstructionParser(engine=ENGINE_LR)
+
+    assert lr_parser.parse("CLFLUSHOPT") is None
+    assert lr_parser.diagnostics[0].expected == ('LBRACKET',)
+    assert lr_parser.parse("WBINVD").mnemonic == 'WBINVD'
+
+
+def test_semantic_actions_follow_rule_text():
+    """اعمال معنایی از متن قوانین ساخته می‌شوند و ناهماهنگی با GRAMMAR_RULES خطا است"""
+    import lr_driver
+    from lr_tables import GRAMMAR_RULES
+
+    for num, rule in GRAMMAR_RULES.items():
+        expected = lr_driver.PRODUCTION_ACTIONS.get(rule, lr_driver._pass)
+        assert lr_driver.SEMANTIC_ACTIONS[num] is expected, rule
+
+    # جابجایی شماره‌ی دو قانون بدون به‌روز شدن RULE_LEN
+    swapped = dict(GRAMMAR_RULES)
+    swapped[14], swapped[15] = swapped[15], swapped[14]
+    lr_driver.GRAMMAR_RULES = swapped
+    try:
+        lr_driver._semantic_actions()
+        assert False, "ValueError انتظار می‌رفت"
+    except ValueError:
+        pass
+    finally:
+        lr_driver.GRAMMAR_RULES = GRAMMAR_RULES
+
+
+def test_packed_tables():
+    """جدول فشرده همان کدهای ACTION را برمی‌گرداند (با و بدون reduce پیش‌فرض)"""
+    rows = [{0: 5, 3: 7}, {}, {1: 2, 2: 4, 3: 6}, {0: 1}]
+    base, check, value = pack_rows(rows, 4)
+    assert len(value) < len(rows) * 4 + 4
+    for row, columns in enumerate(rows):
+        for column in range(4):
+            i = base[row] + column
+            assert (value[i] if check[i] == row else 0) == columns.get(column, 0)
+
+    full = PackedTables(default_reductions=False)
+    packed = PackedTables()
+    for state in range(N_STATES):
+        codes = {ACTION[state * N_TERMINALS + term] for term in range(N_TERMINALS)} - {0}
+        for term in range(N_TERMINALS):
+            code = ACTION[state * N_TERMINALS + term]
+            assert full.lookup(state, term) == code
+            if len(codes) == 1 and min(codes) < 0:
+                assert packed.lookup(state, term) == min(codes)  # reduce پیش‌فرض
+            else:
+                assert packed.lookup(state, term) == code
+    assert packed.size() < N_STATES * N_TERMINALS
+
+
+def test_lalr_engine():
+    """درایور روی جدول LALR تولیدشده همان AST و خطاهای PLY را می‌سازد"""
+    ply_parser = CacheInstructionParser(engine=ENGINE_PLY)
+    lalr_parser = CacheInstructionParser(engine=ENGINE_LALR)
+
+    def errors(parser, expected=True):
+        return [(d.line, d.column, d.token_type, d.expected if expected else ()) for d in parser.diagnostics]
+
+    # expected کل فایل متفاوت است: گرامر program در PLY خط خالی و $end را هم می‌پذیرد
+    for path in glob.glob('examples/*.asm'):
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        assert dump(ply_parser.parse_program(text)) == dump(lalr_parser.parse_program(text)), path
+        assert errors(ply_parser, False) == errors(lalr_parser, False), path
+
+    for code in ["CLFLUSH [EAX]", "INVD", "CLFLUSH", "CLFLUSH EAX", "WBINVD EAX", "WBINVD [EAX]",
+                 "CLWB [EAX", "CLFLUSH [EAX EAX]", "PREFETCHT2 [EAX+]", "[EAX]"]:
+        assert repr(ply_parser.parse(code)) == repr(lalr_parser.parse(code)), code
+        assert errors(ply_parser) == errors(lalr_parser), code
+
+
+def test_tracer_records():
+    """ShiftReduceTracer رکوردهای فشرده ثبت می‌کند و متن را تنبل می‌سازد"""
+    from shift_reduce_trace import ShiftReduceTracer, STEP_START, STEP_SHIFT, STEP_REDUCE, STEP_ACCEPT, STEP_ERROR
+
+    trace = ShiftReduceTracer().trace("CLFLUSHOPT [EBX+16]")
+    assert trace.accepted
+    assert [action for _, action, _, _ in trace.records[:3]] == [STEP_START, STEP_SHIFT, STEP_REDUCE]
+    assert trace.records[-1] == (2, STEP_ACCEPT, 0, 6)
+    assert trace.rules_used() == [3, 17, 14, 13, 12, 1]
+    assert trace[7] == {'step': 8, 'stack': '$ mnemonic [ EBX offset', 'input': '] $',
+                        'action': 'Reduce', 'rule': 'R17: offset -> PLUS NUMBER'}
+    assert list(trace)[-1] == trace[-1] == trace.last_step
+    assert trace.first_step == trace[0] and trace.first_step['action'] == 'شروع پارسینگ'
+    assert trace[2:9:3] == list(trace)[2:9:3] and trace[::-2] == list(trace)[::-2]
+    assert trace[5:2] == [] and trace[-3:] == list(trace)[-3:]
+
+    # ورودی طولانی: هر مرحله ثابت است و سطر چاپی فقط تا عرض ستون ساخته می‌شود
+    trace = ShiftReduceTracer().trace("CLFLUSH EAX " * 10000)
+    assert not trace.accepted and len(trace) == 3 and trace.records[-1][1] == STEP_ERROR
+    assert [row[2] for row in trace.rows(28, 23)] == ['CLFLUSH EAX CLFLUSH EAX'] + ['EAX CLFLUSH EAX CLFLUSH'] * 2
+
+
+if __name__ == "__main__":
+    tests = [
+        test_compiled_table,
+        test_same_ast_as_ply,
+        test_single_instructions,
+        test_operand_required,
+        test_semantic_actions_follow_rule_text,
+        test_packed_tables,
+        test_lalr_engine,
+        test_tracer_records,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__doc__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__doc__} {e}")
+
+    print(f"\n📊 نتیجه: {passed} موفق، {len(tests) - passed} ناموفق")
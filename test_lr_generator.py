@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+تست تولید خودکار جدول LR(0)/SLR
+LR Table Generator Test
+"""
+
+from lr_generator import generate_table, table_differences, LRGrammar, METHOD_LR0, METHOD_SLR
+from lr_tables import LR_PARSING_TABLE
+
+
+# گرامر عبارات کتاب Dragon (12 state، SLR بدون تعارض)
+EXPRESSION_RULES = {
+    1: "E -> E + T",
+    2: "E -> T",
+    3: "T -> T * F",
+    4: "T -> F",
+    5: "F -> ( E )",
+    6: "F -> id",
+}
+
+
+def test_grammar_tables():
+    """جدول SLR گرامر دستورات بدون تعارض و با قالب LR_PARSING_TABLE است"""
+    table, conflicts = generate_table()
+
+    assert conflicts == []
+    assert len(table) == 24
+    assert table[1] == {'$': 'acc'}
+    assert table[2] == {'LBRACKET': 's14', '$': 'r2', 'operand': 12, 'memory_address': 13}
+    for row in table.values():
+        for symbol, entry in row.items():
+            assert isinstance(entry, int) == symbol.islower(), (symbol, entry)
+
+    # LR(0) بدون lookahead: reduce های instruction -> mnemonic و base_expr -> REGISTER با shift تعارض دارند
+    _, conflicts = generate_table(method=METHOD_LR0)
+    assert conflicts == [(2, 'LBRACKET', 's14', 'r2'), (16, 'PLUS', 's20', 'r15'), (16, 'MINUS', 's21', 'r15')]
+
+
+def test_matches_hand_table():
+    """تفاوت با جدول دستی فقط در reduce مشترک mnemonic ها و WBINVD/INVD با کروشه است"""
+    table, _ = generate_table()
+    differences = table_differences(LR_PARSING_TABLE, table)
+
+    assert len(differences) == 15
+    for ref_state, _, symbol, entry, generated in differences:
+        if entry is None:
+            assert (ref_state, symbol, generated[0]) == (4, 'LBRACKET', 'r')
+        else:
+            assert entry in ('r3', 'r10') and generated[0] == 'r'
+
+
+def test_expression_grammar():
+    """گرامر عبارات: 12 state، تعارض LR(0) و closure با cache"""
+    grammar = LRGrammar(EXPRESSION_RULES)
+    assert grammar.terminals == ('+', '*', '(', ')', 'id', '$')
+
+    first, follow, nullable = grammar.first_follow()
+    assert first['E'] == {'(', 'id'} and nullable == set()
+    assert follow['E'] == {'+', ')', '$'} and follow['F'] == {'+', '*', ')', '$'}
+
+    table, conflicts = generate_table(EXPRESSION_RULES, METHOD_SLR)
+    assert len(table) == 12 and conflicts == []
+    assert sum(entry == 'r6' for row in table.values() for entry in row.values()) == 4
+
+    _, conflicts = generate_table(EXPRESSION_RULES, METHOD_LR0)
+    assert {(symbol, kept) for _, symbol, kept, _ in conflicts} >= {('*', 's7')}
+
+    kernel = 1 << grammar.rule_base[0]
+    closure = grammar.closure(kernel)
+    assert bin(closure).count('1') == 7  # S' -> .E و همه‌ی قوانین E، T و F
+    assert grammar._closure_cache[kernel] == closure
+
+
+if __name__ == "__main__":
+    tests = [
+        test_grammar_tables,
+        test_matches_hand_table,
+        test_expression_grammar,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__doc__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__doc__} {e}")
+
+    print(f"\n📊 نتیجه: {passed} موفق، {len(tests) - passed} ناموفق")
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+تست پارس کل فایل (گرامر program)
+Whole-Program Parsing Test
+"""
+
+import diagnostics
+from cache_lexer import tokens, iter_spans, span_value
+from cache_parser import (get_parser, parse_file, parse_instruction, iter_parse_file, parse_mapped_file,
+                          line_ranges, normalize_source, CacheInstructionParser)
+
+
+PROGRAM = """; برنامه نمونه
+CLFLUSH [EAX]
+
+CLFLUSHOPT [EBX+16]   ; کامنت انتهای خط
+    WBINVD
+CLWB [cache_line]"""
+
+
+def test_program_line_numbers():
+    """هر Instruction شماره خط واقعی خود را دارد"""
+    program = get_parser().parse_program(PROGRAM)
+
+    assert get_parser().diagnostics == []
+    assert [ast.mnemonic for ast in program] == ['CLFLUSH', 'CLFLUSHOPT', 'WBINVD', 'CLWB']
+    assert [ast.lineno for ast in program] == [2, 4, 5, 6]
+
+
+def test_empty_program():
+    """فایل خالی یا فقط کامنت"""
+    assert get_parser().parse_program("") == []
+    assert get_parser().parse_program("; فقط کامنت\n\n") == []
+
+
+def test_program_matches_line_by_line():
+    """نتیجه پارس کل فایل با پارس خط به خط یکسان است"""
+    results, errors = parse_file('examples/advanced_test.asm')
+
+    assert errors == []
+    assert len(results) == 90
+    for line_num, code, ast in results:
+        assert repr(parse_instruction(code)) == repr(ast), (line_num, code)
+
+
+def test_error_recovery():
+    """خطوط نامعتبر پشت‌سرهم (حتی خط اول) در یک پارس گزارش می‌شوند"""
+    text = "MOV EAX\nADD EBX\nWBINVD\nCLFLUSHOPT\nCLFLUSH [EAX] [EBX]\nINVD\nCLWB ["
+    parser = get_parser()
+    program = parser.parse_program(text)
+
+    assert [(ast.lineno, ast.mnemonic) for ast in program] == [(3, 'WBINVD'), (6, 'INVD')]
+    assert [d.line for d in parser.diagnostics] == [1, 2, 4, 5, 7]
+
+
+def test_parse_file_reports_errors():
+    """خطوط نامعتبر گزارش می‌شوند و خطوط معتبر حفظ می‌شوند"""
+    results, errors = parse_file('examples/test_mixed.asm')
+
+    assert len(results) == 15
+    assert sorted({d.line for d in errors}) == [21, 22, 23, 24, 49, 50, 51]
+    assert all(d.source for d in errors)
+
+
+def test_unicode_line_separators():
+    """شماره خط و متن خطوط فقط با '\n' شمرده می‌شوند (مثل lexer)"""
+    import os
+    import tempfile
+
+    text = "CLFLUSH [EAX] ; a\x0cb\u2028c\nMOV EAX ; d\x85e\nINVD\n"
+    with tempfile.NamedTemporaryFile('w', suffix='.asm', delete=False, encoding='utf-8', newline='') as f:
+        f.write(text)
+    try:
+        results, errors = parse_file(f.name)
+        parallel_results, parallel_errors = parse_file(f.name, jobs=2)
+    finally:
+        os.remove(f.name)
+
+    assert [(n, code) for n, code, _ in results] == [(1, 'CLFLUSH [EAX]'), (3, 'INVD')]
+    assert [(d.line, d.source) for d in errors] == [(2, 'MOV EAX')]
+    assert [(n, code) for n, code, _ in parallel_results] == [(n, code) for n, code, _ in results]
+    assert [(d.line, d.source) for d in parallel_errors] == [(2, 'MOV EAX')]
+
+
+def test_diagnostic_fields():
+    """خطا به‌صورت رکورد Diagnostic ثبت می‌شود (بدون چاپ)"""
+    parser = get_parser()
+
+    assert parse_instruction("CLFLUSH EAX", report=False) is None
+    diagnostic, = parser.diagnostics
+    assert (diagnostic.line, diagnostic.column) == (1, 9)
+    assert diagnostic.token_type == 'REGISTER'
+    assert diagnostic.expected == ('LBRACKET',)
+    assert diagnostic.suggestion == diagnostics.REGISTER_NEEDS_BRACKETS
+
+    parse_instruction("CLFLUSHOPT", report=False)
+    assert [d.suggestion for d in parser.diagnostics] == [diagnostics.MISSING_OPERAND]
+
+    parse_instruction("CLWB [EAX", report=False)
+    assert [d.suggestion for d in parser.diagnostics] == [diagnostics.UNCLOSED_BRACKET]
+
+    parse_instruction("CLWB [EAX] ,", report=False)
+    assert [d.token_type for d in parser.diagnostics] == ['ILLEGAL']
+
+    assert parse_instruction("CLWB [EAX]", report=False) is not None
+    assert parser.diagnostics == []
+
+
+def test_render_limit():
+    """نمایش تنبل خطاها با محدودیت تعداد"""
+    import io
+
+    parser = get_parser()
+    parser.parse_program("MOV EAX\n" * 10)
+    assert len(parser.diagnostics) == 10
+
+    out = io.StringIO()
+    diagnostics.render_diagnostics(parser.diagnostics, limit=3, file=out)
+    assert out.getvalue().count("SYNTAX ERROR") == 3
+    assert "7 خطای دیگر" in out.getvalue()
+
+
+
+def test_iter_parse_file():
+    """پارس جریانی (با تکه‌های کوچک) همان نتیجه‌ی parse_file را به ترتیب خط می‌دهد"""
+    results, errors = parse_file('examples/test_mixed.asm')
+    expected = sorted([(line_num, repr(ast)) for line_num, _, ast in results] +
+                      [(d.line, repr(d)) for d in errors], key=lambda item: item[0])
+
+    for chunk_lines in (1, 7, 4096):
+        items = list(iter_parse_file('examples/test_mixed.asm', chunk_lines=chunk_lines))
+        assert [(line_num, repr(item)) for line_num, item in items] == expected, chunk_lines
+
+    sources = [item.source for _, item in iter_parse_file('examples/test_mixed.asm', chunk_lines=5)
+               if item.type != 'Instruction']
+    assert sources[0] == 'INVALID [EAX]'
+
+
+def test_iter_parse_file_objects():
+    """ورودی از فایل باز متنی و باینری"""
+    import io
+
+    text = "WBINVD\nCLFLUSH EAX\n\nCLWB [RAX+8]"
+    for f in (io.StringIO(text), io.BytesIO(text.encode())):
+        items = list(iter_parse_file(f, chunk_lines=2))
+        assert [(line_num, item.type) for line_num, item in items] == [
+            (1, 'Instruction'), (2, 'Diagnostic'), (4, 'Instruction')]
+        assert items[2][1].to_asm() == "CLWB [RAX+8]"
+        assert not f.closed
+
+
+def test_iter_spans():
+    """lexer بایتی span می‌دهد و مقدار فقط با span_value خوانده می‌شود"""
+    buffer = b"CLWB [RAX+8] ; \xd8\xa7\r\nMOV ,"
+    errors = []
+    spans = list(iter_spans(buffer, errors))
+
+    assert [tokens[type] for _, _, type in spans] == [
+        'CLWB', 'LBRACKET', 'REGISTER', 'PLUS', 'NUMBER', 'RBRACKET', 'NEWLINE', 'IDENTIFIER']
+    assert spans[2][:2] == (6, 3)
+    assert [span_value(buffer, *span) for span in spans[2:5]] == ['RAX', None, 8]
+    assert [(d.line, d.column, d.value) for d in errors] == [(2, 5, ',')]
+
+
+def test_mapped_file_matches_parse_file():
+    """parse_mapped_file همان دستورات و خطاهای parse_file را می‌دهد"""
+    for filename in ('examples/advanced_test.asm', 'examples/test_mixed.asm'):
+        results, errors = parse_file(filename)
+        program, mapped_errors = parse_mapped_file(filename)
+
+        assert [(ast.lineno, repr(ast)) for ast in program] == [(n, repr(ast)) for n, _, ast in results]
+        assert [(d.line, d.column, d.token_type, d.suggestion, d.source) for d in mapped_errors] == \
+               [(d.line, d.column, d.token_type, d.suggestion, d.source) for d in errors]
+
+
+def test_parallel_parse_file():
+    """پارس چندپروسه‌ای با شماره خطوط سراسری همان نتیجه‌ی parse_file است"""
+    import os
+
+    filename = 'examples/test_mixed.asm'
+    ranges = line_ranges(filename, 8)
+    assert ranges[0][0] == 0 and ranges[-1][1] == os.path.getsize(filename)
+    assert all(end == start for (_, end), (start, _) in zip(ranges, ranges[1:]))
+
+    results, errors = parse_file(filename)
+    parallel_results, parallel_errors = parse_file(filename, jobs=2)
+
+    assert [(n, code, repr(ast)) for n, code, ast in parallel_results] == \
+           [(n, code, repr(ast)) for n, code, ast in results]
+    assert [(d.line, d.column, d.source) for d in parallel_errors] == [(d.line, d.column, d.source) for d in errors]
+
+
+def test_parallel_ranges_bounded():
+    """بازه‌های با اندازه‌ی ثابت در پنجره‌ی محدود ارسال می‌شوند و نتیجه همان پارس جریانی است"""
+    from concurrent.futures import Future
+    import cache_parser
+
+    class CountingExecutor:
+        submitted = 0
+
+        def submit(self, fn, task):
+            self.submitted += 1
+            future = Future()
+            future.set_result(fn(task))
+            return future
+
+    executor = CountingExecutor()
+    saved = cache_parser.RANGE_BYTES
+    cache_parser.RANGE_BYTES = 64
+    try:
+        parts = []
+        for consumed, part in enumerate(cache_parser._iter_ranges('examples/test_mixed.asm', 1, False, executor), 1):
+            assert executor.submitted <= consumed + cache_parser.PENDING_RANGES_PER_JOB
+            parts.append(part)
+        assert len(parts) > 4 * cache_parser.RANGES_PER_JOB
+
+        items = [(line, repr(item)) for line, item in iter_parse_file('examples/test_mixed.asm')]
+        ranged = list(cache_parser.iter_parse_file_parallel('examples/test_mixed.asm', 1, executor=executor))
+        assert [(line, repr(item)) for line, item in ranged] == items
+    finally:
+        cache_parser.RANGE_BYTES = saved
+
+
+def test_thread_local_parsers():
+    """هر thread parser و لیست خطای جدای خود را دارد"""
+    import threading
+
+    outcomes = {}
+
+    def work(i):
+        parser = get_parser()
+        program = parser.parse_program(f"CLWB [RAX+{i}]\nMOV EAX\n" * (i + 1))
+        outcomes[i] = (id(parser), [ast.operand.offset for ast in program], len(parser.diagnostics))
+
+    threads = [threading.Thread(target=work, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({parser_id for parser_id, _, _ in outcomes.values()} | {id(get_parser())}) == 5
+    for i, (_, offsets, error_count) in outcomes.items():
+        assert offsets == [i] * (i + 1) and error_count == i + 1
+
+
+def test_instruction_cache():
+    """cache دستورات: کپی گره برای متن نرمال‌شده‌ی یکسان و شمارنده‌ها"""
+    parser = CacheInstructionParser(cache_size=2)
+
+    first = parser.parse("CLFLUSH [EAX+8]")
+    second = parser.parse("  CLFLUSH   [EAX+8] ; کامنت")
+    assert repr(second) == repr(first) and second is not first
+    assert parser.parse("CLFLUSH EAX") is None
+    assert len(parser.diagnostics) == 1
+    assert parser.parse("CLFLUSH EAX") is None
+    assert len(parser.diagnostics) == 1  # خطاها ذخیره نمی‌شوند
+
+    # تغییر گره برگردانده‌شده روی برخوردهای بعدی اثر ندارد
+    second.operand.offset = 99
+    first.lineno = 42
+    again = parser.parse("CLFLUSH [EAX+8]")
+    assert again.operand.offset == 8 and again.lineno == 1
+
+    parser.parse("CLWB [x]")
+    parser.parse("INVD")
+    assert repr(parser.parse("CLFLUSH [EAX+8]")) == repr(first)  # حذف‌شده (LRU) و دوباره پارس
+
+    stats = parser.cache.stats()
+    assert (stats['hits'], stats['misses'], stats['evictions'], stats['size']) == (2, 6, 2, 2)
+
+    # متن چندخطی از cache عبور نمی‌کند (کامنت خط اول بقیه را حذف نمی‌کند)
+    assert parser.parse("CLFLUSH [EAX] ; x\nMOV") is None
+    assert parser.cache.stats()['size'] == 2
+
+    # پایان خط انتهایی (خط خوانده‌شده از فایل) همان کلید را دارد
+    hits = parser.cache.stats()['hits']
+    assert repr(parser.parse("CLFLUSH [EAX+8]\n")) == repr(first)
+    assert parser.cache.stats()['hits'] == hits + 1
+
+
+def test_instruction_cache_lexer_errors():
+    """cache خطاهای lexer را پنهان نمی‌کند (فاصله فقط t_ignore، بدون ذخیره‌ی پارس با خطا)"""
+    uncached = CacheInstructionParser()
+    parser = CacheInstructionParser(cache_size=8)
+
+    def outcome(p, code):
+        ast = p.parse(code)
+        return repr(ast), [(d.line, d.column, d.token_type) for d in p.diagnostics]
+
+    parser.parse("CLFLUSH [EAX]")
+    for code in ("CLFLUSH [EAX]\r", "CLFLUSH\x0b[EAX]", "CLFLUSH [EAX]\x85", "CLFLUSH\x0c[EAX]", "CLFLUSH\x0c[EAX]"):
+        expected = outcome(uncached, code)
+        assert expected[1], code  # lexer خطا گزارش می‌کند
+        assert outcome(parser, code) == expected, code
+    assert parser.cache.stats()['size'] == 1
+
+    assert normalize_source("  CLFLUSH\t [EAX]  ; x") == "CLFLUSH [EAX]"
+    assert normalize_source("CLFLUSH [EAX]\r") != normalize_source("CLFLUSH [EAX]")
+
+
+if __name__ == "__main__":
+    tests = [
+        test_program_line_numbers,
+        test_empty_program,
+        test_program_matches_line_by_line,
+        test_error_recovery,
+        test_parse_file_reports_errors,
+        test_unicode_line_separators,
+        test_diagnostic_fields,
+        test_render_limit,
+        test_iter_parse_file,
+        test_iter_parse_file_objects,
+        test_iter_spans,
+        test_mapped_file_matches_parse_file,
+        test_parallel_parse_file,
+        test_parallel_ranges_bounded,
+        test_thread_local_parsers,
+        test_instruction_cache,
+        test_instruction_cache_lexer_errors,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__doc__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__doc__} {e}")
+
+    print(f"\n📊 نتیجه: {passed} موفق، {len(tests) - passed} ناموفق")
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+تست cache نتایج پارس روی دیسک
+Result Cache Test
+"""
+
+import marshal
+import os
+import shutil
+import tempfile
+
+import result_cache
+from cache_parser import parse_file
+
+
+def _with_cache_dir(test):
+    """اجرای تست با یک پوشه‌ی cache موقت"""
+    def run():
+        directory = tempfile.mkdtemp()
+        previous = os.environ.get('CACHE_PARSER_CACHE_DIR')
+        os.environ['CACHE_PARSER_CACHE_DIR'] = directory
+        try:
+            test(directory)
+        finally:
+            if previous is None:
+                del os.environ['CACHE_PARSER_CACHE_DIR']
+            else:
+                os.environ['CACHE_PARSER_CACHE_DIR'] = previous
+            shutil.rmtree(directory)
+    run.__doc__ = test.__doc__
+    run.__name__ = test.__name__
+    return run
+
+
+def _summary(parsed):
+    results, diagnostics = parsed
+    return ([(line_num, code, repr(ast)) for line_num, code, ast in results],
+            [(d.line, d.column, d.token_type, d.value, d.expected, d.suggestion, d.source) for d in diagnostics])
+
+
+@_with_cache_dir
+def test_cached_result_matches(directory):
+    """نتیجه‌ی بارگذاری‌شده از cache همان نتیجه‌ی پارس است"""
+    expected = _summary(parse_file('examples/test_mixed.asm'))
+
+    assert _summary(parse_file('examples/test_mixed.asm', cache=True)) == expected
+    assert len(os.listdir(result_cache.result_cache_dir())) == 1
+    assert _summary(parse_file('examples/test_mixed.asm', cache=True)) == expected
+
+
+@_with_cache_dir
+def test_modified_file_is_reparsed(directory):
+    """تغییر محتوا کلید جدید می‌سازد"""
+    path = os.path.join(directory, 'program.asm')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("CLFLUSH [EAX]\nWBINVD\n")
+    results, _ = parse_file(path, cache=True)
+    assert [ast.mnemonic for _, _, ast in results] == ['CLFLUSH', 'WBINVD']
+
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("CLWB [RBX-8]\n")
+    results, _ = parse_file(path, cache=True)
+    assert [ast.to_asm() for _, _, ast in results] == ['CLWB [RBX-8]']
+    assert result_cache.clear_result_cache() == 2
+
+
+@_with_cache_dir
+def test_corrupt_entry_is_ignored(directory):
+    """فایل cache خراب نادیده گرفته و دوباره نوشته می‌شود"""
+    with open('examples/advanced_test.asm', encoding='utf-8') as f:
+        key = result_cache.result_key(f.read())
+    os.makedirs(result_cache.result_cache_dir())
+    with open(os.path.join(result_cache.result_cache_dir(), f"{key}.bin"), 'wb') as f:
+        f.write(b'CPRC garbage')
+
+    assert result_cache.load_result(key) is None
+    results, _ = parse_file('examples/advanced_test.asm', cache=True)
+    assert len(results) == 90
+    assert len(result_cache.load_result(key)[0]) == 90
+
+
+@_with_cache_dir
+def test_truncated_column_is_a_miss(directory):
+    """ستون کوتاه‌شده یک miss است و فایل cache حذف می‌شود"""
+    results, _ = parse_file('examples/advanced_test.asm', cache=True)
+    with open('examples/advanced_test.asm', encoding='utf-8') as f:
+        key = result_cache.result_key(f.read())
+    path = os.path.join(result_cache.result_cache_dir(), f"{key}.bin")
+
+    with open(path, 'rb') as f:
+        f.read(len(result_cache.MAGIC))
+        columns, registers, identifiers, big_offsets, records = marshal.load(f)
+    offset = result_cache.InstructionTable.COLUMNS.index('offset')
+    for broken in (columns[offset][:-8],    # یک سطر کمتر - ستون‌های ناهم‌طول
+                   columns[offset][:-1]):   # طول ناهم‌تراز - ValueError در frombytes
+        with open(path, 'wb') as f:
+            f.write(result_cache.MAGIC)
+            marshal.dump((columns[:offset] + (broken,) + columns[offset + 1:], registers, identifiers, big_offsets, records), f)
+        assert result_cache.load_result(key) is None
+        assert not os.path.exists(path)
+
+    with open(path, 'wb') as f:
+        f.write(result_cache.MAGIC)
+        marshal.dump((columns, registers, identifiers, big_offsets, records + ((1, 2),)), f)
+    assert result_cache.load_result(key) is None  # رکورد ناقص - TypeError
+    assert not os.path.exists(path)
+
+    with open(path, 'wb') as f:
+        f.write(result_cache.MAGIC)
+        marshal.dump((columns, registers[:0], identifiers, big_offsets, records), f)
+    assert result_cache.load_result(key) is None  # شناسه‌ی ثبات خارج از جدول - IndexError
+    assert not os.path.exists(path)
+
+    assert len(parse_file('examples/advanced_test.asm', cache=True)[0]) == len(results)
+    assert os.path.exists(path)
+
+
+@_with_cache_dir
+def test_big_offsets(directory):
+    """offset خارج از int64 ذخیره و بارگذاری می‌شود؛ نتیجه‌ی غیرقابل رمزگذاری فقط cache نمی‌شود"""
+    path = os.path.join(directory, 'big.asm')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("CLFLUSH [EAX+99999999999999999999]\nCLWB [RBX-8]\n")
+    expected = _summary(parse_file(path))
+
+    assert _summary(parse_file(path, cache=True)) == expected
+    assert len(os.listdir(result_cache.result_cache_dir())) == 1
+    assert _summary(parse_file(path, cache=True)) == expected  # از cache
+    assert expected[0][0][2] == 'Instruction(CLFLUSH, Memory([EAX+99999999999999999999]))'
+
+    program = [ast for _, _, ast in parse_file(path)[0]]
+    program[0].lineno = 2 ** 40  # خارج از ستون line
+    assert result_cache.save_result('unencodable', program, []) is False
+    assert result_cache.load_result('unencodable') is None
+
+
+def test_key_follows_lexer():
+    """تغییر قوانین lexer (مثلا t_ignore) کلید نتایج را عوض می‌کند"""
+    import inspect
+    import cache_lexer
+
+    def no_source(module):
+        raise OSError("بدون متن منبع")
+
+    text = "CLFLUSH [EAX]\n"
+    key = result_cache.result_key(text)
+    saved = (cache_lexer._lexer_fingerprint, inspect.getsource, cache_lexer.t_ignore)
+    try:
+        cache_lexer._lexer_fingerprint = None
+        assert result_cache.result_key(text) == key  # همان متن منبع
+
+        inspect.getsource = no_source
+        cache_lexer._lexer_fingerprint = None
+        fallback = result_cache.result_key(text)
+        cache_lexer.t_ignore = ' \t\r'
+        cache_lexer._lexer_fingerprint = None
+        assert result_cache.result_key(text) not in (key, fallback)
+    finally:
+        cache_lexer._lexer_fingerprint, inspect.getsource, cache_lexer.t_ignore = saved
+
+if __name__ == "__main__":
+    tests = [
+        test_cached_result_matches,
+        test_modified_file_is_reparsed,
+        test_corrupt_entry_is_ignored,
+        test_truncated_column_is_a_miss,
+        test_big_offsets,
+        test_key_follows_lexer,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__doc__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__doc__} {e}")
+
+    print(f"\n📊 نتیجه: {passed} موفق، {len(tests) - passed} ناموفق")
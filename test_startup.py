@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+تست import سبک نقاط ورود
+Lazy Import Startup Test
+"""
+
+import subprocess
+import sys
+
+
+# ماژول‌هایی که import نقاط ورود نباید بارگذاری کند
+HEAVY_MODULES = ('ply', 'ply.lex', 'ply.yacc', 'cache_parser', 'graphviz')
+
+
+def _loaded_after_import(module):
+    """ماژول‌های سنگین بارگذاری‌شده بعد از import یک ماژول در پروسه‌ی جدید"""
+    code = (f"import sys, {module}; "
+            f"print(','.join(name for name in {HEAVY_MODULES!r} if name in sys.modules))")
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    return [name for name in result.stdout.strip().split(',') if name]
+
+
+def test_entry_points_are_lazy():
+    """import main، cacheparse و draw_automata parser و graphviz را بارگذاری نمی‌کند"""
+    for module in ('main', 'cacheparse', 'draw_automata'):
+        assert _loaded_after_import(module) == [], module
+
+
+def test_parser_without_yacc():
+    """import cache_parser و lr_driver بدون ply (ply فقط هنگام ساخت parser)"""
+    for module in ('cache_parser', 'lr_driver'):
+        assert _loaded_after_import(module) == ['cache_parser'], module
+
+
+if __name__ == "__main__":
+    tests = [
+        test_entry_points_are_lazy,
+        test_parser_without_yacc,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__doc__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__doc__} {e}")
+
+    print(f"\n📊 نتیجه: {passed} موفق، {len(tests) - passed} ناموفق")